@@ -0,0 +1,115 @@
+# 파일명: adaptive_poller.py
+
+import logging
+import re
+import time
+from datetime import datetime, timedelta
+
+from portal_config import (
+    POLL_MIN_INTERVAL, POLL_BASE_INTERVAL, POLL_MAX_INTERVAL, POLL_IDLE_INTERVAL, POLL_NIGHT_HOURS
+)
+
+# 노선 설명/버스 번호에서 출발 시각(HH:MM)을 찾는 패턴
+_DEPARTURE_PATTERN = re.compile(r"(\d{1,2}):(\d{2})")
+
+
+def parse_departure(route, now):
+    """노선 정보에서 오늘 출발 시각을 찾아 datetime으로 반환 (없으면 None)."""
+    for text in (route.bus_route_detail, route.bus_number):
+        match = _DEPARTURE_PATTERN.search(text or "")
+        if match:
+            hour, minute = int(match.group(1)), int(match.group(2))
+            if hour < 24 and minute < 60:
+                return now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return None
+
+
+class AdaptivePollPolicy:
+    """
+    모니터링 대상 노선마다 좌석 변화 빈도와 출발 시각을 보고 폴링 간격을 정함.
+    실제 크롤링은 전체 노선을 한 번에 가져오므로, 다음 크롤링은 가장 급한 노선의 간격을 따름.
+    """
+
+    def __init__(self, min_interval=POLL_MIN_INTERVAL, base_interval=POLL_BASE_INTERVAL,
+                 max_interval=POLL_MAX_INTERVAL, idle_interval=POLL_IDLE_INTERVAL,
+                 night_hours=POLL_NIGHT_HOURS, recent_change_window=5 * 60,
+                 near_departure_window=60 * 60, quiet_cycles_per_step=5):
+        self.min_interval = min_interval
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.idle_interval = idle_interval
+        self.night_hours = night_hours
+        self.recent_change_window = recent_change_window   # 이 시간(초) 안에 변화가 있었으면 빠르게
+        self.near_departure_window = near_departure_window # 출발 이 시간(초) 전부터 빠르게
+        self.quiet_cycles_per_step = quiet_cycles_per_step # 변화 없는 주기가 이만큼 쌓일 때마다 간격 2배
+
+        self.cycle = 0
+        self._last_change_cycle = {} # {bus_id: 마지막으로 좌석이 바뀐 주기}
+        self._last_change_time = {}  # {bus_id: 마지막으로 좌석이 바뀐 시각 (monotonic)}
+        self._first_seen_cycle = {}  # {bus_id: 모니터링 대상으로 처음 본 주기}
+        self.last_decision = None    # (간격, 이유) - !status 표시용
+        self.forecaster = None       # SeatForecaster (있으면 변화가 없을 것으로 예측된 노선은 더 천천히 폴링)
+
+    def observe(self, events, watched_ids):
+        """크롤링 한 번이 끝날 때마다 호출. 변화가 생긴 노선만 갱신하므로 비용은 변화 수에 비례."""
+        self.cycle += 1
+        now = time.monotonic()
+        for event in events:
+            self._last_change_cycle[event.bus_id] = self.cycle
+            self._last_change_time[event.bus_id] = now
+        for bus_id in watched_ids:
+            self._first_seen_cycle.setdefault(bus_id, self.cycle)
+
+    def is_night(self, now):
+        start, end = self.night_hours
+        return start <= now.hour < end
+
+    def route_interval(self, route, now, monotonic_now, forecasts=None):
+        """노선 하나의 폴링 간격(초)과 이유를 반환. forecasts: 이번 결정에 쓸 forecast_all() 결과 (한 번만 계산해서 넘김)."""
+        bus_id = route.id
+        departure = parse_departure(route, now)
+        if departure is not None and timedelta(0) <= departure - now <= timedelta(seconds=self.near_departure_window):
+            return self.min_interval, "출발 임박"
+
+        changed_at = self._last_change_time.get(bus_id)
+        if changed_at is not None and monotonic_now - changed_at <= self.recent_change_window:
+            return self.min_interval, "최근 좌석 변화"
+
+        if self.is_night(now):
+            return self.max_interval, "야간"
+
+        since = self._last_change_cycle.get(bus_id, self._first_seen_cycle.get(bus_id, self.cycle))
+        steps = (self.cycle - since) // self.quiet_cycles_per_step
+        reason = f"{self.cycle - since}주기 변화 없음"
+        if self.forecaster is not None and self.forecaster.is_flat(bus_id, forecasts):
+            steps += 1 # 예측상으로도 움직이지 않을 노선은 한 단계 더 느리게
+            reason += ", 예측상 변화 없음"
+        if steps > 0:
+            return min(self.max_interval, self.base_interval * (2 ** steps)), reason
+        return self.base_interval, "기본"
+
+    def next_interval(self, schedule, watched_ids, now=None):
+        """다음 크롤링까지의 간격(초). 결정 내용은 로그로 남김."""
+        now = now or datetime.now()
+        if not watched_ids:
+            interval = self.idle_interval * (2 if self.is_night(now) else 1)
+            self.last_decision = (interval, "모니터링 대상 없음")
+            logging.info(f"[poll] 모니터링 대상 없음 -> 다음 전체 갱신 {interval}초 후")
+            return interval
+
+        monotonic_now = time.monotonic()
+        forecasts = self.forecaster.forecast_all() if self.forecaster is not None else None # 전체 노선 예측은 결정마다 한 번
+        decisions = []
+        for bus_id in sorted(watched_ids):
+            route = schedule.get(bus_id)
+            if route is None:
+                decisions.append((self.min_interval, bus_id, "노선 정보 없음"))
+            else:
+                interval, reason = self.route_interval(route, now, monotonic_now, forecasts)
+                decisions.append((interval, bus_id, reason))
+
+        interval, bus_id, reason = min(decisions)
+        self.last_decision = (interval, f"ID {bus_id}: {reason}")
+        logging.info(f"[poll] 다음 크롤링 {interval}초 후 (가장 급한 노선 ID {bus_id}: {reason}) - "
+                     + ", ".join(f"{b}={i}s({r})" for i, b, r in decisions))
+        return interval
@@ -0,0 +1,222 @@
+# 파일명: alert_rules.py
+
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
+from schedule_diff import ROUTE_ADDED, SEAT_EVENT_KINDS
+
+# 규칙 종류
+REMAINING_AT_MOST = "remaining"  # 남은 좌석(total - current)이 k 이하가 됨
+FILL_AT_LEAST = "fill"           # 좌석률(current / total)이 p% 이상이 됨
+SEAT_OPENED = "open"             # 남은 좌석이 늘어남 (취소 등으로 자리가 생김)
+ROUTE_APPEARS = "appears"        # 새 노선이 나타남
+
+# 규칙 적용 범위
+SCOPE_BUS = "bus"    # 노선 ID 하나
+SCOPE_AREA = "area"  # 지역 또는 버스 종류 (!list 필터와 같은 기준)
+SCOPE_ALL = "all"    # 모든 노선
+
+_CONDITION_PATTERNS = (
+    (REMAINING_AT_MOST, re.compile(r"^(?:remaining|seats|남은좌석)\s*<=\s*(\d+)$")),
+    (FILL_AT_LEAST, re.compile(r"^(?:fill|좌석률)\s*>=\s*(\d+)\s*%?$")),
+    (SEAT_OPENED, re.compile(r"^(?:open|opened|빈자리)$")),
+    (ROUTE_APPEARS, re.compile(r"^(?:appears|new|새노선)$")),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class AlertRule:
+    """사용자가 등록한 알림 규칙. 조건을 처음 만족하게 되는 순간(경계를 넘을 때)마다 알림."""
+    id: int
+    owner: object  # 알림을 받을 대상 (subscriptions.Target)
+    kind: str
+    scope: tuple   # (SCOPE_BUS, bus_id) / (SCOPE_AREA, 지역 또는 버스 종류) / (SCOPE_ALL, "*")
+    value: int     # REMAINING_AT_MOST면 좌석 수, FILL_AT_LEAST면 퍼센트, 나머지는 0
+
+    def matches(self, event):
+        """이 규칙 하나만 이벤트에 직접 대조 (컴파일된 RuleBook.evaluate와 같은 결과, 검증/벤치마크용)."""
+        if event.route is None or self.scope not in _event_scopes(event):
+            return False
+        if self.kind == ROUTE_APPEARS:
+            return event.kind == ROUTE_ADDED
+        if event.kind not in SEAT_EVENT_KINDS or event.route.total_seats <= 0:
+            return False
+        before, after = _remaining(event.previous), _remaining(event.route)
+        if self.kind == REMAINING_AT_MOST:
+            return after <= self.value < before
+        if self.kind == FILL_AT_LEAST:
+            return _fill(event.previous) < self.value <= _fill(event.route)
+        return after > before # SEAT_OPENED
+
+
+def _remaining(route):
+    return route.total_seats - route.current_seats
+
+
+def _fill(route):
+    return route.current_seats * 100 / route.total_seats if route.total_seats > 0 else 0.0
+
+
+def _event_scopes(event):
+    """이벤트 노선이 속한 범위 키 (같은 규칙이 두 번 울리지 않도록 지역과 버스 종류가 같으면 하나만)."""
+    route = event.route
+    if route.bus_region == route.bus_type:
+        return ((SCOPE_BUS, event.bus_id), (SCOPE_AREA, route.bus_region), (SCOPE_ALL, "*"))
+    return ((SCOPE_BUS, event.bus_id), (SCOPE_AREA, route.bus_region), (SCOPE_AREA, route.bus_type), (SCOPE_ALL, "*"))
+
+
+def parse_condition(text):
+    """'seats <= 3', 'fill >= 90%', 'open', 'appears' 같은 조건 문자열을 (종류, 값)으로. 알 수 없으면 ValueError."""
+    normalized = text.strip().lower()
+    for kind, pattern in _CONDITION_PATTERNS:
+        match = pattern.match(normalized)
+        if match:
+            value = int(match.group(1)) if match.groups() else 0
+            if kind == FILL_AT_LEAST and not 0 < value <= 100:
+                raise ValueError("좌석률은 1~100% 사이로 입력해주세요.")
+            return kind, value
+    raise ValueError(f"알 수 없는 조건입니다: '{text}'. 예: `seats<=3`, `fill>=90%`, `open`, `appears`")
+
+
+def parse_scope(token, schedule):
+    """'*'/'all'이면 전체, 현재 스냅샷에 있는 노선 ID면 그 노선, 아니면 지역/버스 종류."""
+    if token in ("*", "all", "전체"):
+        return SCOPE_ALL, "*"
+    if token in schedule:
+        return SCOPE_BUS, token
+    return SCOPE_AREA, token
+
+
+def describe_rule(rule):
+    scope_kind, scope_value = rule.scope
+    where = {SCOPE_BUS: f"ID '{scope_value}'번 노선", SCOPE_AREA: f"'{scope_value}' 노선", SCOPE_ALL: "전체 노선"}[scope_kind]
+    what = {
+        REMAINING_AT_MOST: f"남은 좌석 {rule.value}석 이하",
+        FILL_AT_LEAST: f"좌석률 {rule.value}% 이상",
+        SEAT_OPENED: "빈 자리 생김",
+        ROUTE_APPEARS: "새 노선 등장",
+    }[rule.kind]
+    return f"{where} {what}"
+
+
+class _ThresholdTable:
+    """범위 하나에 걸린 임계값 규칙들을 임계값 순으로 정렬해 둔 표. 경계를 넘은 규칙을 이분 탐색으로 찾음."""
+    __slots__ = ("thresholds", "rules")
+
+    def __init__(self, rules):
+        rules = sorted(rules, key=lambda rule: rule.value)
+        self.thresholds = [rule.value for rule in rules]
+        self.rules = rules
+
+    def crossed_down(self, before, after):
+        """before > t >= after 인 규칙 (남은 좌석이 줄어 t 이하가 됨)."""
+        return self.rules[bisect_left(self.thresholds, after):bisect_left(self.thresholds, before)]
+
+    def crossed_up(self, before, after):
+        """before < t <= after 인 규칙 (좌석률이 올라 t 이상이 됨)."""
+        return self.rules[bisect_right(self.thresholds, before):bisect_right(self.thresholds, after)]
+
+
+class RuleBook:
+    """
+    알림 규칙 모음. 규칙이 바뀌면 다음 평가 때 범위별 임계값 표로 한 번만 다시 컴파일하고,
+    스냅샷 비교 이벤트마다 그 노선에 해당하는 범위(노선/지역/버스 종류/전체)의 표만 찾아보므로
+    평가 비용은 O(이벤트 x log 규칙 수 + 실제로 울린 규칙 수).
+    스레드 안전하지 않으므로 변경은 감시 상태 작성자(watch_actor)에 맡긴 작업 안에서만 해야 함.
+    """
+
+    def __init__(self):
+        self._rules = {}   # {rule_id: AlertRule}
+        self._next_id = 1
+        self._compiled = None
+
+    def __len__(self):
+        return len(self._rules)
+
+    def __bool__(self):
+        return bool(self._rules)
+
+    def add(self, owner, kind, scope, value=0):
+        rule = AlertRule(self._next_id, owner, kind, scope, value)
+        self._rules[rule.id] = rule
+        self._next_id += 1
+        self._compiled = None
+        return rule
+
+    def remove(self, rule_id, owners):
+        """owners 중 하나가 등록한 규칙이면 삭제하고 반환, 아니면 None."""
+        rule = self._rules.get(rule_id)
+        if rule is None or rule.owner not in owners:
+            return None
+        del self._rules[rule_id]
+        self._compiled = None
+        return rule
+
+    def rules_of(self, owners):
+        return [rule for rule in self._rules.values() if rule.owner in owners]
+
+    def bus_ids(self, schedule):
+        """규칙이 지켜보는 노선 ID (적응형 폴링 간격 계산용)."""
+        scopes = {rule.scope for rule in self._rules.values()}
+        if (SCOPE_ALL, "*") in scopes:
+            return set(schedule.by_id)
+        ids = {value for kind, value in scopes if kind == SCOPE_BUS}
+        for kind, value in scopes:
+            if kind == SCOPE_AREA:
+                for routes in (schedule.by_region.get(value, ()), schedule.by_type.get(value, ())):
+                    ids.update(route.id for route in routes)
+        return ids
+
+    def _compile(self):
+        by_kind = {REMAINING_AT_MOST: {}, FILL_AT_LEAST: {}, SEAT_OPENED: {}, ROUTE_APPEARS: {}}
+        for rule in self._rules.values():
+            by_kind[rule.kind].setdefault(rule.scope, []).append(rule)
+        self._compiled = (
+            {scope: _ThresholdTable(rules) for scope, rules in by_kind[REMAINING_AT_MOST].items()},
+            {scope: _ThresholdTable(rules) for scope, rules in by_kind[FILL_AT_LEAST].items()},
+            by_kind[SEAT_OPENED],
+            by_kind[ROUTE_APPEARS],
+        )
+        return self._compiled
+
+    def evaluate(self, events):
+        """이벤트 목록에서 울린 규칙 [(AlertRule, SeatEvent)]을 반환."""
+        if not self._rules or not events:
+            return []
+        remaining_tables, fill_tables, opened, appears = self._compiled or self._compile()
+        fired = []
+        for event in events:
+            if event.route is None:
+                continue
+            scopes = _event_scopes(event)
+            if event.kind == ROUTE_ADDED:
+                for scope in scopes:
+                    fired.extend((rule, event) for rule in appears.get(scope, ()))
+                continue
+            if event.kind not in SEAT_EVENT_KINDS or event.route.total_seats <= 0:
+                continue
+            before, after = _remaining(event.previous), _remaining(event.route)
+            fill_before, fill_after = _fill(event.previous), _fill(event.route)
+            for scope in scopes: # 경계를 넘지 않았으면 표 조회 결과가 빈 구간이 됨
+                table = remaining_tables.get(scope)
+                if table:
+                    fired.extend((rule, event) for rule in table.crossed_down(before, after))
+                table = fill_tables.get(scope)
+                if table:
+                    fired.extend((rule, event) for rule in table.crossed_up(fill_before, fill_after))
+                if after > before:
+                    fired.extend((rule, event) for rule in opened.get(scope, ()))
+        return fired
+
+
+def collect_rule_alerts(rule_book, events):
+    """(감시 상태 작업 안에서 호출) 울린 규칙마다 [(대상 튜플, 메시지, 로그)]를 반환 (collect_alerts와 같은 형식)."""
+    alerts = []
+    for rule, event in rule_book.evaluate(events):
+        route = event.route
+        alerts.append(((rule.owner,),
+                       f"🔔 규칙 #{rule.id} ({describe_rule(rule)}) 충족: ID '{route.id}'번 노선\n"
+                       f"노선: {route.bus_route_detail} / 현재 좌석: {route.current_seats}/{route.total_seats}",
+                       f"규칙 #{rule.id} 알림: ID '{route.id}' {route.current_seats}/{route.total_seats}"))
+    return alerts
@@ -0,0 +1,84 @@
+# 파일명: async_scheduler.py
+
+import asyncio
+import logging
+
+
+class AsyncJob:
+    """AsyncScheduler에 등록된 주기 작업 하나."""
+
+    def __init__(self, job_id, func, interval):
+        self.id = job_id
+        self.func = func          # 인자 없는 코루틴 함수
+        self.interval = interval  # 실행 간격 (초) 또는 매번 간격을 계산하는 함수 () -> 초
+        self.removed = False
+        self.task = None
+        self.waits_for = [] # 시작 전에 끝나기를 기다릴, 같은 id로 먼저 등록됐던 태스크들
+
+    def next_interval(self):
+        return self.interval() if callable(self.interval) else self.interval
+
+
+class AsyncScheduler:
+    """
+    봇 이벤트 루프 위에서 도는 주기 작업 스케줄러 (BackgroundScheduler 대체).
+    작업은 asyncio 태스크로 실행되며, 같은 작업이 겹쳐 실행되지 않음.
+    """
+
+    def __init__(self):
+        self._jobs = {}
+        self._retiring = {} # id -> 제거됐지만 아직 끝나지 않았을 수 있는 태스크들
+        self.running = False
+
+    def start(self):
+        self.running = True
+
+    def add_job(self, func, seconds, id, run_now=False):
+        """
+        func를 seconds초마다 실행하는 작업을 등록. run_now=True면 바로 한 번 실행하고 시작.
+        seconds에 함수를 넘기면 실행이 끝날 때마다 그 함수로 다음 간격을 계산함.
+        같은 id의 작업이 있으면 제거하고, 새 작업은 이전 태스크가 끝난 뒤에 시작함 (두 벌이 겹쳐 실행되지 않음).
+        """
+        self.remove_job(id)
+        job = AsyncJob(id, func, seconds)
+        job.waits_for = [task for task in self._retiring.pop(id, ()) if not task.done()]
+        job.task = asyncio.get_running_loop().create_task(self._run(job, run_now), name=f"job:{id}")
+        self._jobs[id] = job
+        return job
+
+    def get_job(self, id):
+        return self._jobs.get(id)
+
+    def remove_job(self, id):
+        """작업 제거. 작업 자신이 실행 중에 호출해도 안전함 (이번 실행이 끝난 뒤 멈춤)."""
+        job = self._jobs.pop(id, None)
+        if job is None:
+            return
+        job.removed = True
+        # 같은 id로 다시 등록되면 새 작업은 이 태스크(와 이 작업이 기다리던 태스크)가 끝난 뒤 시작함
+        self._retiring[id] = [task for task in self._retiring.get(id, []) + job.waits_for + [job.task] if not task.done()]
+        if job.task is not asyncio.current_task():
+            job.task.cancel()
+
+    def shutdown(self):
+        for job_id in list(self._jobs):
+            self.remove_job(job_id)
+        self.running = False
+
+    async def _run(self, job, run_now):
+        if job.waits_for:
+            # 이전 태스크는 취소됐거나 (작업 안에서 다시 등록한 경우) 이번 실행을 마무리하는 중
+            await asyncio.wait(job.waits_for)
+            job.waits_for = []
+        if not run_now:
+            await asyncio.sleep(job.next_interval())
+        while not job.removed:
+            try:
+                await job.func()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"주기 작업 '{job.id}' 실행 중 오류 발생: {e}", exc_info=True)
+            if job.removed:
+                break
+            await asyncio.sleep(job.next_interval())
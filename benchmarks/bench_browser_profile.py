@@ -0,0 +1,107 @@
+# 파일명: benchmarks/bench_browser_profile.py
+# 실행: python benchmarks/bench_browser_profile.py [--crawls 5] [--url https://kit.kumoh.ac.kr]
+# 기존 크롬 설정과 가벼운 프로필(WEBDRIVER_LEAN_PROFILE)을 번갈아 띄워 비교함:
+#  (1) 예약 페이지 로드 시간 (Navigation Timing의 loadEventEnd), (2) 로그인 시간, (3) 크롤링 한 번 시간,
+#  (4) 크롤링 후 chromedriver + 크롬 프로세스 트리 전체 RSS, (5) 포털이 받은 정적 리소스 요청 수 (가짜 포털일 때만)
+# --url을 주지 않으면 가짜 포털(fake_portal.py, 정적 리소스 지연 포함)에 붙음. 크롬과 key.py의 CHROMEDRIVER_PATH가 필요함.
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 페이지 로드가 끝난 시점까지 걸린 시간 (ms)
+_LOAD_TIME_SCRIPT = "var t = performance.timing; return t.loadEventEnd - t.navigationStart;"
+
+
+def measure_profile(lean, crawls, portal=None):
+    import login_crawler
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from portal_config import BUS_RESERVATION_URL
+    from browser_watchdog import process_tree_rss
+
+    keeper = login_crawler.session_keeper
+    keeper.close()
+    assets_before = portal.asset_requests if portal else 0
+    driver = login_crawler._create_webdriver(headless=True, lean=lean)
+    try:
+        driver.get(BUS_RESERVATION_URL)
+        WebDriverWait(driver, 25).until(lambda d: d.execute_script("return document.readyState") == "complete")
+        load_ms = driver.execute_script(_LOAD_TIME_SCRIPT)
+
+        start = time.perf_counter()
+        login_crawler._login(driver)
+        login_s = time.perf_counter() - start
+
+        # 이미 로그인된 드라이버를 세션 관리자에 넘겨 크롤링 시간만 잼 (콜드 스타트/로그인 제외)
+        keeper.driver_factory = lambda: driver
+        keeper.login_fn = lambda d: None
+        keeper.resume_fn = None
+        crawl_times = []
+        for _ in range(crawls):
+            start = time.perf_counter()
+            login_crawler.get_bus_schedule_selenium()
+            crawl_times.append(time.perf_counter() - start)
+        driver.switch_to.default_content()
+        rss = process_tree_rss(driver.service.process.pid)
+        tabs = len(driver.window_handles)
+        driver.find_element(By.NAME, "iframeA") # 크롤링 후에도 예약 페이지에 있는지 확인
+    finally:
+        keeper.close()
+        keeper.driver_factory = login_crawler._create_webdriver
+        keeper.login_fn = login_crawler._login
+        keeper.resume_fn = login_crawler._resume_session
+        try:
+            driver.quit() # 세션 관리자에 넘기기 전에 실패한 경우
+        except Exception:
+            pass
+    assets = (portal.asset_requests - assets_before) if portal else None
+    return load_ms, login_s, statistics.median(crawl_times), rss, tabs, assets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="크롬 기본 설정 vs 가벼운 프로필 비교")
+    parser.add_argument("--crawls", type=int, default=5, help="프로필마다 크롤링 횟수 (기본 5)")
+    parser.add_argument("--rounds", type=int, default=2, help="두 프로필을 번갈아 재는 횟수 (기본 2)")
+    parser.add_argument("--url", help="실제 포털 주소 (주지 않으면 가짜 포털 사용)")
+    args = parser.parse_args()
+
+    os.environ["KUMOH_SESSION_STORE"] = "" # 매번 전체 로그인 시간을 재도록 세션 저장/복원은 끔
+    portal = None
+    if args.url:
+        os.environ["KUMOH_PORTAL_URL"] = args.url
+    else:
+        from load_harness import free_port
+        port = free_port()
+        os.environ["KUMOH_PORTAL_URL"] = f"http://127.0.0.1:{port}"
+        from fake_portal import FakePortal, SeatScript
+        portal = FakePortal(SeatScript(), port=port).start()
+
+    results = {False: [], True: []}
+    try:
+        for _ in range(args.rounds):
+            for lean in (False, True):
+                results[lean].append(measure_profile(lean, args.crawls, portal))
+    finally:
+        if portal:
+            portal.stop()
+
+    print(f"{'프로필':<10}{'페이지 로드(ms)':>16}{'로그인(s)':>11}{'크롤링(s)':>11}{'RSS(MB)':>10}{'탭':>4}{'리소스 요청':>12}")
+    for lean in (False, True):
+        rows = results[lean]
+        load_ms = statistics.median(r[0] for r in rows)
+        login_s = statistics.median(r[1] for r in rows)
+        crawl_s = statistics.median(r[2] for r in rows)
+        rss_mb = statistics.median(r[3] for r in rows) / 2 ** 20
+        tabs = rows[-1][4]
+        assets = rows[-1][5]
+        print(f"{'가벼운' if lean else '기존':<10}{load_ms:>16.0f}{login_s:>11.2f}{crawl_s:>11.3f}{rss_mb:>10.0f}{tabs:>4}"
+              f"{assets if assets is not None else '-':>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# 파일명: benchmarks/bench_crawler_isolation.py
+# 실행: python benchmarks/bench_crawler_isolation.py [--crawls 30] [--routes 400] [--hang 30] [--timeout 3]
+# 크롤러를 봇 프로세스 안(스레드)에서 돌릴 때와 크롤러 프로세스(crawler_worker.py)로 돌릴 때를 비교함.
+# 모드마다 새 파이썬 프로세스에서 봇 모듈을 불러오고 가짜 포털(HTTP 백엔드)에 붙어서:
+#  (1) 연속 크롤링 중 이벤트 루프 지연 (10ms 주기 타이머가 늦게 깨어난 시간 = 하트비트/명령 처리가 밀리는 시간)
+#  (2) 포털 조회가 --hang초 동안 멈췄을 때 크롤링 요청이 끝나기까지 걸린 시간과 그동안의 이벤트 루프 지연
+#  (3) 포털이 돌아온 뒤 다음 크롤링이 성공하기까지 걸린 시간
+# 가짜 포털도 같은 프로세스에서 돌기 때문에 두 모드 모두 같은 만큼의 잡음이 섞임.
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TICK = 0.01 # 이벤트 루프 지연을 재는 타이머 주기 (초)
+
+
+async def measure_lag(lags, stop):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - started - TICK)
+
+
+def child(args):
+    """새 프로세스에서 실행: 가짜 포털 + 봇 모듈로 측정하고 결과를 JSON 한 줄로 출력."""
+    from load_harness import free_port, percentile
+    port = free_port()
+    os.environ["KUMOH_PORTAL_URL"] = f"http://127.0.0.1:{port}"
+    from fake_portal import FakePortal, SeatScript
+    portal = FakePortal(SeatScript(routes=args.routes), port=port).start()
+    import discord_bot_server as bot_server
+    logging.getLogger().setLevel(logging.WARNING)
+
+    async def run():
+        stop = asyncio.Event()
+        lags = []
+        ticker = asyncio.get_running_loop().create_task(measure_lag(lags, stop))
+        await bot_server.schedule_cache.refresh() # 로그인 (크롤러 프로세스면 프로세스 시작 포함)
+
+        lags.clear()
+        crawl_times = []
+        for _ in range(args.crawls):
+            started = time.perf_counter()
+            await bot_server.schedule_cache.refresh()
+            crawl_times.append(time.perf_counter() - started)
+        normal_lags = list(lags)
+
+        lags.clear()
+        portal.grid_delay = args.hang # 포털 조회가 멈춤
+        started = time.perf_counter()
+        hung_ok = await bot_server.schedule_cache.refresh()
+        hang_s = time.perf_counter() - started
+        hang_lags = list(lags)
+
+        portal.grid_delay = 0
+        started = time.perf_counter()
+        recovered = await bot_server.schedule_cache.refresh()
+        recover_s = time.perf_counter() - started
+        stop.set()
+        await ticker
+        return {
+            "crawl_p50_ms": percentile(crawl_times, 0.5) * 1000,
+            "lag_p99_ms": percentile(normal_lags, 0.99) * 1000,
+            "lag_max_ms": max(normal_lags) * 1000,
+            "hang_s": hang_s,
+            "hang_failed": not hung_ok,
+            "hang_lag_max_ms": max(hang_lags) * 1000,
+            "recover_s": recover_s if recovered else None,
+        }
+
+    try:
+        result = asyncio.run(run())
+    finally:
+        crawler_module = bot_server.loaded_crawler()
+        if crawler_module is not None:
+            crawler_module.close_webdriver()
+        bot_server.crawler_executor.shutdown(wait=False)
+        portal.stop()
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="크롤러 스레드 vs 크롤러 프로세스: 이벤트 루프 지연과 멈춤 복구 비교")
+    parser.add_argument("--crawls", type=int, default=30, help="연속 크롤링 횟수 (기본 30)")
+    parser.add_argument("--routes", type=int, default=400, help="가짜 포털 노선 수 (파싱 부담, 기본 400)")
+    parser.add_argument("--hang", type=float, default=30, help="포털 조회가 멈추는 시간 (초, 기본 30)")
+    parser.add_argument("--timeout", type=int, default=3, help="크롤러 프로세스 응답 제한 KUMOH_CRAWLER_TIMEOUT (초, 기본 3)")
+    parser.add_argument("--child", choices=("thread", "process"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+        return
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="kumoh_isolation_") as work_dir:
+        for mode in ("thread", "process"):
+            env = dict(os.environ, KUMOH_CRAWLER_BACKEND="http", KUMOH_SESSION_STORE="",
+                       KUMOH_HISTORY_DB=os.path.join(work_dir, f"history_{mode}.sqlite3"),
+                       KUMOH_SNAPSHOT_MAX_AGE="0", KUMOH_CRAWLER_TIMEOUT=str(args.timeout),
+                       KUMOH_CRAWLER_PROCESS="1" if mode == "process" else "0")
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", mode, "--crawls", str(args.crawls),
+                 "--routes", str(args.routes), "--hang", str(args.hang)],
+                env=env, cwd=work_dir, capture_output=True, text=True, timeout=args.hang * 3 + 300,
+            )
+            if output.returncode != 0:
+                print(output.stderr[-2000:])
+                raise SystemExit(f"{mode} 측정 실패")
+            results[mode] = json.loads(output.stdout.strip().splitlines()[-1])
+
+    print(f"가짜 포털 노선 {args.routes}개, 연속 크롤링 {args.crawls}회, 포털 멈춤 {args.hang}초, 크롤러 프로세스 응답 제한 {args.timeout}초")
+    print(f"{'모드':<9}{'크롤링 p50(ms)':>15}{'루프 지연 p99(ms)':>18}{'최대(ms)':>10}"
+          f"{'멈춤 요청(s)':>13}{'멈춤 중 최대 지연(ms)':>22}{'복구 크롤링(s)':>15}")
+    for mode, r in results.items():
+        recover = f"{r['recover_s']:.2f}" if r["recover_s"] is not None else "실패"
+        print(f"{mode:<9}{r['crawl_p50_ms']:>15.1f}{r['lag_p99_ms']:>18.1f}{r['lag_max_ms']:>10.1f}"
+              f"{r['hang_s']:>13.1f}{r['hang_lag_max_ms']:>22.1f}{recover:>15}")
+
+
+if __name__ == "__main__":
+    main()
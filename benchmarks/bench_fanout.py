@@ -0,0 +1,95 @@
+# 파일명: benchmarks/bench_fanout.py
+# 실행: python benchmarks/bench_fanout.py
+# 구독자 수를 늘려가며 (1) 알림 판단(collect_alerts) 시간, (2) 폴링 주기가 실제로 기다리는 시간,
+# (3) 가짜 디스코드 클라이언트로 모든 DM을 보내는 데 걸리는 시간과 동시 전송 수를 잼.
+# 가짜 클라이언트는 전송마다 SEND_LATENCY초가 걸리고, RATE_LIMIT_EVERY번째 전송마다 429를 한 번 돌려줌.
+
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bus_model import BusSchedule  # noqa: E402
+from schedule_diff import diff_schedules  # noqa: E402
+from notification_outbox import NotificationOutbox  # noqa: E402
+from subscriptions import SubscriptionIndex, collect_alerts, user_target, channel_target  # noqa: E402
+from fakes import FakeDiscord  # noqa: E402
+
+ROUTES = 60
+CHANGED_ROUTES = 5            # 한 주기에 만석 -> 자리 남으로 바뀌는 노선 수
+SUBSCRIBER_COUNTS = (100, 1000, 5000)
+ROUTES_PER_SUBSCRIBER = 3
+SEND_LATENCY = 0.002          # 가짜 전송 한 번에 걸리는 시간 (초)
+RATE_LIMIT_EVERY = 500        # 이 횟수마다 429 한 번
+CONCURRENCY_LIMITS = (8, 32)
+
+
+def make_schedule(full_ids, version):
+    return BusSchedule.from_dicts(
+        ({"id": str(i), "bus_type": "통학", "bus_number": str(i), "bus_vehicle": "45인승", "bus_region": "구미",
+          "bus_route_detail": "구미역 -> 학교", "current_seats": 45 if str(i) in full_ids else 40, "total_seats": 45}
+         for i in range(ROUTES)),
+        datetime(2026, 1, 1, 7, 0), version,
+    )
+
+
+def build_index(subscribers, full_schedule, seed=0):
+    """구독자마다 노선 ROUTES_PER_SUBSCRIBER개를 구독시키고 첫 확인까지 끝낸 색인."""
+    rng = random.Random(seed)
+    index = SubscriptionIndex()
+    for k in range(subscribers):
+        target = channel_target(k) if k % 10 == 0 else user_target(k)
+        for bus_id in rng.sample(range(ROUTES), ROUTES_PER_SUBSCRIBER):
+            index.subscribe(target, str(bus_id))
+    collect_alerts(index, full_schedule, []) # 첫 확인 (모두 만석이므로 구독 유지)
+    return index
+
+
+async def run_cycle(subscribers, concurrency):
+    all_ids = {str(i) for i in range(ROUTES)}
+    before = make_schedule(all_ids, 1)
+    after = make_schedule(all_ids - {str(i) for i in range(CHANGED_ROUTES)}, 2)
+    events = diff_schedules(before, after)
+    index = build_index(subscribers, before)
+
+    client = FakeDiscord(SEND_LATENCY, RATE_LIMIT_EVERY)
+    outbox = NotificationOutbox(client.resolve, base_delay=0.01, max_concurrency=concurrency)
+
+    started = time.perf_counter()
+    alerts = collect_alerts(index, after, events)
+    decided = time.perf_counter()
+    for targets, message, _ in alerts:
+        for target in targets:
+            outbox.put(target, message)
+    task = outbox.dispatch() # 모니터링 잡은 여기서 바로 반환
+    cycle = time.perf_counter()
+    await task
+    delivered = time.perf_counter()
+
+    targets = sum(len(t) for t, _, _ in alerts)
+    stats = outbox.stats()
+    assert stats["dropped"] == 0 and stats["sent_messages"] == len({t for ts, _, _ in alerts for t in ts}) # 대상마다 합친 메시지 1개
+    assert client.peak_in_flight <= concurrency
+    return targets, (decided - started) * 1000, (cycle - started) * 1000, delivered - started, client.peak_in_flight, stats
+
+
+async def main():
+    logging.basicConfig(level=logging.WARNING)
+    print(f"노선 {ROUTES}개 중 {CHANGED_ROUTES}개가 자리 남으로 변경, 구독자당 노선 {ROUTES_PER_SUBSCRIBER}개, "
+          f"가짜 전송 지연 {SEND_LATENCY * 1000:.0f}ms")
+    print(f"{'구독자':>6} {'동시':>4} {'알림 대상':>8} {'판단(ms)':>9} {'폴링 주기(ms)':>13} {'전송 완료(s)':>11} "
+          f"{'최대 동시':>8} {'메시지':>6} {'재시도':>6}")
+    for subscribers in SUBSCRIBER_COUNTS:
+        for concurrency in CONCURRENCY_LIMITS:
+            targets, decide_ms, cycle_ms, delivered_s, peak, stats = await run_cycle(subscribers, concurrency)
+            print(f"{subscribers:>6} {concurrency:>4} {targets:>8} {decide_ms:>9.2f} {cycle_ms:>13.2f} {delivered_s:>11.2f} "
+                  f"{peak:>8} {stats['sent_messages']:>6} {stats['retries']:>6}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+# 파일명: benchmarks/bench_forecast.py
+# 실행: python benchmarks/bench_forecast.py
+# SeatForecaster의 스냅샷 1회 갱신 비용이 기록 길이와 무관함을 보여주기 위해,
+# 같은 기록을 매번 처음부터 다시 맞추는(refit) 방식과 비교함.
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bus_model import BusSchedule  # noqa: E402
+from seat_forecast import SeatForecaster  # noqa: E402
+
+ROUTES = 60
+HISTORY_LENGTHS = (10, 100, 1000, 5000)
+POLL_SECONDS = 60
+
+
+def make_history(length, seed=0):
+    """노선 ROUTES개가 무작위로 조금씩 차오르는 스냅샷 length개."""
+    rng = np.random.default_rng(seed)
+    seats = rng.integers(0, 20, ROUTES)
+    start = datetime(2026, 1, 1, 6, 0)
+    history = []
+    for k in range(length):
+        seats = np.minimum(45, seats + (rng.random(ROUTES) < 0.2))
+        history.append(BusSchedule.from_dicts(
+            ({"id": str(i), "bus_type": "통학", "bus_number": str(i), "bus_vehicle": "45인승", "bus_region": "구미",
+              "bus_route_detail": "구미역 -> 학교", "current_seats": int(seats[i]), "total_seats": 45}
+             for i in range(ROUTES)),
+            start + timedelta(seconds=POLL_SECONDS * k), k + 1,
+        ))
+    return history
+
+
+def refit(history, half_life=30 * 60):
+    """비교 대상: 전체 기록으로 가중 선형회귀를 처음부터 다시 계산 (NumPy 벡터 연산)."""
+    now = history[-1].fetched_at
+    t = np.array([(s.fetched_at - now).total_seconds() / 3600.0 for s in history])
+    y = np.array([[route.current_seats for route in s.routes] for s in history]) # (기록 수, 노선 수)
+    w = 0.5 ** (-t * 3600.0 / half_life)
+    s0, st, stt = w.sum(), (w * t).sum(), (w * t * t).sum()
+    sy, sty = (w[:, None] * y).sum(axis=0), ((w * t)[:, None] * y).sum(axis=0)
+    return (s0 * sty - st * sy) / (s0 * stt - st * st)
+
+
+def main():
+    print(f"노선 {ROUTES}개, 스냅샷 간격 {POLL_SECONDS}초")
+    print(f"{'기록 길이':>10} | {'증분 갱신 (1회)':>16} | {'전체 재적합 (1회)':>18}")
+    for length in HISTORY_LENGTHS:
+        history = make_history(length)
+        forecaster = SeatForecaster()
+        for schedule in history[:-1]:
+            forecaster.update(schedule)
+
+        repeat = 50
+        started = time.perf_counter()
+        for _ in range(repeat):
+            clone = SeatForecaster()
+            clone._index, clone._sums = dict(forecaster._index), forecaster._sums.copy()
+            clone._total, clone._last, clone._last_time = forecaster._total, forecaster._last, forecaster._last_time
+            clone.update(history[-1])
+        incremental = (time.perf_counter() - started) / repeat
+
+        started = time.perf_counter()
+        for _ in range(max(1, repeat // 10)):
+            slopes = refit(history)
+        full = (time.perf_counter() - started) / max(1, repeat // 10)
+
+        forecaster.update(history[-1])
+        incremental_slopes = forecaster._estimate()[0]
+        assert np.allclose(incremental_slopes, slopes, atol=1e-6), "증분 결과가 전체 재적합과 다릅니다."
+        print(f"{length:>10} | {incremental * 1000:>13.3f}ms | {full * 1000:>15.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+# 파일명: benchmarks/bench_read_api.py
+# 실행: python benchmarks/bench_read_api.py [--duration 10] [--pollers 50] [--poll-interval 0] [--watchers 200] [--streams 50]
+#                                           [--publish-interval 1]
+# 읽기 API(read_api.py) 부하 테스트 (실제 포털/디스코드 없이, 고정 데이터 80개 노선).
+# 서버는 자식 프로세스에서 SnapshotBoard + ReadApi만 띄우고, 발행 스레드가 --publish-interval초마다 새 스냅샷을 발행함.
+# 부모 프로세스의 소비자:
+#   pollers   GET /snapshot을 If-None-Match와 함께 --poll-interval초마다 반복 (0이면 쉬지 않고, 대부분 304)
+#   watchers  GET /events 롱폴링을 반복 (발행 -> 응답까지 걸린 시간 = 전달 지연)
+#   streams   GET /events/stream SSE 연결을 유지하고 받은 발행 수/빠진 버전 수를 셈
+# 측정: 종류별 요청 수와 지연 시간, 304 비율, 전달 지연, 서버 프로세스 CPU 시간 (요청 하나당/발행 하나당),
+#       스냅샷 JSON을 실제로 만든 횟수 (발행 수만큼이면 소비자 수와 상관없이 한 번씩만 인코딩한 것)
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from load_harness import percentile  # noqa: E402
+
+
+def serve(args):
+    """자식 프로세스: 읽기 API 서버 + 발행 스레드. 준비되면 포트를 출력하고, 표준 입력이 닫히면 통계를 JSON 한 줄로 출력."""
+    import perf_metrics
+    from bus_model import BusSchedule, EMPTY_SCHEDULE
+    from schedule_diff import diff_schedules
+    from snapshot_board import SnapshotBoard
+    from read_api import ReadApi
+    from fixtures import fixture_schedule
+
+    base = fixture_schedule(args.routes)
+    full = tuple(replace(route, current_seats=route.total_seats) for route in base.routes)
+    partial = tuple(replace(route, current_seats=route.total_seats - (k % 4)) for k, route in enumerate(full))
+    board = SnapshotBoard(BusSchedule(full, datetime.now(), 1))
+    stop = threading.Event()
+
+    def publisher():
+        k = 0
+        while not stop.wait(args.publish_interval):
+            k += 1
+            previous = board.current
+            schedule = BusSchedule((full, partial)[k % 2], datetime.now(), previous.version + 1)
+            board.compare_and_publish(previous, schedule, diff_schedules(previous if previous is not EMPTY_SCHEDULE else None, schedule))
+
+    async def run():
+        api = ReadApi(board, 0)
+        port = await api.start()
+        print(port, flush=True)
+        thread = threading.Thread(target=publisher, daemon=True)
+        thread.start()
+        loop = asyncio.get_running_loop()
+        cpu_started = time.process_time()
+        await loop.run_in_executor(None, sys.stdin.read) # 부모가 표준 입력을 닫으면 끝
+        cpu = time.process_time() - cpu_started
+        stop.set()
+        thread.join()
+        stats = api.stats()
+        await api.stop()
+        encodes = perf_metrics.latency_summary().get("read_api_encode_snapshot", (0,))[0]
+        return dict(stats, cpu_s=cpu, publishes=board.publishes, snapshot_encodes=encodes)
+
+    print(json.dumps(asyncio.run(run())), flush=True)
+
+
+async def load(port, args):
+    import aiohttp
+    base = f"http://127.0.0.1:{port}"
+    stop = asyncio.Event()
+    results = {"snapshot": [], "not_modified": 0, "poll": [], "delivery": [], "stream_events": 0, "stream_gaps": 0, "errors": 0}
+
+    async def poller(session):
+        etag = None
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                async with session.get(f"{base}/snapshot", headers={"If-None-Match": etag} if etag else {}) as response:
+                    await response.read()
+                    etag = response.headers.get("ETag")
+                    results["not_modified"] += response.status == 304
+            except aiohttp.ClientError:
+                results["errors"] += 1
+                continue
+            results["snapshot"].append(time.perf_counter() - started)
+            if args.poll_interval:
+                await asyncio.sleep(args.poll_interval)
+
+    async def watcher(session):
+        since = None
+        while not stop.is_set():
+            params = {"timeout": "5"} if since is None else {"since": str(since), "timeout": "5"}
+            started = time.perf_counter()
+            try:
+                async with session.get(f"{base}/events", params=params) as response:
+                    body = await response.json()
+            except aiohttp.ClientError:
+                results["errors"] += 1
+                continue
+            results["poll"].append(time.perf_counter() - started)
+            if since is not None and body["version"] != since and body["fetched_at"]:
+                results["delivery"].append((datetime.now() - datetime.fromisoformat(body["fetched_at"])).total_seconds())
+            since = body["version"]
+
+    async def streamer(session):
+        last = None
+        try:
+            async with session.get(f"{base}/events/stream") as response:
+                async for line in response.content:
+                    if line.startswith(b"id: "):
+                        version = int(line[4:])
+                        if last is not None and version != last + 1:
+                            results["stream_gaps"] += 1
+                        last = version
+                    elif line.startswith(b"event: seats"):
+                        results["stream_events"] += 1
+        except (aiohttp.ClientError, asyncio.CancelledError):
+            pass
+
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = [asyncio.create_task(poller(session)) for _ in range(args.pollers)]
+        tasks += [asyncio.create_task(watcher(session)) for _ in range(args.watchers)]
+        streams = [asyncio.create_task(streamer(session)) for _ in range(args.streams)]
+        await asyncio.sleep(args.duration)
+        stop.set()
+        for task in streams:
+            task.cancel()
+        await asyncio.gather(*tasks, *streams, return_exceptions=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="읽기 API 부하 테스트 (ETag/304, 롱폴링, SSE)")
+    parser.add_argument("--duration", type=float, default=10, help="측정 시간 (초, 기본 10)")
+    parser.add_argument("--pollers", type=int, default=50, help="If-None-Match로 스냅샷을 반복 조회하는 소비자 수 (기본 50)")
+    parser.add_argument("--poll-interval", type=float, default=0, help="스냅샷 조회 간격 (초, 기본 0 = 쉬지 않고)")
+    parser.add_argument("--watchers", type=int, default=200, help="롱폴링 소비자 수 (기본 200)")
+    parser.add_argument("--streams", type=int, default=50, help="SSE 소비자 수 (기본 50)")
+    parser.add_argument("--publish-interval", type=float, default=1, help="스냅샷 발행 간격 (초, 기본 1)")
+    parser.add_argument("--routes", type=int, default=80, help="노선 수 (기본 80)")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args)
+        return
+
+    server = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", "--routes", str(args.routes),
+                               "--publish-interval", str(args.publish_interval)],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    try:
+        port = int(server.stdout.readline())
+        results = asyncio.run(load(port, args))
+    finally:
+        server.stdin.close()
+    stats = json.loads(server.stdout.readline())
+    server.wait(timeout=30)
+
+    snapshot, poll, delivery = results["snapshot"], results["poll"], results["delivery"]
+    requests = stats["requests"]
+    print(f"노선 {args.routes}개, 발행 {args.publish_interval}초마다, 소비자: 스냅샷 조회 {args.pollers} ({args.poll_interval}초마다), 롱폴링 {args.watchers}, "
+          f"SSE {args.streams}, {args.duration}초")
+    print(f"스냅샷 조회: {len(snapshot)}회 ({len(snapshot) / args.duration:.0f}회/s), 304 {results['not_modified'] / max(len(snapshot), 1):.1%}, "
+          f"p50 {percentile(snapshot, 0.5) * 1000:.2f}ms, p99 {percentile(snapshot, 0.99) * 1000:.2f}ms")
+    print(f"롱폴링: 응답 {len(poll)}회, 전달 지연 (발행 -> 응답) p50 {percentile(delivery, 0.5) * 1000:.1f}ms, "
+          f"p99 {percentile(delivery, 0.99) * 1000:.1f}ms, 최대 {max(delivery, default=float('nan')) * 1000:.1f}ms")
+    print(f"SSE: 받은 발행 {results['stream_events']}개 (연결당 {results['stream_events'] / max(args.streams, 1):.1f}개), "
+          f"빠진 버전 {results['stream_gaps']}회, 클라이언트 오류 {results['errors']}회")
+    print(f"서버: 발행 {stats['publishes']}회, 스냅샷 JSON 인코딩 {stats['snapshot_encodes']}회, 요청 {requests}회, "
+          f"CPU {stats['cpu_s']:.2f}초 (요청당 {stats['cpu_s'] / max(requests, 1) * 1e6:.0f}µs), 보낸 데이터 {stats['bytes_sent'] / 1024:.0f}KB")
+
+
+if __name__ == "__main__":
+    main()
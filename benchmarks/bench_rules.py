@@ -0,0 +1,105 @@
+# 파일명: benchmarks/bench_rules.py
+# 실행: python benchmarks/bench_rules.py
+# 알림 규칙 10,000개를 노선 80개짜리 스냅샷 비교 결과에 대조할 때,
+# 컴파일된 RuleBook.evaluate(범위별 임계값 표 + 이분 탐색)와 규칙을 하나씩 검사하는 방식을 비교함.
+
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bus_model import BusSchedule  # noqa: E402
+from schedule_diff import diff_schedules  # noqa: E402
+from subscriptions import user_target  # noqa: E402
+from alert_rules import (  # noqa: E402
+    RuleBook, REMAINING_AT_MOST, FILL_AT_LEAST, SEAT_OPENED, ROUTE_APPEARS, SCOPE_BUS, SCOPE_AREA, SCOPE_ALL,
+)
+
+ROUTES = 80
+REGIONS = ("구미", "대구", "포항", "김천", "상주")
+BUS_TYPES = ("통학", "셔틀")
+RULE_COUNTS = (1000, 10000)
+CYCLES = 50                 # 비교할 폴링 주기 수
+CHANGE_RATIO = 0.25         # 한 주기에 좌석이 바뀌는 노선 비율
+
+
+def make_routes(rng, count):
+    return [{"id": str(i), "bus_type": BUS_TYPES[i % 2], "bus_number": str(i), "bus_vehicle": "45인승",
+             "bus_region": REGIONS[i % len(REGIONS)], "bus_route_detail": f"{REGIONS[i % len(REGIONS)]} -> 학교",
+             "current_seats": rng.randint(0, 45), "total_seats": 45} for i in range(count)]
+
+
+def make_cycles(seed=0):
+    """좌석이 오르내리고 가끔 새 노선이 생기는 스냅샷 CYCLES+1개."""
+    rng = random.Random(seed)
+    routes = make_routes(rng, ROUTES)
+    snapshots = [BusSchedule.from_dicts(routes, datetime(2026, 1, 1, 7, 0), 1)]
+    for k in range(CYCLES):
+        routes = [dict(route) for route in routes]
+        for route in rng.sample(routes, int(ROUTES * CHANGE_RATIO)):
+            route["current_seats"] = max(0, min(45, route["current_seats"] + rng.choice((-2, -1, 1, 2, 3))))
+        if k % 10 == 9: # 가끔 노선 추가
+            extra = make_routes(rng, len(routes) + 1)[-1]
+            routes.append(extra)
+        snapshots.append(BusSchedule.from_dicts(routes, datetime(2026, 1, 1, 7, 0), k + 2))
+    return [diff_schedules(old, new) for old, new in zip(snapshots, snapshots[1:])]
+
+
+def make_rule_book(count, seed=0):
+    rng = random.Random(seed)
+    book = RuleBook()
+    for k in range(count):
+        owner = user_target(k % 3000)
+        roll = rng.random()
+        if roll < 0.6:
+            scope = (SCOPE_BUS, str(rng.randrange(ROUTES)))
+        elif roll < 0.95:
+            scope = (SCOPE_AREA, rng.choice(REGIONS + BUS_TYPES))
+        else:
+            scope = (SCOPE_ALL, "*")
+        kind = rng.choices((REMAINING_AT_MOST, FILL_AT_LEAST, SEAT_OPENED, ROUTE_APPEARS), (0.5, 0.35, 0.1, 0.05))[0]
+        value = rng.randint(0, 10) if kind == REMAINING_AT_MOST else rng.randint(50, 100) if kind == FILL_AT_LEAST else 0
+        book.add(owner, kind, scope, value)
+    return book
+
+
+def naive_evaluate(rules, events):
+    return [(rule, event) for event in events for rule in rules if rule.matches(event)]
+
+
+def key(fired):
+    return sorted((rule.id, event.bus_id) for rule, event in fired)
+
+
+def main():
+    cycles = make_cycles()
+    events_total = sum(len(events) for events in cycles)
+    print(f"노선 {ROUTES}개, 폴링 {CYCLES}회, 변화 이벤트 총 {events_total}건")
+    print(f"{'규칙':>6} {'컴파일(ms)':>10} {'컴파일 평가(ms/주기)':>20} {'하나씩 검사(ms/주기)':>20} {'배율':>6} {'울린 규칙':>9}")
+    for count in RULE_COUNTS:
+        book = make_rule_book(count)
+        rules = book.rules_of({user_target(k) for k in range(3000)})
+
+        started = time.perf_counter()
+        book._compile()
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        compiled = [book.evaluate(events) for events in cycles]
+        compiled_ms = (time.perf_counter() - started) * 1000 / CYCLES
+
+        started = time.perf_counter()
+        naive = [naive_evaluate(rules, events) for events in cycles]
+        naive_ms = (time.perf_counter() - started) * 1000 / CYCLES
+
+        for a, b in zip(compiled, naive):
+            assert key(a) == key(b), "컴파일된 평가와 하나씩 검사한 결과가 다름"
+        fired = sum(len(f) for f in compiled)
+        print(f"{count:>6} {compile_ms:>10.2f} {compiled_ms:>20.3f} {naive_ms:>20.2f} {naive_ms / compiled_ms:>5.0f}x {fired:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# 파일명: benchmarks/bench_startup.py
+# 실행: python benchmarks/bench_startup.py [--runs 3] [--login-delay 2.0] [--backend http|selenium]
+# 봇 재시작 직후를 재현해 비교함 (가짜 포털 + 가짜 디스코드, 매 측정마다 새 파이썬 프로세스):
+#  - warm: on_ready 직후 사전 준비(prewarm) 시작 -> 마지막 스냅샷 복원 + 크롤러 로드/로그인을 미리 해 둠
+#  - cold: 사전 준비 없이 첫 명령이 스냅샷 로드/크롤러 로드/로그인/크롤링을 모두 기다림
+# 측정: (1) discord_bot_server 모듈 로드 시간과 그때 selenium/numpy/sqlite3가 로드됐는지,
+#       (2) 연결 --delay초 뒤 보낸 첫 !list가 노선 목록으로 답하기까지 걸린 시간,
+#       (3) 이어서 !load처럼 새로 크롤링을 요청했을 때, 시작부터 최신 스냅샷을 받을 때까지 걸린 시간
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def child(mode, delay):
+    """새 프로세스에서 실행: 봇 모듈을 불러오고 첫 !list를 보내 시간을 잼. 결과는 JSON 한 줄로 출력."""
+    started = time.perf_counter()
+    import discord_bot_server as bot_server
+    import_s = time.perf_counter() - started
+    selenium_loaded = "selenium" in sys.modules
+    numpy_loaded = "numpy" in sys.modules
+    sqlite_loaded = "sqlite3" in sys.modules
+    logging.getLogger().setLevel(logging.WARNING)
+    from load_harness import FakeContext
+
+    async def run():
+        if mode == "warm":
+            bot_server.start_prewarm() # on_ready에서 하는 일
+        await asyncio.sleep(delay)      # 사용자가 첫 명령을 입력하기까지
+
+        replies = []
+        ctx = FakeContext(1, channel_id=10)
+
+        async def send(content=None, embed=None, **kwargs):
+            replies.append((time.perf_counter(), embed))
+        ctx.send = send
+        asked = time.perf_counter()
+        await bot_server.list_buses.callback(ctx, None)
+        answered = next((t for t, embed in replies if embed is not None), None) # 노선 리스트 임베드가 온 시각
+
+        await bot_server.schedule_cache.refresh() # 이어서 !load처럼 최신 좌석을 요청
+        fresh_s = time.perf_counter() - started
+        return (answered - asked) if answered else None, fresh_s
+
+    first_answer_s, fresh_s = asyncio.run(run())
+    bot_server.crawler_executor.shutdown(wait=True)
+    print(json.dumps({"import_s": import_s, "selenium_loaded": selenium_loaded, "numpy_loaded": numpy_loaded, "sqlite_loaded": sqlite_loaded,
+                      "first_answer_s": first_answer_s, "fresh_s": fresh_s}))
+
+
+def seed_history(path, script):
+    """재시작 전 실행이 남긴 것처럼 좌석 이력 DB에 스냅샷 하나를 기록."""
+    from bus_model import BusSchedule
+    from grid_parser import make_route
+    from seat_history import SeatHistoryStore
+    store = SeatHistoryStore(path)
+    store.append(BusSchedule.from_dicts([make_route(values) for values in script.rows()], datetime.now(), 1))
+    store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="재시작 후 첫 응답까지의 시간 비교 (사전 준비 vs 없음)")
+    parser.add_argument("--runs", type=int, default=3, help="모드마다 반복 횟수 (기본 3)")
+    parser.add_argument("--delay", type=float, default=1.0, help="연결 후 첫 !list까지 기다리는 시간 (초, 기본 1)")
+    parser.add_argument("--login-delay", type=float, default=2.0, help="가짜 포털 로그인 처리 시간 (초, 기본 2)")
+    parser.add_argument("--backend", choices=("http", "selenium"), default="http", help="크롤러 백엔드 (selenium은 크롬 필요)")
+    parser.add_argument("--child", choices=("warm", "cold"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, args.delay)
+        return
+
+    from load_harness import free_port
+    port = free_port()
+    os.environ["KUMOH_PORTAL_URL"] = f"http://127.0.0.1:{port}"
+    from fake_portal import FakePortal, SeatScript
+    script = SeatScript()
+    portal = FakePortal(script, port=port, login_delay=args.login_delay).start()
+
+    results = {"warm": [], "cold": []}
+    try:
+        with tempfile.TemporaryDirectory(prefix="kumoh_startup_") as work_dir:
+            env = dict(os.environ, KUMOH_CRAWLER_BACKEND=args.backend,
+                       KUMOH_SESSION_STORE="") # 매번 로그인부터 하도록 세션 저장은 끔
+            for run in range(args.runs):
+                for mode in ("cold", "warm"):
+                    db_path = os.path.join(work_dir, f"history_{mode}_{run}.sqlite3")
+                    if mode == "warm":
+                        seed_history(db_path, script) # 재시작 전 실행이 남긴 스냅샷
+                    env["KUMOH_HISTORY_DB"] = db_path
+                    output = subprocess.run(
+                        [sys.executable, os.path.abspath(__file__), "--child", mode, "--delay", str(args.delay)],
+                        env=env, cwd=work_dir, capture_output=True, text=True, timeout=300,
+                    )
+                    if output.returncode != 0:
+                        print(output.stderr[-2000:])
+                        raise SystemExit(f"{mode} 측정 실패")
+                    results[mode].append(json.loads(output.stdout.strip().splitlines()[-1]))
+    finally:
+        portal.stop()
+
+    print(f"백엔드 {args.backend}, 포털 로그인 {args.login_delay}초, 연결 {args.delay}초 뒤 첫 !list, {args.runs}회 중앙값")
+    print(f"{'모드':<6}{'모듈 로드(ms)':>14}{'selenium/numpy/sqlite3 로드':>28}{'첫 !list 응답(ms)':>18}{'최신 스냅샷까지(s)':>20}")
+    for mode in ("cold", "warm"):
+        rows = results[mode]
+        answers = [r["first_answer_s"] for r in rows if r["first_answer_s"] is not None]
+        print(f"{mode:<6}{statistics.median(r['import_s'] for r in rows) * 1000:>14.0f}"
+              f"{'/'.join('예' if any(r[key] for r in rows) else '아니오' for key in ('selenium_loaded', 'numpy_loaded', 'sqlite_loaded')):>28}"
+              f"{statistics.median(answers) * 1000 if answers else float('nan'):>18.0f}"
+              f"{statistics.median(r['fresh_s'] for r in rows):>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
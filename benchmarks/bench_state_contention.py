@@ -0,0 +1,217 @@
+# 파일명: benchmarks/bench_state_contention.py
+# 실행: python benchmarks/bench_state_contention.py [--duration 5] [--subscribers 2000] [--publish-interval 0.005]
+# 공유 상태 접근 방식 두 가지를 같은 부하로 비교함 (실제 포털/디스코드 없이, 고정 데이터 80개 노선):
+#   lock   이전 방식: 전역 data_lock 하나로 스냅샷 교체, 변화 이벤트 쌓기, 모니터링 판단, 구독 변경, 읽기를 모두 보호
+#   board  지금 방식: SnapshotBoard(참조 교체 발행, 읽기는 락 없음) + WatchStateActor(감시 상태 단일 작성자)
+# 발행 스레드가 --publish-interval초마다 새 스냅샷을 발행하고, 이벤트 루프에서는 읽기/구독 변경 코루틴과 모니터링 판단이 돎.
+# 측정: 읽기/쓰기 한 번에 걸린 시간, 발행 한 번에 걸린 시간과 발행 스레드가 락에서 기다린 시간,
+#       감시 상태 작성자 큐 대기 시간, 이벤트 루프 지연 (1ms 타이머가 늦게 깨어난 시간)
+# 대기 시간 지표의 p99/최대는 지표마다 최근 perf_metrics.WINDOW_SIZE개 기준
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import perf_metrics  # noqa: E402
+from bus_model import BusSchedule, EMPTY_SCHEDULE  # noqa: E402
+from schedule_diff import diff_schedules  # noqa: E402
+from subscriptions import SubscriptionIndex, collect_alerts, user_target  # noqa: E402
+from alert_rules import RuleBook, collect_rule_alerts, REMAINING_AT_MOST, SCOPE_BUS  # noqa: E402
+from snapshot_board import SnapshotBoard  # noqa: E402
+from watch_actor import WatchStateActor  # noqa: E402
+from fixtures import fixture_schedule  # noqa: E402
+from load_harness import percentile  # noqa: E402
+
+READERS = 8
+WRITERS = 4
+TICK = 0.001
+
+
+def variants(size=80):
+    """좌석 수가 조금씩 다른 스냅샷 두 개 (번갈아 발행하면 매번 변화 이벤트가 생김)."""
+    base = fixture_schedule(size)
+    full = tuple(replace(route, current_seats=route.total_seats) for route in base.routes)
+    partial = tuple(replace(route, current_seats=route.total_seats - (k % 4)) for k, route in enumerate(full))
+    return full, partial
+
+
+def build_state(ids, subscribers, seed=0):
+    rng = random.Random(seed)
+    index = SubscriptionIndex()
+    book = RuleBook()
+    for k in range(subscribers):
+        target = user_target(k)
+        for bus_id in rng.sample(ids, 3):
+            index.subscribe(target, bus_id)
+        book.add(target, REMAINING_AT_MOST, (SCOPE_BUS, rng.choice(ids)), rng.randint(0, 5))
+    return index, book
+
+
+class LockedState:
+    """이전 방식: 모든 공유 상태를 락 하나로 보호."""
+
+    def __init__(self, index, book):
+        self.lock = perf_metrics.TimedLock("data_lock")
+        self.publisher_lock = perf_metrics.TimedLock("data_lock_publisher", self.lock._lock) # 같은 락, 발행 스레드 대기만 따로 기록
+        self.current = EMPTY_SCHEDULE
+        self.pending = []
+        self.index, self.book = index, book
+
+    def publish(self, routes, fetched_at):
+        previous = self.current
+        schedule = BusSchedule(routes, fetched_at, previous.version + 1)
+        events = diff_schedules(previous if previous.version > 0 else None, schedule)
+        with self.publisher_lock:
+            self.current = schedule
+            self.pending.extend(events)
+
+    async def read(self):
+        with self.lock:
+            return self.current, sorted(self.index.bus_ids())
+
+    async def write(self, target, bus_id):
+        with self.lock:
+            if not self.index.subscribe(target, bus_id):
+                self.index.unsubscribe(target, bus_id)
+
+    async def evaluate(self):
+        with self.lock:
+            events = list(self.pending)
+            self.pending.clear()
+            return collect_alerts(self.index, self.current, events) + collect_rule_alerts(self.book, events)
+
+
+class BoardState:
+    """지금 방식: 스냅샷은 참조 교체로 발행, 감시 상태 변경은 작성자 하나에게 맡김."""
+
+    def __init__(self, index, book):
+        self.board = SnapshotBoard(EMPTY_SCHEDULE)
+        self.actor = WatchStateActor()
+        self.seen = EMPTY_SCHEDULE
+        self.index, self.book = index, book
+
+    def publish(self, routes, fetched_at):
+        while True:
+            previous = self.board.current
+            schedule = BusSchedule(routes, fetched_at, previous.version + 1)
+            events = diff_schedules(previous if previous.version > 0 else None, schedule)
+            if self.board.compare_and_publish(previous, schedule, events):
+                return
+
+    async def read(self):
+        return self.board.current, sorted(self.index.bus_ids())
+
+    async def write(self, target, bus_id):
+        def toggle():
+            if not self.index.subscribe(target, bus_id):
+                self.index.unsubscribe(target, bus_id)
+        await self.actor.call(toggle)
+
+    async def evaluate(self):
+        def run():
+            schedule = self.board.current
+            events, complete = self.board.events_since(self.seen.version)
+            if not complete:
+                events = diff_schedules(self.seen if self.seen.version > 0 else None, schedule)
+            self.seen = schedule
+            return collect_alerts(self.index, schedule, events) + collect_rule_alerts(self.book, events)
+        return await self.actor.call(run)
+
+
+def publisher(state, schedules, interval, stop):
+    fetched_at = datetime(2026, 3, 2, 7, 0)
+    k = 0
+    while not stop.is_set():
+        started = time.perf_counter()
+        state.publish(schedules[k % 2], fetched_at)
+        perf_metrics.observe("bench_publish", time.perf_counter() - started)
+        k += 1
+        time.sleep(interval)
+
+
+async def run_mode(state, routes, ids, args):
+    stop = threading.Event()
+    loop_stop = asyncio.Event()
+    timings = {"read": [], "write": [], "evaluate": [], "lag": []}
+
+    async def ticker():
+        while not loop_stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(TICK)
+            timings["lag"].append(time.perf_counter() - started - TICK)
+
+    async def reader():
+        while not loop_stop.is_set():
+            started = time.perf_counter()
+            await state.read()
+            timings["read"].append(time.perf_counter() - started)
+            await asyncio.sleep(0)
+
+    async def writer(seed):
+        rng = random.Random(seed)
+        while not loop_stop.is_set():
+            started = time.perf_counter()
+            await state.write(user_target(10 ** 6 + rng.randrange(100)), rng.choice(ids))
+            timings["write"].append(time.perf_counter() - started)
+            await asyncio.sleep(0.001)
+
+    async def monitor():
+        while not loop_stop.is_set():
+            started = time.perf_counter()
+            await state.evaluate()
+            timings["evaluate"].append(time.perf_counter() - started)
+            await asyncio.sleep(args.monitor_interval)
+
+    thread = threading.Thread(target=publisher, args=(state, routes, args.publish_interval, stop), daemon=True)
+    thread.start()
+    tasks = [asyncio.create_task(ticker()), asyncio.create_task(monitor())]
+    tasks += [asyncio.create_task(reader()) for _ in range(READERS)]
+    tasks += [asyncio.create_task(writer(seed)) for seed in range(WRITERS)]
+    await asyncio.sleep(args.duration)
+    loop_stop.set()
+    stop.set()
+    await asyncio.gather(*tasks)
+    thread.join()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="data_lock vs 스냅샷 발행 + 감시 상태 작성자 경합 비교")
+    parser.add_argument("--duration", type=float, default=5, help="방식마다 측정 시간 (초, 기본 5)")
+    parser.add_argument("--subscribers", type=int, default=2000, help="구독자 수 (모니터링 판단 부담, 기본 2000)")
+    parser.add_argument("--publish-interval", type=float, default=0.005, help="스냅샷 발행 간격 (초, 기본 0.005)")
+    parser.add_argument("--monitor-interval", type=float, default=0.02, help="모니터링 판단 간격 (초, 기본 0.02)")
+    args = parser.parse_args()
+
+    full, partial = variants()
+    ids = [route.id for route in full]
+    print(f"노선 {len(ids)}개, 구독자 {args.subscribers}명, 발행 {args.publish_interval * 1000:.0f}ms마다, "
+          f"모니터링 판단 {args.monitor_interval * 1000:.0f}ms마다, 읽기 코루틴 {READERS}개, 쓰기 코루틴 {WRITERS}개, {args.duration}초")
+    print(f"{'방식':<7}{'읽기 p99(ms)':>13}{'최대':>8}{'쓰기 p99(ms)':>13}{'최대':>8}{'판단 p50(ms)':>13}"
+          f"{'발행 p99(ms)':>13}{'최대':>8}{'루프 지연 p99(ms)':>17}{'최대':>8}  대기 시간 (지표: 횟수, p99/최대 ms)")
+    for name, factory in (("lock", LockedState), ("board", BoardState)):
+        perf_metrics.reset()
+        index, book = build_state(ids, args.subscribers)
+        state = factory(index, book)
+        timings = asyncio.run(run_mode(state, (full, partial), ids, args))
+        summary = perf_metrics.latency_summary()
+        publish = summary.get("bench_publish", (0, 0, 0, 0, 0))
+        waits = ", ".join(f"{metric} {values[0]}회 {values[3] * 1000:.2f}/{values[4] * 1000:.1f}" for metric, values in sorted(summary.items())
+                          if metric.startswith("lock_wait_") or metric.endswith("_wait"))
+        ms = lambda values, q: percentile(values, q) * 1000  # noqa: E731
+        print(f"{name:<7}{ms(timings['read'], 0.99):>13.2f}{max(timings['read']) * 1000:>8.1f}"
+              f"{ms(timings['write'], 0.99):>13.2f}{max(timings['write']) * 1000:>8.1f}{ms(timings['evaluate'], 0.5):>13.2f}"
+              f"{publish[3] * 1000:>13.2f}{publish[4] * 1000:>8.1f}"
+              f"{ms(timings['lag'], 0.99):>17.2f}{max(timings['lag']) * 1000:>8.1f}  {waits}")
+
+
+if __name__ == "__main__":
+    main()
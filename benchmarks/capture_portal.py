@@ -0,0 +1,247 @@
+# 파일명: benchmarks/capture_portal.py
+# 실행: python benchmarks/capture_portal.py capture [--out benchmarks/fixtures/portal_capture.json] [--show]
+#       python benchmarks/capture_portal.py check [--capture benchmarks/fixtures/portal_capture.json]
+# HTTP 백엔드(http_crawler)가 쓰는 요청 주소/폼 필드/응답 형식(portal_config)을 실제 포털 기록과 맞춰 보는 도구.
+#  capture  크롬(key.py의 계정, 크롬 필요)으로 실제 포털에 로그인하고 '조회'를 누르는 동안의 네트워크 요청을 기록함.
+#           폼/요청 본문은 필드 이름만 남기고 값(아이디/비밀번호 포함)은 저장하지 않음. 쿠키/헤더도 저장하지 않음.
+#           XHR/fetch 응답 본문(JSON)은 그대로 저장 (노선/좌석 정보).
+#           조회가 끝난 iframe의 page_source도 benchmarks/fixtures/portal_grid.html 로 저장함 (--no-page면 안 함).
+#           스크립트는 지우고, 로그인 입력칸 값과 페이지에 보이는 아이디는 가림.
+#  check    기록과 portal_config의 LOGIN_URL / 폼 필드 / GRID_QUERY_URL / GRID_DATASET_KEY / GRID_COLUMNS /
+#           GRID_QUERY_MATCH(Selenium 그리드 준비 신호)를 비교하고,
+#           가짜 포털(fake_portal.py)의 조회 응답 형식도 기록과 비교함.
+#           portal_grid.html이 있으면 설치된 파서 엔진들이 그 페이지에서 bs4와 같은 행을 뽑는지도 확인. 하나라도 다르면 종료 코드 1.
+#           모두 같으면 확인한 설정을 portal_verified.json(KUMOH_PORTAL_VERIFIED)에 남김.
+#           KUMOH_CRAWLER_BACKEND=http/auto는 이 기록이 지금 portal_config와 같을 때만 실제 포털에 요청을 보냄.
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from portal_config import (  # noqa: E402
+    PORTAL_BASE_URL, BUS_RESERVATION_URL, LOGIN_URL, GRID_QUERY_URL, GRID_DATASET_KEY, GRID_COLUMNS, GRID_QUERY_MATCH,
+    PORTAL_VERIFIED_PATH
+)
+from http_crawler import LOGIN_FIELDS, save_verification  # noqa: E402
+
+DEFAULT_CAPTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "portal_capture.json")
+_SCRIPT_RE = re.compile(r"<script\b[^>]*>.*?</script>", re.IGNORECASE | re.DOTALL)
+_LOGIN_INPUT_RE = re.compile(r"(<input\b[^>]*\b(?:id|name)=[\"']?user_(?:id|password)\b[^>]*>)", re.IGNORECASE)
+_VALUE_RE = re.compile(r"\bvalue=(\"[^\"]*\"|'[^']*'|[^\s>]+)", re.IGNORECASE)
+
+
+def field_names(post_data, content_type):
+    """요청 본문에서 필드 이름만 뽑음 (폼이면 키, JSON이면 최상위 키). 값은 버림."""
+    if not post_data:
+        return []
+    if "json" in (content_type or ""):
+        try:
+            data = json.loads(post_data)
+        except ValueError:
+            return []
+        return sorted(data) if isinstance(data, dict) else []
+    return sorted(parse_qs(post_data, keep_blank_values=True))
+
+
+def scrub_page(html, secrets):
+    """page_source에서 스크립트를 지우고, 로그인 입력칸 값과 secrets(아이디 등)가 보이는 곳을 가림."""
+    html = _SCRIPT_RE.sub("<script></script>", html)
+    html = _LOGIN_INPUT_RE.sub(lambda m: _VALUE_RE.sub('value=""', m.group(1)), html)
+    for secret in secrets:
+        if secret:
+            html = html.replace(secret, "REDACTED")
+    return html
+
+
+def capture(args):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from key import CHROMEDRIVER_PATH, YOUR_ID, YOUR_PASSWORD
+    from login_crawler import _chrome_options
+    from grid_readiness import wait_for_login, mark_grid, wait_for_grid
+    from fixtures import PORTAL_GRID_PATH
+
+    options = _chrome_options(headless=not args.show, lean=False) # 리소스 차단 없이 실제 브라우저처럼
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    driver = webdriver.Chrome(service=Service(executable_path=CHROMEDRIVER_PATH), options=options)
+    try:
+        driver.get(BUS_RESERVATION_URL)
+        WebDriverWait(driver, 25).until(EC.presence_of_element_located((By.NAME, "iframeA")))
+        driver.switch_to.frame(driver.find_element(By.NAME, "iframeA"))
+        WebDriverWait(driver, 25).until(EC.presence_of_element_located((By.ID, "user_id")))
+        driver.find_element(By.ID, "user_id").send_keys(YOUR_ID)
+        driver.find_element(By.ID, "user_password").send_keys(YOUR_PASSWORD)
+        driver.execute_script("doLogin()")
+        wait_for_login(driver)
+        button = WebDriverWait(driver, 15).until(EC.element_to_be_clickable((By.XPATH, "//div[@class='cl-text' and text()='조회']")))
+        before = mark_grid(driver)
+        button.click()
+        wait_for_grid(driver, before)
+        page = None if args.no_page else scrub_page(driver.page_source, (YOUR_ID, YOUR_PASSWORD))
+
+        requests, responses = {}, {}
+        for entry in driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            params = message.get("params", {})
+            if message["method"] == "Network.requestWillBeSent":
+                requests[params["requestId"]] = params
+            elif message["method"] == "Network.responseReceived":
+                responses[params["requestId"]] = params
+
+        exchanges = []
+        for request_id, sent in requests.items():
+            request = sent["request"]
+            kind = sent.get("type", "")
+            if request["method"] != "POST" and kind not in ("XHR", "Fetch"):
+                continue # 페이지/정적 리소스 GET은 기록하지 않음
+            received = responses.get(request_id, {}).get("response", {})
+            content_type = {k.lower(): v for k, v in request.get("headers", {}).items()}.get("content-type", "")
+            body = None
+            if kind in ("XHR", "Fetch") and "json" in received.get("mimeType", ""):
+                try:
+                    body = json.loads(driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})["body"])
+                except Exception as e:
+                    print(f"응답 본문을 가져오지 못함 ({request['url']}): {e}")
+            exchanges.append({
+                "method": request["method"],
+                "url": request["url"].split("?", 1)[0],
+                "type": kind,
+                "request_content_type": content_type,
+                "fields": field_names(request.get("postData"), content_type),
+                "status": received.get("status"),
+                "mime_type": received.get("mimeType"),
+                "body": body,
+            })
+    finally:
+        driver.quit()
+
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"captured_at": datetime.now().isoformat(timespec="seconds"), "page": BUS_RESERVATION_URL,
+                   "exchanges": exchanges}, f, ensure_ascii=False, indent=1)
+    print(f"요청 {len(exchanges)}개 기록: {args.out}")
+    if page is not None:
+        with open(PORTAL_GRID_PATH, "w", encoding="utf-8") as f:
+            f.write(page)
+        print(f"그리드 page_source 저장: {PORTAL_GRID_PATH} (커밋 전에 개인정보가 남아있지 않은지 한 번 더 확인할 것)")
+    for exchange in exchanges:
+        print(f"  {exchange['method']} {exchange['url']} ({exchange['type']}, {exchange['status']}) 필드 {exchange['fields']}")
+
+
+def grid_shape(body):
+    """조회 응답 JSON -> (최상위 키, 데이터셋 행의 키) (형식이 다르면 행 키는 빈 집합)."""
+    if not isinstance(body, dict):
+        return set(), set()
+    rows = body.get(GRID_DATASET_KEY)
+    row_keys = set(rows[0]) if isinstance(rows, list) and rows and isinstance(rows[0], dict) else set()
+    return set(body), row_keys
+
+
+def fake_portal_grid():
+    """가짜 포털에 로그인해 조회 응답 JSON을 받음."""
+    import requests
+    from fake_portal import FakePortal, SeatScript
+    portal = FakePortal(SeatScript(routes=5), asset_delay=0).start()
+    try:
+        session = requests.Session()
+        base = portal.url
+        session.get(base + urlsplit(BUS_RESERVATION_URL).path).raise_for_status()
+        session.post(base + urlsplit(LOGIN_URL).path, data={field: "x" for field in LOGIN_FIELDS}).raise_for_status()
+        return session.post(base + urlsplit(GRID_QUERY_URL).path, headers={"Accept": "application/json"}).json()
+    finally:
+        portal.stop()
+
+
+def check(args):
+    if not os.path.exists(args.capture):
+        print(f"기록 파일이 없습니다: {args.capture}\n먼저 python benchmarks/capture_portal.py capture 로 실제 포털 요청을 기록하세요.")
+        return 2
+    with open(args.capture, encoding="utf-8") as f:
+        exchanges = json.load(f)["exchanges"]
+    by_path = {urlsplit(exchange["url"]).path: exchange for exchange in exchanges}
+    problems = []
+
+    def report(ok, text):
+        print(f"  {'OK ' if ok else '다름'} {text}")
+        if not ok:
+            problems.append(text)
+
+    print("portal_config 비교:")
+    login = by_path.get(urlsplit(LOGIN_URL).path)
+    report(login is not None and login["method"] == "POST", f"로그인 요청 POST {urlsplit(LOGIN_URL).path}")
+    if login is not None:
+        origin = "{0.scheme}://{0.netloc}".format(urlsplit(login["url"]))
+        report(origin == PORTAL_BASE_URL, f"포털 주소 {PORTAL_BASE_URL} (기록: {origin})")
+    if login is not None:
+        missing = [field for field in LOGIN_FIELDS if field not in login["fields"]]
+        report(not missing, f"로그인 폼 필드 {list(LOGIN_FIELDS)} (기록: {login['fields']})")
+    grid = by_path.get(urlsplit(GRID_QUERY_URL).path)
+    report(grid is not None and grid["method"] == "POST", f"조회 요청 POST {urlsplit(GRID_QUERY_URL).path}")
+    recorded_keys, recorded_row_keys = grid_shape(grid["body"] if grid else None)
+    if grid is not None:
+        report(GRID_DATASET_KEY in recorded_keys, f"조회 응답 데이터셋 키 '{GRID_DATASET_KEY}' (기록: {sorted(recorded_keys)})")
+        missing = [column for column in GRID_COLUMNS if column not in recorded_row_keys]
+        report(not missing, f"그리드 컬럼 {list(GRID_COLUMNS)} (없음: {missing})")
+    queries = [exchange for exchange in exchanges if exchange["type"] in ("XHR", "Fetch") and GRID_QUERY_MATCH in exchange["url"]]
+    report(len(queries) == 1, f"그리드 준비 신호 KUMOH_GRID_QUERY_MATCH '{GRID_QUERY_MATCH}'에 맞는 XHR/fetch {len(queries)}개 (1개여야 함)")
+    if problems and (login is None or grid is None or len(queries) != 1):
+        print("  기록된 POST/XHR 요청:")
+        for exchange in exchanges:
+            print(f"    {exchange['method']} {urlsplit(exchange['url']).path} 필드 {exchange['fields']}")
+
+    print("가짜 포털 조회 응답 비교:")
+    fake_keys, fake_row_keys = grid_shape(fake_portal_grid())
+    report(fake_keys == recorded_keys, f"최상위 키 (가짜 {sorted(fake_keys)}, 기록 {sorted(recorded_keys)})")
+    report(fake_row_keys <= recorded_row_keys and bool(fake_row_keys),
+           f"행 키 (가짜에만 있음: {sorted(fake_row_keys - recorded_row_keys)})")
+
+    from fixtures import load_portal_grid
+    from grid_parser import ENGINES, benchmark_engines, rows_to_routes
+    page = load_portal_grid()
+    if page is None:
+        print("실제 그리드 페이지 기록(portal_grid.html)이 없어 파서 엔진 비교는 건너뜀.")
+    else:
+        print("실제 그리드 페이지에서 파서 엔진 비교:")
+        routes = rows_to_routes(ENGINES[next(iter(ENGINES))](page))
+        report(bool(routes) and any(route["total_seats"] for route in routes), f"노선 {len(routes)}개 추출 (좌석 정보 포함)")
+        try:
+            timings = benchmark_engines(page, repeat=5)
+            report(True, "엔진별 행이 bs4와 같음 (" + ", ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in timings.items()) + ")")
+        except AssertionError as e:
+            report(False, str(e))
+
+    if problems:
+        print(f"{len(problems)}개 항목이 실제 포털 기록과 다릅니다. portal_config를 기록에 맞추기 전에는 HTTP 백엔드를 켜지 마세요.")
+        return 1
+    save_verification(os.path.abspath(args.capture))
+    print(f"portal_config와 가짜 포털이 실제 포털 기록과 일치합니다. HTTP 백엔드 사용 가능 ({PORTAL_VERIFIED_PATH} 기록).")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="실제 포털 요청 기록 및 portal_config/가짜 포털과 비교")
+    commands = parser.add_subparsers(dest="command", required=True)
+    capture_parser = commands.add_parser("capture", help="크롬으로 실제 포털에 로그인/조회하며 요청을 기록")
+    capture_parser.add_argument("--out", default=DEFAULT_CAPTURE, help="기록 파일 (기본 benchmarks/fixtures/portal_capture.json)")
+    capture_parser.add_argument("--show", action="store_true", help="헤드리스가 아닌 창을 띄움")
+    capture_parser.add_argument("--no-page", action="store_true", help="그리드 page_source(portal_grid.html)는 저장하지 않음")
+    check_parser = commands.add_parser("check", help="기록과 portal_config/가짜 포털 비교")
+    check_parser.add_argument("--capture", default=DEFAULT_CAPTURE, help="기록 파일")
+    args = parser.parse_args()
+    if args.command == "capture":
+        capture(args)
+    else:
+        sys.exit(check(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+# 파일명: benchmarks/fake_portal.py
+# 통학버스 예약 포털의 로컬 대역(stand-in) 서버.
+#  - bus_reservation.jsp: iframeA 안에 로그인 폼(user_id, user_password, doLogin()) -> 로그인 후 '조회' 버튼 + cl-grid-row 그리드
+#  - 로그인/조회 요청 주소, 폼 필드, 조회 응답 JSON은 portal_config의 추정값을 그대로 사용함 (HTTP 백엔드도 동작).
+#    실제 포털에서 기록한 응답이 아니므로, HTTP 백엔드가 여기서 동작하는 것은 코드끼리 맞는다는 뜻일 뿐임.
+#    실제 기록과의 비교는 python benchmarks/capture_portal.py check
+#  - 실제 포털처럼 페이지마다 CSS/이미지/웹폰트를 불러옴 (/ux/ 아래, asset_delay초 지연) -> 브라우저 프로필 비교용
+#  - 좌석 수는 SeatScript가 정해진 시드로 주기적으로 바꾸고, 바꾼 시각을 기록함 (알림 지연 측정용)
+# 단독 실행: python benchmarks/fake_portal.py [포트]
+#   그 다음 KUMOH_PORTAL_URL=http://127.0.0.1:<포트> python discord_bot_server.py
+
+import json
+import logging
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from portal_config import BUS_RESERVATION_URL, LOGIN_URL, GRID_QUERY_URL, GRID_DATASET_KEY, GRID_COLUMNS  # noqa: E402
+from fixtures import make_route_values  # noqa: E402
+
+RESERVATION_PATH = urlsplit(BUS_RESERVATION_URL).path
+FRAME_PATH = RESERVATION_PATH.rsplit("/", 1)[0] + "/bus_reservation_frame.jsp"
+LOGIN_PATH = urlsplit(LOGIN_URL).path
+GRID_PATH = urlsplit(GRID_QUERY_URL).path
+SESSION_COOKIE = "JSESSIONID"
+
+# 페이지가 불러오는 정적 리소스 (경로: (Content-Type, 크기))
+ASSETS = {
+    "/ux/css/cl-theme.css": ("text/css", 0),
+    "/ux/img/logo.png": ("image/png", 40_000),
+    "/ux/img/background.jpg": ("image/jpeg", 300_000),
+    "/ux/img/banner.gif": ("image/gif", 120_000),
+    "/ux/img/icons.svg": ("image/svg+xml", 20_000),
+    "/ux/font/NanumGothic.woff2": ("font/woff2", 400_000),
+    "/ux/font/NanumGothicBold.woff2": ("font/woff2", 400_000),
+}
+_THEME_CSS = """@font-face { font-family: 'NanumGothic'; src: url('/ux/font/NanumGothic.woff2') format('woff2'); }
+@font-face { font-family: 'NanumGothic'; font-weight: bold; src: url('/ux/font/NanumGothicBold.woff2') format('woff2'); }
+body { font-family: 'NanumGothic', sans-serif; background: url('/ux/img/background.jpg'); }
+.cl-grid-row { height: 28px; }
+"""
+_ASSET_TAGS = """<link rel="stylesheet" href="/ux/css/cl-theme.css">
+<img src="/ux/img/logo.png" alt=""><img src="/ux/img/banner.gif" alt=""><img src="/ux/img/icons.svg" alt="">
+"""
+
+
+class SeatScript:
+    """
+    정해진 시드로 노선 좌석을 바꾸는 각본. tick초마다 노선 changes_per_tick개를 골라
+    만석이면 free_probability 확률로 한 자리를 비우고(만석 해제), 아니면 1~5석을 채움(만석이 될 수 있음).
+    """
+
+    def __init__(self, routes=40, tick=2.0, changes_per_tick=3, free_probability=0.6, seed=0):
+        self.tick = tick
+        self.changes_per_tick = changes_per_tick
+        self.free_probability = free_probability
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.routes = []
+        for values in make_route_values(routes, seed):
+            current, total = map(int, values[6].split("/"))
+            if self._rng.random() < 0.5:
+                current = total # 처음에는 절반 정도가 만석
+            self.routes.append({"values": values[:6], "current": current, "total": total})
+        self.changes = []         # [(time.time(), bus_id, current, total)]
+        self.became_available = [] # [(time.time(), bus_id)] 만석 -> 자리 남
+        self._stop = threading.Event()
+        self._thread = None
+
+    def rows(self):
+        """현재 좌석이 반영된 그리드 행 [ID, 종류, 번호, 차량, 지역, 노선, '현재/전체']."""
+        with self._lock:
+            return [route["values"] + [f"{route['current']}/{route['total']}"] for route in self.routes]
+
+    def step(self):
+        now = time.time()
+        with self._lock:
+            for route in self._rng.sample(self.routes, min(self.changes_per_tick, len(self.routes))):
+                bus_id = route["values"][0]
+                if route["current"] >= route["total"]:
+                    if self._rng.random() >= self.free_probability:
+                        continue
+                    route["current"] = route["total"] - 1
+                    self.became_available.append((now, bus_id))
+                else:
+                    route["current"] = min(route["total"], route["current"] + self._rng.randint(1, 5))
+                self.changes.append((now, bus_id, route["current"], route["total"]))
+
+    def start(self):
+        def run():
+            while not self._stop.wait(self.tick):
+                self.step()
+        self._thread = threading.Thread(target=run, name="seat-script", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+_OUTER_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>통학버스 예약</title></head>
+<body>{assets}<div class="cl-container"><iframe name="iframeA" src="{frame}" style="width:1200px;height:900px"></iframe></div></body></html>
+"""
+
+_LOGIN_FRAME = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"></head><body>{assets}
+<form id="loginForm" method="post" action="{login}">
+<input type="text" id="user_id" name="user_id">
+<input type="password" id="user_password" name="user_password">
+</form>
+<script>function doLogin() {{ document.getElementById('loginForm').submit(); }}</script>
+</body></html>
+"""
+
+# 로그인 후 프레임: '조회' 클릭 시 조회 주소에서 JSON을 받아 eXBuilder와 같은 구조로 그리드를 다시 그림
+_GRID_FRAME = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"></head><body>{assets}
+<div class="cl-button"><div class="cl-text" onclick="query()">조회</div></div>
+<div class="cl-grid" id="grid"></div>
+<script>
+var COLUMNS = {columns};
+function cell(i, inner) {{
+  return '<div class="cl-grid-cell cl-grid-column-' + i + '"><div class="cl-content">' + inner + '</div></div>';
+}}
+function row(cells, header) {{
+  return '<div class="cl-grid-row' + (header ? ' cl-grid-header-row' : '') + '">' + cells.join('') + '</div>';
+}}
+function esc(s) {{ return String(s).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/"/g, '&quot;'); }}
+function query() {{
+  fetch('{grid}', {{method: 'POST', headers: {{'Accept': 'application/json'}}, credentials: 'same-origin'}})
+    .then(function (r) {{ return r.json(); }})
+    .then(function (data) {{
+      var html = [row(COLUMNS.map(function (c, i) {{ return cell(i, '<div class="cl-text">' + c + '</div>'); }}), true),
+                  row(COLUMNS.map(function (c, i) {{ return cell(i, '<div class="cl-text"></div>'); }}), true)];
+      data['{dataset}'].forEach(function (r) {{
+        var cells = COLUMNS.slice(0, 6).map(function (c, i) {{ return cell(i, '<div class="cl-text">' + esc(r[c]) + '</div>'); }});
+        cells.push(cell(6, '<input type="text" class="cl-text" readonly value="' + esc(r[COLUMNS[6]]) + '">'));
+        html.push(row(cells, false));
+      }});
+      document.getElementById('grid').innerHTML = html.join('');
+    }});
+}}
+</script>
+</body></html>
+"""
+
+
+class FakePortal:
+    """
+    로컬 포털 대역 서버. 로그인/조회/정적 리소스 요청 횟수와 세션을 기록함.
+    session_ttl초가 지나면 세션이 만료됨 (0이면 만료 없음). 정적 리소스는 asset_delay초, 로그인은 login_delay초 뒤에 응답함.
+    grid_delay는 실행 중에 바꿀 수 있음 (조회 응답을 늦춰 멈춘 포털을 흉내냄).
+    """
+
+    def __init__(self, script, host="127.0.0.1", port=0, session_ttl=0, asset_delay=0.05, login_delay=0.0):
+        self.script = script
+        self.session_ttl = session_ttl
+        self.asset_delay = asset_delay
+        self.login_delay = login_delay
+        self.grid_delay = 0.0
+        self.asset_requests = 0
+        self.sessions = {}   # {세션 ID: 로그인 시각 또는 None(로그인 전)}
+        self.logins = 0
+        self.grid_queries = 0
+        self._lock = threading.Lock()
+        portal = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                portal._handle(self, "GET")
+
+            def do_POST(self):
+                portal._handle(self, "POST")
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://{host}:{self.server.server_address[1]}"
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fake-portal", daemon=True)
+        self._thread.start()
+        self.script.start()
+        logging.info(f"가짜 포털 시작: {self.url}{RESERVATION_PATH}")
+        return self
+
+    def stop(self):
+        self.script.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    # --- 요청 처리 ---
+    def _session_id(self, handler):
+        for part in (handler.headers.get("Cookie") or "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == SESSION_COOKIE and value in self.sessions:
+                return value
+        return None
+
+    def _logged_in(self, session_id):
+        with self._lock:
+            logged_in_at = self.sessions.get(session_id)
+        if logged_in_at is None:
+            return False
+        return not self.session_ttl or time.time() - logged_in_at < self.session_ttl
+
+    def _send(self, handler, status, body, content_type="text/html; charset=utf-8", headers=()):
+        data = body.encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _send_asset(self, handler, path):
+        with self._lock:
+            self.asset_requests += 1
+        if self.asset_delay:
+            time.sleep(self.asset_delay) # 느린 정적 리소스 서버 흉내
+        content_type, size = ASSETS[path]
+        data = _THEME_CSS.encode("utf-8") if path.endswith(".css") else bytes(size)
+        handler.send_response(200)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _handle(self, handler, method):
+        path = urlsplit(handler.path).path
+        if path in ASSETS:
+            self._send_asset(handler, path)
+            return
+        session_id = self._session_id(handler)
+        cookies = []
+        if session_id is None:
+            session_id = secrets.token_hex(8)
+            with self._lock:
+                self.sessions[session_id] = None
+            cookies.append(("Set-Cookie", f"{SESSION_COOKIE}={session_id}; Path=/"))
+
+        if path == RESERVATION_PATH:
+            self._send(handler, 200, _OUTER_PAGE.format(frame=FRAME_PATH, assets=_ASSET_TAGS), headers=cookies)
+        elif path == FRAME_PATH:
+            if self._logged_in(session_id):
+                page = _GRID_FRAME.format(columns=json.dumps(list(GRID_COLUMNS)), grid=GRID_PATH,
+                                          dataset=GRID_DATASET_KEY, assets=_ASSET_TAGS)
+            else:
+                page = _LOGIN_FRAME.format(login=LOGIN_PATH, assets=_ASSET_TAGS)
+            self._send(handler, 200, page, headers=cookies)
+        elif path == LOGIN_PATH and method == "POST":
+            length = int(handler.headers.get("Content-Length") or 0)
+            form = parse_qs(handler.rfile.read(length).decode("utf-8"), keep_blank_values=True)
+            if "user_id" not in form or "user_password" not in form: # 값은 확인하지 않음 (key.py가 비어 있어도 동작)
+                self._send(handler, 200, _LOGIN_FRAME.format(login=LOGIN_PATH, assets=_ASSET_TAGS), headers=cookies) # 로그인 실패: 폼을 다시 보여줌
+                return
+            if self.login_delay:
+                time.sleep(self.login_delay) # 느린 실제 로그인 처리 흉내
+            with self._lock:
+                self.sessions[session_id] = time.time()
+                self.logins += 1
+            self._send(handler, 303, "", headers=cookies + [("Location", FRAME_PATH)])
+        elif path == GRID_PATH and method == "POST":
+            if not self._logged_in(session_id):
+                self._send(handler, 401, json.dumps({"error": "session expired"}), "application/json", cookies)
+                return
+            with self._lock:
+                self.grid_queries += 1
+            if self.grid_delay:
+                time.sleep(self.grid_delay)
+            rows = [dict(zip(GRID_COLUMNS, values)) for values in self.script.rows()]
+            self._send(handler, 200, json.dumps({GRID_DATASET_KEY: rows}, ensure_ascii=False),
+                       "application/json; charset=utf-8", cookies)
+        else:
+            self._send(handler, 404, "not found", headers=cookies)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8800
+    portal = FakePortal(SeatScript(), port=port).start()
+    print(f"가짜 포털: {portal.url}{RESERVATION_PATH} (Ctrl+C로 종료)")
+    print(f"봇 실행: KUMOH_PORTAL_URL={portal.url} python discord_bot_server.py")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        portal.stop()
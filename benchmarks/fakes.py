@@ -0,0 +1,144 @@
+# 파일명: benchmarks/fakes.py
+# 실제 크롬/포털과 디스코드 없이 벤치마크를 돌리기 위한 가짜 WebDriver와 가짜 디스코드 클라이언트.
+
+import asyncio
+import os
+import sys
+import time
+import types
+
+import discord
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import grid_parser  # noqa: E402
+import grid_readiness  # noqa: E402
+from grid_parser import HEADER_ROWS, resolve_engine, ENGINES  # noqa: E402
+
+
+class FakeElement:
+    def __init__(self, driver):
+        self._driver = driver
+        self.tag_name = "div"
+        self.text = "조회"
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        self._driver.render()
+
+    def send_keys(self, *keys):
+        pass
+
+    def get_attribute(self, name):
+        return None
+
+
+class _FakeSwitchTo:
+    def default_content(self):
+        pass
+
+    def frame(self, frame):
+        pass
+
+
+class FakeDriver:
+    """
+    저장된 그리드 HTML 하나를 보여주는 가짜 WebDriver.
+    login_crawler가 쓰는 호출(find_element, switch_to, execute_script, page_source, quit)만 흉내 냄.
+    '조회' 클릭마다 조회 요청이 끝나고 그리드가 다시 그려진 것처럼 행 표시를 지우고 지문을 바꿈
+    (wait_for_grid는 settle초 뒤 'changed'로 끝남).
+    query_delay: 클릭 후 조회 응답이 끝나기까지 걸리는 시간 (초). 그 전에는 이전 행이 그대로 보임
+    background_requests: 클릭 직후 바로 끝나는 조회와 무관한 XHR 수 (세션 유지/폴링 흉내)
+    redraw=False면 조회 응답이 와도 행을 다시 그리지 않음 (좌석 변화가 없어 같은 DOM을 유지하는 경우)
+    """
+
+    def __init__(self, html, query_delay=0.0, background_requests=0, redraw=True):
+        self.page_source = html
+        self._rows = ENGINES[resolve_engine("auto")](html) # in_page 스크립트가 돌려줄 행 값
+        self._marked = False
+        self._fingerprint = 1
+        self._requests_done = 0 # 표시 이후 끝난 조회 요청 수
+        self._other_done = 0    # 표시 이후 끝난 다른 XHR 수
+        self._query_due = None  # 진행 중인 조회 요청이 끝날 시각 (monotonic)
+        self.query_delay = query_delay
+        self.background_requests = background_requests
+        self.redraw = redraw
+        self.switch_to = _FakeSwitchTo()
+        self.clicks = 0
+        self.scripts = 0
+
+    def render(self):
+        self.clicks += 1
+        self._other_done += self.background_requests
+        self._query_due = time.monotonic() + self.query_delay
+        self._finish_query()
+
+    def _finish_query(self):
+        if self._query_due is None or time.monotonic() < self._query_due:
+            return
+        self._query_due = None
+        self._requests_done += 1
+        if self.redraw:
+            self._marked = False
+            self._fingerprint += 1
+
+    def find_element(self, by=None, value=None):
+        return FakeElement(self)
+
+    def find_elements(self, by=None, value=None):
+        return [FakeElement(self)]
+
+    def execute_script(self, script, *args):
+        self.scripts += 1
+        if script is grid_readiness._GRID_STATE_SCRIPT:
+            self._finish_query()
+            fresh = 0 if self._marked else len(self._rows) + HEADER_ROWS
+            if args and args[0]:
+                self._marked = True
+                self._requests_done = self._other_done = 0
+            return [len(self._rows) + HEADER_ROWS, self._fingerprint, fresh, self._requests_done, self._other_done]
+        if script is grid_parser._IN_PAGE_SCRIPT:
+            return [list(row) for row in self._rows]
+        return True # 로그인 상태 확인, doLogin 존재 확인 등
+
+    def quit(self):
+        pass
+
+
+class FakeDiscord:
+    """
+    resolve(target) -> send()만 있는 가짜 DM/채널. 전송마다 latency초가 걸리고 rate_limit_every번째마다 429를 한 번 돌려줌.
+    동시 전송 수와 전송 횟수, 받은 메시지와 받은 시각(received, 종단 간 지연 측정용)을 기록.
+    """
+
+    def __init__(self, latency=0.002, rate_limit_every=0):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.sends = 0
+        self.sent = []
+        self.received = [] # [(time.time(), 메시지)]
+
+    async def resolve(self, target):
+        return self
+
+    async def send(self, content):
+        self.sends += 1
+        if self.rate_limit_every and self.sends % self.rate_limit_every == 0:
+            response = types.SimpleNamespace(status=429, reason="Too Many Requests", headers={"Retry-After": "0.01"})
+            raise discord.HTTPException(response, "rate limited")
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            self.sent.append(content)
+            self.received.append((time.time(), content))
+        finally:
+            self.in_flight -= 1
@@ -0,0 +1,120 @@
+# 파일명: benchmarks/fixtures.py
+# 벤치마크용 예약 포털 그리드 HTML 고정 데이터.
+# synthetic_grid_<행 수>.html 은 실제 포털에서 기록한 것이 아니라 고정 시드로 만들어낸(합성) 페이지임.
+# 구조는 크롤러가 찾는 클래스(cl-grid-row / cl-grid-cell / cl-text, 좌석 칸은 input)만 맞춘 추정이라,
+# 여기서 엔진끼리 결과가 같다는 것은 이 마크업에서의 일관성일 뿐 실제 페이지에서의 검증은 아님.
+# 매번 같은 파일을 읽어 실행마다 비교 가능한 수치를 내는 용도. 다시 만들기: python benchmarks/fixtures.py
+# 실제 포털 page_source는 python benchmarks/capture_portal.py capture 가 (개인정보를 지우고) portal_grid.html 로 저장하며,
+# 있으면 suite.py와 capture_portal.py check가 엔진 비교에 함께 씀.
+
+import os
+import random
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bus_model import BusSchedule  # noqa: E402
+from grid_parser import parse_grid  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FIXTURE_SIZES = (20, 80, 300)   # 평소 노선 수, 많은 날, 최악의 경우
+
+REGIONS = ("구미", "대구", "포항", "김천", "상주", "칠곡")
+BUS_TYPES = ("통학", "셔틀", "귀가")
+STOPS = ("구미역", "인동", "옥계", "형곡", "반월당", "동대구역", "칠곡경대병원", "김천역", "상주터미널", "왜관")
+
+_PAGE_HEAD = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>통학버스 예약</title>
+<link rel="stylesheet" href="/ux/css/cl-theme.css"><script src="/ux/js/cpr.js"></script></head>
+<body class="cl-body"><div class="cl-container cl-layout-form" style="width:100%;height:100%">
+<div class="cl-menu">{menu}</div>
+<div class="cl-container"><div class="cl-button"><div class="cl-text">조회</div></div>
+<div class="cl-grid" role="grid" style="position:absolute;left:10px;top:80px;width:1180px">
+"""
+_PAGE_TAIL = """</div></div></div>
+<div class="cl-footer"><div class="cl-text">금오공과대학교</div></div>
+</body></html>
+"""
+_HEADER_COLUMNS = ("ID", "구분", "노선번호", "차량", "지역", "노선", "좌석")
+
+
+def _cell(index, content):
+    return (f'<div class="cl-grid-cell cl-grid-column-{index}" role="gridcell" '
+            f'style="width:{(80, 70, 80, 90, 70, 580, 90)[index]}px;height:28px">'
+            f'<div class="cl-content">{content}</div></div>')
+
+
+def _row(index, cells, header=False):
+    kind = "cl-grid-row cl-grid-header-row" if header else f"cl-grid-row cl-grid-row-{'even' if index % 2 else 'odd'}"
+    return f'<div class="{kind}" role="row" data-rowindex="{index}" style="top:{index * 28}px">{"".join(cells)}</div>\n'
+
+
+def make_route_values(count, seed=0):
+    """노선 count개의 그리드 셀 값 [ID, 종류, 번호, 차량, 지역, 노선, 좌석] (시드가 같으면 항상 같음)."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        region = REGIONS[i % len(REGIONS)]
+        total = rng.choice((28, 45, 45, 45))
+        current = total if rng.random() < 0.3 else rng.randint(0, total)
+        route = " -> ".join(rng.sample(STOPS, 3)) + " -> 금오공대"
+        rows.append([str(1000 + i), BUS_TYPES[i % len(BUS_TYPES)], f"{region}-{i % 12 + 1}",
+                     f"{total}인승", region, f"{rng.choice(('07:40', '08:10', '17:30', '18:20'))} {route}",
+                     f"{current}/{total}"])
+    return rows
+
+
+def make_grid_html(count, seed=0):
+    """노선 count개짜리 합성 예약 페이지 HTML (헤더 2행 + 데이터 행, 좌석 칸은 input)."""
+    menu = "".join(f'<div class="cl-menu-item"><div class="cl-text">메뉴 {k}</div></div>' for k in range(40))
+    parts = [_PAGE_HEAD.format(menu=menu)]
+    parts.append(_row(0, [_cell(k, f'<div class="cl-text">{name}</div>') for k, name in enumerate(_HEADER_COLUMNS)], True))
+    parts.append(_row(1, [_cell(k, '<div class="cl-text"></div>') for k in range(len(_HEADER_COLUMNS))], True))
+    for i, values in enumerate(make_route_values(count, seed)):
+        cells = [_cell(k, f'<div class="cl-text"><span>{value}</span></div>') for k, value in enumerate(values[:6])]
+        cells.append(_cell(6, f'<input type="text" class="cl-text" readonly value="{values[6]}">'))
+        parts.append(_row(i + 2, cells))
+    parts.append(_PAGE_TAIL)
+    return "".join(parts)
+
+
+PORTAL_GRID_PATH = os.path.join(FIXTURE_DIR, "portal_grid.html") # 실제 포털 기록 (capture_portal.py capture)
+
+
+def fixture_path(count):
+    return os.path.join(FIXTURE_DIR, f"synthetic_grid_{count}.html")
+
+
+def load_fixture(count):
+    """합성 그리드 HTML을 읽음 (없으면 만들어 저장)."""
+    path = fixture_path(count)
+    if not os.path.exists(path):
+        generate_fixtures((count,))
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def load_portal_grid():
+    """실제 포털에서 기록한 그리드 page_source. 아직 기록하지 않았으면 None."""
+    if not os.path.exists(PORTAL_GRID_PATH):
+        return None
+    with open(PORTAL_GRID_PATH, encoding="utf-8") as f:
+        return f.read()
+
+
+def fixture_schedule(count, version=1, fetched_at=None):
+    """합성 데이터를 파싱한 BusSchedule."""
+    return BusSchedule.from_dicts(parse_grid(load_fixture(count)), fetched_at or datetime(2026, 3, 2, 7, 0), version)
+
+
+def generate_fixtures(sizes=FIXTURE_SIZES):
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for count in sizes:
+        with open(fixture_path(count), "w", encoding="utf-8") as f:
+            f.write(make_grid_html(count, seed=count))
+        print(f"{fixture_path(count)} 저장 (합성, {count}개 노선)")
+
+
+if __name__ == "__main__":
+    generate_fixtures()
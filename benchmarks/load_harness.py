@@ -0,0 +1,180 @@
+# 파일명: benchmarks/load_harness.py
+# 실행: python benchmarks/load_harness.py --duration 60 --users 20
+# 가짜 포털(fake_portal.py)을 띄우고 실제 크롤러(HTTP 또는 --backend selenium)와 실제 봇 명령/모니터링 잡을 돌려
+# 가상 사용자들이 !list / !monitor / !stop 을 동시에 보내는 부하를 만듦. 디스코드 전송은 가짜 클라이언트로 받음.
+# 측정: (1) 종단 간 알림 지연 = 포털에서 좌석이 풀린 시각 -> 가짜 디스코드가 '만석이 아니게' 알림을 받은 시각
+#       (2) 지속 크롤링 수 (분당 조회 요청), (3) 명령별 첫 응답까지 걸린 시간
+# 포털 주소/DB 경로 등은 봇 모듈을 불러오기 전에 환경변수로 정해야 하므로, 임포트 순서가 중요함.
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import re
+import shutil
+import socket
+import sys
+import tempfile
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+THINK_TIME = (0.5, 3.0)                                    # 가상 사용자가 명령 사이에 쉬는 시간 (초)
+ACTION_WEIGHTS = {"list": 5, "monitor": 3, "stop": 2}
+LIST_KEYWORDS = (None, None, "구미", "대구", "통학", "셔틀")
+_AVAILABLE_ALERT = re.compile(r"ID '([^']+)'번 노선이 만석이 아니게 되었습니다")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class FakeContext:
+    """봇 명령 콜백에 넘기는 가짜 ctx. 한 사용자가 같은 서버 채널에서 명령을 보냄."""
+
+    def __init__(self, user_id, channel_id):
+        self.author = types.SimpleNamespace(id=user_id, name=f"user{user_id}")
+        self.guild = types.SimpleNamespace(id=1)
+        self.channel = types.SimpleNamespace(id=channel_id)
+        self.first_reply = None
+
+    async def send(self, content=None, **kwargs):
+        if self.first_reply is None:
+            self.first_reply = time.perf_counter()
+
+
+async def simulated_user(bot_server, user_id, deadline, rng, command_latency):
+    from subscriptions import user_target
+
+    ctx = FakeContext(user_id, channel_id=10)
+    target = user_target(user_id)
+    loop = asyncio.get_running_loop()
+    while loop.time() < deadline:
+        await asyncio.sleep(rng.uniform(*THINK_TIME))
+        action = rng.choices(list(ACTION_WEIGHTS), weights=list(ACTION_WEIGHTS.values()))[0]
+        schedule = bot_server.snapshots.current
+        if action == "monitor":
+            full = [bus.id for bus in schedule.routes if bus.is_full] # 사용자는 만석 노선을 구독함
+            if not full:
+                action = "list"
+        ctx.first_reply = None
+        start = time.perf_counter()
+        if action == "list":
+            await bot_server.list_buses.callback(ctx, rng.choice(LIST_KEYWORDS))
+        elif action == "monitor":
+            await bot_server.monitor_bus.callback(ctx, *rng.sample(full, min(len(full), rng.randint(1, 3))))
+        else:
+            mine = sorted(bot_server.subscriptions.subscriptions_of(target))
+            await bot_server.stop_monitoring.callback(ctx, rng.choice(mine) if mine else "all")
+        if ctx.first_reply is not None:
+            command_latency.setdefault(action, []).append(ctx.first_reply - start)
+
+
+def alert_latencies(received, became_available):
+    """받은 '만석이 아니게' 알림마다 같은 노선이 포털에서 마지막으로 풀린 시각과의 차이 (초)."""
+    latencies = []
+    for received_at, content in received:
+        for bus_id in _AVAILABLE_ALERT.findall(content):
+            freed = [t for t, freed_id in became_available if freed_id == bus_id and t <= received_at]
+            if freed:
+                latencies.append(received_at - freed[-1])
+    return latencies
+
+
+async def run_load(bot_server, portal, discord, args):
+    bot_server.outbox.resolve_channel = discord.resolve # 알림 전송은 가짜 디스코드로
+    # 폴링 간격을 고정해 크롤링 처리량을 재기 쉽게 함 (야간/출발 시각 규칙은 끔)
+    policy = bot_server.poll_policy
+    policy.min_interval = policy.base_interval = policy.max_interval = args.poll
+    policy.night_hours = (0, 0)
+    bot_server.scheduler.start()
+
+    if not await bot_server.schedule_cache.refresh():
+        raise RuntimeError("가짜 포털에서 첫 크롤링에 실패했습니다.")
+    queries_before = portal.grid_queries
+    started = time.time()
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + args.duration
+    rng = random.Random(args.seed)
+    command_latency = {}
+    await asyncio.gather(*(
+        simulated_user(bot_server, 1000 + k, deadline, random.Random(rng.random()), command_latency)
+        for k in range(args.users)
+    ))
+    elapsed = time.time() - started
+    bot_server.scheduler.shutdown()
+    await bot_server.outbox.flush()
+    return elapsed, portal.grid_queries - queries_before, command_latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 포털 + 실제 봇 로직 종단 간 부하 테스트")
+    parser.add_argument("--duration", type=float, default=60, help="부하를 거는 시간 (초, 기본 60)")
+    parser.add_argument("--users", type=int, default=20, help="동시에 명령을 보내는 가상 사용자 수 (기본 20)")
+    parser.add_argument("--routes", type=int, default=40, help="포털 노선 수 (기본 40)")
+    parser.add_argument("--tick", type=float, default=2.0, help="포털 좌석이 바뀌는 주기 (초, 기본 2)")
+    parser.add_argument("--poll", type=int, default=2, help="모니터링 폴링 간격 (초, 기본 2)")
+    parser.add_argument("--backend", choices=("http", "selenium"), default="http", help="크롤러 백엔드 (selenium은 크롬 필요)")
+    parser.add_argument("--send-latency", type=float, default=0.05, help="가짜 디스코드 전송 한 번에 걸리는 시간 (초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="봇 INFO 로그 출력")
+    args = parser.parse_args()
+
+    # 봇 모듈을 불러오기 전에 포털 주소, 백엔드, 임시 이력 DB, 신선도 기준을 정함
+    work_dir = tempfile.mkdtemp(prefix="kumoh_load_")
+    port = free_port()
+    os.environ["KUMOH_PORTAL_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["KUMOH_CRAWLER_BACKEND"] = args.backend
+    os.environ["KUMOH_HISTORY_DB"] = os.path.join(work_dir, "history.sqlite3")
+    os.environ["KUMOH_SESSION_STORE"] = os.path.join(work_dir, "portal_session.json")
+    os.environ["KUMOH_SNAPSHOT_MAX_AGE"] = str(args.poll)
+    os.environ["KUMOH_MONITOR_SNAPSHOT_MAX_AGE"] = "0"
+
+    from fake_portal import FakePortal, SeatScript
+    from fakes import FakeDiscord
+    import discord_bot_server as bot_server
+
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    script = SeatScript(routes=args.routes, tick=args.tick, seed=args.seed)
+    portal = FakePortal(script, port=port).start()
+    discord = FakeDiscord(latency=args.send_latency)
+    try:
+        elapsed, crawls, command_latency = asyncio.run(run_load(bot_server, portal, discord, args))
+    finally:
+        portal.stop()
+        bot_server.crawler_executor.shutdown(wait=True)
+        crawler_module = bot_server.loaded_crawler() # 크롤러 프로세스 또는 login_crawler 모듈
+        if crawler_module is not None:
+            crawler_module.close_webdriver()
+        if bot_server.history_store is not None: # 좌석 이력 저장소는 처음 쓸 때 만들어짐
+            bot_server.history_store.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    latencies = alert_latencies(discord.received, script.became_available)
+    print(f"부하: 가상 사용자 {args.users}명, {elapsed:.0f}초, 백엔드 {args.backend}, 폴링 {args.poll}초, 좌석 변화 주기 {args.tick}초")
+    print(f"크롤링: {crawls}회 (분당 {crawls / elapsed * 60:.1f}회), 포털 로그인 {portal.logins}회")
+    print(f"포털 좌석 변화: {len(script.changes)}건 (만석 해제 {len(script.became_available)}건)")
+    print(f"가짜 디스코드: 메시지 {len(discord.received)}개, '만석이 아니게' 알림 {len(latencies)}건")
+    if latencies:
+        print(f"종단 간 알림 지연 (초): p50 {percentile(latencies, 0.5):.2f}, p95 {percentile(latencies, 0.95):.2f}, "
+              f"최대 {max(latencies):.2f}")
+    print("명령 첫 응답 (ms):")
+    for action, values in sorted(command_latency.items()):
+        print(f"  !{action:<8}{len(values):>5}회  p50 {percentile(values, 0.5) * 1000:8.1f}  "
+              f"p95 {percentile(values, 0.95) * 1000:8.1f}  최대 {max(values) * 1000:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
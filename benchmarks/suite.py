@@ -0,0 +1,305 @@
+# 파일명: benchmarks/suite.py
+# 실행: python benchmarks/suite.py [--filter parse] [--json 결과.json] [--compare 기준.json] [--tolerance 0.25]
+# 실제 포털/크롬/디스코드 없이 핫 패스를 재는 오프라인 벤치마크 모음.
+#   parse/*    그리드 HTML을 엔진별로 파싱 (get_bus_schedule의 파싱 단계). 합성 페이지(benchmarks/fixtures/synthetic_grid_*)와
+#              실제 포털 기록(portal_grid.html, capture_portal.py capture로 저장한 경우만 parse/*/portal).
+#              재기 전에 모든 엔진의 행이 bs4와 같은지 확인하고, 다르면 실패
+#   crawl/*    가짜 WebDriver로 get_bus_schedule_selenium 전체 경로 (그리드 렌더링 대기 시간은 빼고 계산)
+#   readiness/* 조회와 무관한 XHR이 조회 응답보다 먼저 끝나는 가짜 WebDriver로 wait_for_grid
+#              (조회 응답 전에 준비 완료로 보면 실패. 수치는 응답 + settle 이후 알아채기까지 걸린 시간)
+#   publish/*  스냅샷 생성 + 이전 스냅샷과 비교 (update_bus_schedules의 락 밖 작업)
+#   monitor/*  모니터링 잡의 알림 판단 (구독 + 알림 규칙)
+#   list/*     !list 페이지 나누기 (render: 매번 새로, cached: 같은 스냅샷 반복 호출)
+#   outbox/*   가짜 디스코드로 알림 합치기 + 전송 (전송 지연 0, 파이썬 쪽 비용만)
+# 같은 고정 데이터/시드를 쓰므로 실행마다 비교 가능한 수치가 나오고, --compare로 기준보다 느려진 항목을 찾을 수 있음.
+# 회귀 판단은 잡음(다른 프로세스)에 덜 흔들리는 최솟값 기준이며, 실행 시작 때 잰 기준 작업 시간으로 나눠
+# 기계/CPU 클럭 차이를 보정함.
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import io
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from dataclasses import replace
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import perf_metrics  # noqa: E402
+from bus_model import BusSchedule  # noqa: E402
+from grid_parser import ENGINES, parse_grid, rows_to_routes, extract_rows_in_page  # noqa: E402
+from grid_readiness import mark_grid, wait_for_grid  # noqa: E402
+from schedule_diff import diff_schedules  # noqa: E402
+from subscriptions import SubscriptionIndex, collect_alerts, user_target  # noqa: E402
+from alert_rules import RuleBook, collect_rule_alerts, REMAINING_AT_MOST, FILL_AT_LEAST, SEAT_OPENED, SCOPE_BUS, SCOPE_AREA  # noqa: E402
+from notification_outbox import NotificationOutbox  # noqa: E402
+from route_list import RoutePageCache, paginate_routes  # noqa: E402
+from fixtures import FIXTURE_SIZES, load_fixture, load_portal_grid, fixture_schedule  # noqa: E402
+from fakes import FakeDriver, FakeDiscord  # noqa: E402
+
+MIN_TIME = 0.5        # 항목마다 최소 이 시간(초) 동안 반복
+MAX_REPEAT = 2000
+WARMUP = 3
+
+
+class Case:
+    """
+    벤치마크 항목 하나. prepare()는 측정할 함수 run()을 반환하고, run()의 소요 시간만 잼.
+    fresh=True면 반복마다 prepare()를 다시 호출 (run이 상태를 바꾸는 경우).
+    run()이 숫자를 반환하면 그 값을 소요 시간 대신 사용 (측정에서 빼야 할 대기 시간이 있는 경우).
+    """
+
+    def __init__(self, name, prepare, fresh=False, min_time=MIN_TIME, max_repeat=MAX_REPEAT):
+        self.name = name
+        self.prepare = prepare
+        self.fresh = fresh
+        self.min_time = min_time
+        self.max_repeat = max_repeat
+
+
+def measure(case):
+    run = case.prepare()
+    for _ in range(WARMUP):
+        run()
+        if case.fresh:
+            run = case.prepare()
+    samples = []
+    gc.collect()
+    gc.disable()
+    try:
+        budget_end = time.perf_counter() + case.min_time
+        while len(samples) < case.max_repeat and (len(samples) < 5 or time.perf_counter() < budget_end):
+            if case.fresh:
+                run = case.prepare()
+            started = time.perf_counter()
+            result = run()
+            elapsed = time.perf_counter() - started
+            samples.append(result if isinstance(result, float) else elapsed)
+    finally:
+        gc.enable()
+    samples.sort()
+    return {
+        "repeat": len(samples),
+        "median_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+        "min_ms": samples[0] * 1000,
+    }
+
+
+def calibrate():
+    """기계 속도 보정용 고정 작업(순수 파이썬 반복 + 정렬)의 최소 소요 시간 (ms)."""
+    def work():
+        data = [(k * 7919) % 10007 for k in range(20000)]
+        data.sort()
+        return sum(data)
+    return measure(Case("calibrate", lambda: work, max_repeat=50))["min_ms"]
+
+
+# --- 항목 정의 ---
+def parse_cases():
+    pages = [(str(size), load_fixture(size)) for size in FIXTURE_SIZES]
+    portal = load_portal_grid()
+    if portal is not None:
+        pages.append(("portal", portal))
+    for label, html in pages:
+        reference = ENGINES["bs4"](html) if "bs4" in ENGINES else None
+        for engine, extract in ENGINES.items():
+            if reference is not None and extract(html) != reference:
+                raise AssertionError(f"엔진 '{engine}'의 추출 결과가 bs4와 다릅니다. ({label})")
+            yield Case(f"parse/{engine}/{label}", lambda html=html, engine=engine: lambda: parse_grid(html, engine))
+        driver = FakeDriver(html)
+        yield Case(f"parse/in_page/{label}", lambda driver=driver: lambda: rows_to_routes(extract_rows_in_page(driver)))
+
+
+def crawl_cases():
+    import login_crawler
+    from session_keeper import SESSION_OK
+    keeper = login_crawler.session_keeper
+
+    def prepare(html):
+        with contextlib.redirect_stdout(io.StringIO()):
+            keeper.close()
+        keeper.driver_factory = lambda: FakeDriver(html)
+        keeper.login_fn = lambda driver: None
+        keeper.probe_fn = lambda driver: SESSION_OK
+        keeper.resume_fn = None
+
+        def run():
+            perf_metrics.reset()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                login_crawler.get_bus_schedule_selenium()
+            elapsed = time.perf_counter() - started
+            render_wait = sum(count * p50 for name, (count, p50, *_rest) in perf_metrics.latency_summary().items()
+                              if name.startswith("render_wait_"))
+            return elapsed - render_wait # 그리드 안정화 대기(settle)는 고정 대기이므로 제외
+        return run
+
+    for size in FIXTURE_SIZES:
+        html = load_fixture(size)
+        yield Case(f"crawl/selenium_fake/{size}", lambda html=html: prepare(html), min_time=0, max_repeat=5)
+    with contextlib.redirect_stdout(io.StringIO()):
+        keeper.close()
+
+
+def readiness_cases():
+    html = load_fixture(FIXTURE_SIZES[0])
+    query_delay, settle = 0.2, 0.05
+    for redraw in (True, False):
+        def prepare(redraw=redraw):
+            driver = FakeDriver(html, query_delay=query_delay, background_requests=2, redraw=redraw)
+
+            def run():
+                before = mark_grid(driver)
+                driver.render()
+                started = time.perf_counter()
+                reason = wait_for_grid(driver, before, settle=settle, poll=0.01)
+                elapsed = time.perf_counter() - started
+                expected = "changed" if redraw else "unchanged"
+                if reason != expected or elapsed < query_delay:
+                    raise AssertionError(f"조회 응답({query_delay}초) 전에 다른 XHR만 보고 준비 완료로 판단함: "
+                                         f"{reason} ({elapsed:.3f}초, 기대값 {expected})")
+                return max(elapsed - query_delay - settle, 0.0)
+            return run
+        yield Case(f"readiness/xhr_first/{'redraw' if redraw else 'same_rows'}", prepare, min_time=0, max_repeat=5)
+
+
+def publish_cases():
+    for size in FIXTURE_SIZES:
+        old = fixture_schedule(size)
+        rng = random.Random(size)
+        routes = [route.to_dict() for route in old.routes]
+        for route in rng.sample(routes, max(1, size // 5)): # 노선 20%의 좌석이 바뀜
+            route["current_seats"] = max(0, route["current_seats"] - 1)
+
+        def run(old=old, routes=routes):
+            new = BusSchedule.from_dicts(routes, old.fetched_at + timedelta(minutes=1), old.version + 1)
+            return diff_schedules(old, new)
+        yield Case(f"publish/{size}", lambda run=run: run)
+
+
+def monitor_cases():
+    size = 80
+    before = fixture_schedule(size)
+    full_routes = [replace(route, current_seats=route.total_seats) for route in before.routes]
+    before = BusSchedule(tuple(full_routes), before.fetched_at, 1)
+    after_routes = [replace(route, current_seats=route.total_seats - (k % 4)) for k, route in enumerate(full_routes)]
+    after = BusSchedule(tuple(after_routes), before.fetched_at + timedelta(minutes=1), 2)
+    events = diff_schedules(before, after)
+    ids = [route.id for route in before.routes]
+    regions = sorted(before.by_region)
+
+    for subscribers in (100, 1000, 5000):
+        def prepare(subscribers=subscribers):
+            rng = random.Random(subscribers)
+            index = SubscriptionIndex()
+            book = RuleBook()
+            for k in range(subscribers):
+                target = user_target(k)
+                for bus_id in rng.sample(ids, 3):
+                    index.subscribe(target, bus_id)
+                scope = (SCOPE_BUS, rng.choice(ids)) if k % 3 else (SCOPE_AREA, rng.choice(regions))
+                kind = (REMAINING_AT_MOST, FILL_AT_LEAST, SEAT_OPENED)[k % 3]
+                book.add(target, kind, scope, rng.randint(0, 5) if kind == REMAINING_AT_MOST else rng.randint(80, 100))
+            collect_alerts(index, before, []) # 첫 확인 (모두 만석)
+            book._compile() # 규칙 컴파일은 규칙이 바뀔 때만 일어나므로 측정에서 제외
+            return lambda: collect_alerts(index, after, events) + collect_rule_alerts(book, events)
+        yield Case(f"monitor/decide/{subscribers}", prepare, fresh=True, max_repeat=50)
+
+
+def list_cases():
+    for size in FIXTURE_SIZES:
+        schedule = fixture_schedule(size)
+        yield Case(f"list/render/{size}", lambda schedule=schedule: lambda: paginate_routes(schedule.routes))
+
+        def cached(schedule=schedule):
+            pages = RoutePageCache(lambda routes, fetched_at, keyword: paginate_routes(routes))
+            pages.get(schedule) # 첫 호출에서 만들어 두고, 반복 호출(같은 스냅샷)은 재사용만 측정
+            return lambda: pages.get(schedule)
+        yield Case(f"list/cached/{size}", cached)
+
+
+def outbox_cases():
+    loop = asyncio.new_event_loop()
+    for targets in (10, 100, 1000):
+        def prepare(targets=targets):
+            client = FakeDiscord(latency=0)
+            outbox = NotificationOutbox(client.resolve, max_concurrency=8)
+            for k in range(targets):
+                for n in range(3): # 대상마다 알림 3건 -> 메시지 1개로 합쳐짐
+                    outbox.put(user_target(k), f"🚌 ID '{1000 + n}'번 노선이 만석이 아니게 되었습니다. 현재 좌석: 44/45")
+            return lambda: loop.run_until_complete(outbox.flush())
+        yield Case(f"outbox/dispatch/{targets}", prepare, fresh=True, max_repeat=200)
+
+
+CASE_GROUPS = (parse_cases, crawl_cases, readiness_cases, publish_cases, monitor_cases, list_cases, outbox_cases)
+
+
+def compare(results, baseline, tolerance, scale=1.0):
+    """기준 결과보다 (보정한) 최솟값이 tolerance 비율 이상 느려진 항목 리스트. scale = 이번 보정값 / 기준 보정값."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base and base["min_ms"] > 0:
+            ratio = result["min_ms"] / (base["min_ms"] * scale)
+            if ratio > 1 + tolerance:
+                regressions.append((name, base["min_ms"], result["min_ms"], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 핫 패스 벤치마크")
+    parser.add_argument("--filter", default="", help="이름에 이 문자열이 들어간 항목만 실행")
+    parser.add_argument("--json", help="결과를 이 파일에 JSON으로 저장")
+    parser.add_argument("--compare", help="이전 --json 결과와 비교")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="이 비율 이상 느려지면 회귀로 판단 (기본 0.25)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    calibration = calibrate()
+    baseline = {}
+    scale = 1.0
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            saved = json.load(f)
+        baseline = saved["results"]
+        scale = calibration / saved.get("calibration_ms", calibration)
+    print(f"기계 속도 보정 기준 작업: {calibration:.3f}ms" + (f" (기준 실행 대비 {scale:.2f}x)" if args.compare else ""))
+
+    results = {}
+    print(f"{'항목':<32}{'반복':>6}{'중앙값(ms)':>12}{'p95(ms)':>10}{'최소(ms)':>10}{'기준 대비(최소)':>14}")
+    for group in CASE_GROUPS:
+        for case in group():
+            if args.filter not in case.name:
+                continue
+            result = results[case.name] = measure(case)
+            base = baseline.get(case.name)
+            delta = f"{result['min_ms'] / (base['min_ms'] * scale):>13.2f}x" if base and base["min_ms"] > 0 else f"{'-':>14}"
+            print(f"{case.name:<32}{result['repeat']:>6}{result['median_ms']:>12.3f}{result['p95_ms']:>10.3f}"
+                  f"{result['min_ms']:>10.3f}{delta}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "calibration_ms": calibration, "results": results},
+                      f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json}")
+
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance, scale)
+        for name, before, after, ratio in regressions:
+            print(f"회귀: {name} {before:.3f}ms -> {after:.3f}ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"기준 대비 {args.tolerance:.0%} 이상 느려진 항목 없음.")
+
+
+if __name__ == "__main__":
+    main()
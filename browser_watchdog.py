@@ -0,0 +1,199 @@
+# 파일명: browser_watchdog.py
+
+import logging
+import os
+import threading
+
+import psutil
+
+import perf_metrics
+
+# 이 봇이 띄운 크롬에 붙이는 표시 인자 (값은 띄운 봇 프로세스의 pid). 고아 프로세스를 찾을 때 사용
+CHROME_MARKER = "--kumoh-bus-crawler"
+
+
+def chrome_marker_argument():
+    return f"{CHROME_MARKER}={os.getpid()}"
+
+
+def process_tree(pid):
+    """pid와 모든 하위 프로세스 (이미 종료됐으면 빈 리스트)."""
+    try:
+        root = psutil.Process(pid)
+        return [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+
+
+def process_tree_rss(pid):
+    """pid와 모든 하위 프로세스의 RSS 합 (바이트)."""
+    total = 0
+    for process in process_tree(pid):
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def driver_tree(pid):
+    """chromedriver pid의 프로세스 트리. pid가 이미 다른 프로그램에 재사용됐으면 빈 리스트."""
+    tree = process_tree(pid)
+    try:
+        if tree and "chromedriver" in tree[0].name().lower():
+            return tree
+    except psutil.Error:
+        pass
+    return []
+
+
+def find_marked_processes():
+    """표시 인자가 붙은 크롬 프로세스와 그 크롬을 띄운 봇 pid [(프로세스, 봇 pid)]."""
+    found = []
+    for process in psutil.process_iter(["cmdline"]):
+        for argument in process.info["cmdline"] or ():
+            if argument.startswith(CHROME_MARKER + "="):
+                try:
+                    found.append((process, int(argument.split("=", 1)[1])))
+                except ValueError:
+                    pass
+                break
+    return found
+
+
+def _kill(processes):
+    """프로세스들을 강제 종료하고 잠깐 기다림. 실제로 종료시킨 수를 반환."""
+    killed = []
+    for process in processes:
+        try:
+            process.kill()
+            killed.append(process)
+        except psutil.Error:
+            pass
+    psutil.wait_procs(killed, timeout=3)
+    return len(killed)
+
+
+def kill_process_tree(pid):
+    """pid와 모든 하위 프로세스(chromedriver, 크롬 포함)를 강제 종료. 종료시킨 수를 반환."""
+    tree = process_tree(pid)
+    return _kill(reversed(tree)) # 하위 프로세스부터 종료
+
+
+class BrowserWatchdog:
+    """
+    이 프로세스가 띄운 chromedriver/크롬 프로세스 트리의 메모리와 드라이버 수를 지켜봄.
+    크롤링마다 check()로 RSS 상한과 세션당 최대 크롤링 수를 확인해 재시작이 필요한지 알려주고 닫히지 않은 이전 드라이버는 바로 정리함.
+    종료된 드라이버가 남긴 프로세스나 이전 실행이 남긴 고아 크롬은 reap_orphans()로 정리함.
+    """
+
+    def __init__(self, rss_limit_mb, max_crawls):
+        self.rss_limit = rss_limit_mb * 2 ** 20
+        self.max_crawls = max_crawls
+        self._lock = threading.Lock()
+        self._driver_pids = [] # 살아 있는 드라이버의 chromedriver pid
+        self.crawls = 0        # 현재 드라이버로 한 크롤링 수
+        self.rss = 0           # 마지막 점검 때 프로세스 트리 RSS (바이트)
+        self.peak_rss = 0
+        self.recycles = 0
+        self.last_recycle_reason = None
+        self.reaped = 0
+
+    def attach(self, driver):
+        """새 드라이버를 감시 대상으로 등록 (드라이버 생성 직후 호출)."""
+        pid = getattr(getattr(getattr(driver, "service", None), "process", None), "pid", None)
+        with self._lock:
+            if pid is not None:
+                self._driver_pids.append(pid)
+            self.crawls = 0
+
+    def detach(self, driver):
+        """드라이버 종료 후 호출. quit()이 남긴 chromedriver/크롬 프로세스가 있으면 정리."""
+        pid = getattr(getattr(getattr(driver, "service", None), "process", None), "pid", None)
+        with self._lock:
+            if pid not in self._driver_pids:
+                return
+            self._driver_pids.remove(pid)
+        leftover = _kill(driver_tree(pid))
+        if leftover:
+            logging.warning(f"WebDriver 종료 후 남은 프로세스 {leftover}개를 정리했습니다.")
+        self.reaped += leftover
+        self.reap_orphans()
+
+    def live_drivers(self):
+        """아직 살아 있는 드라이버의 chromedriver pid (죽은 것은 목록에서 뺌)."""
+        with self._lock:
+            self._driver_pids = [pid for pid in self._driver_pids if psutil.pid_exists(pid)]
+            return list(self._driver_pids)
+
+    def check(self):
+        """크롤링이 한 번 끝날 때 호출. 브라우저를 새로 띄워야 하면 이유를, 아니면 None을 반환."""
+        pids = self.live_drivers()
+        if len(pids) > 1:
+            self._kill_leaked(pids[:-1]) # 세션 관리자는 가장 최근 드라이버만 씀
+            pids = pids[-1:]
+        self.rss = sum(process_tree_rss(pid) for pid in pids)
+        self.peak_rss = max(self.peak_rss, self.rss)
+        with self._lock:
+            self.crawls += 1
+            crawls = self.crawls
+        if self.rss > self.rss_limit:
+            return f"메모리 {self.rss / 2 ** 20:.0f}MB > 상한 {self.rss_limit / 2 ** 20:.0f}MB"
+        if self.max_crawls and crawls >= self.max_crawls:
+            return f"세션당 최대 크롤링 {self.max_crawls}회 도달"
+        return None
+
+    def _kill_leaked(self, pids):
+        """세션 관리자가 놓친(닫히지 않은) 이전 드라이버들을 종료."""
+        with self._lock:
+            self._driver_pids = [pid for pid in self._driver_pids if pid not in pids]
+        leaked = sum(_kill(driver_tree(pid)) for pid in pids)
+        self.reaped += leaked
+        perf_metrics.increment("browser_processes_reaped", leaked)
+        logging.warning(f"닫히지 않은 이전 WebDriver {len(pids)}개 (프로세스 {leaked}개)를 정리했습니다.")
+
+    def record_recycle(self, reason):
+        with self._lock:
+            self.crawls = 0
+        self.recycles += 1
+        self.last_recycle_reason = reason
+        perf_metrics.increment("webdriver_recycles")
+
+    def reap_orphans(self):
+        """
+        표시 인자가 붙은 크롬 중 살아 있는 드라이버에 속하지 않은 것을 종료 (시작/종료 시, 드라이버 종료 후 호출).
+        다른 봇 프로세스가 아직 쓰고 있는 크롬은 건드리지 않음. 정리한 프로세스 수를 반환.
+        """
+        live = {process.pid for pid in self.live_drivers() for process in process_tree(pid)}
+        me = os.getpid()
+        victims = {}
+        for process, owner in find_marked_processes():
+            if process.pid in live or (owner != me and psutil.pid_exists(owner)):
+                continue
+            victims[process.pid] = process
+            try:
+                parent = process.parent() # 크롬을 띄운 chromedriver도 함께 정리
+                if parent is not None and "chromedriver" in parent.name().lower() and parent.pid not in live:
+                    victims[parent.pid] = parent
+            except psutil.Error:
+                pass
+        if not victims:
+            return 0
+        reaped = _kill(victims.values())
+        self.reaped += reaped
+        perf_metrics.increment("browser_processes_reaped", reaped)
+        logging.warning(f"고아 크롬/chromedriver 프로세스 {reaped}개를 정리했습니다.")
+        return reaped
+
+    def stats(self):
+        return {
+            "drivers": len(self.live_drivers()),
+            "rss_mb": self.rss / 2 ** 20,
+            "peak_rss_mb": self.peak_rss / 2 ** 20,
+            "rss_limit_mb": self.rss_limit / 2 ** 20,
+            "crawls": self.crawls,
+            "max_crawls": self.max_crawls,
+            "recycles": self.recycles,
+            "last_recycle_reason": self.last_recycle_reason,
+            "reaped": self.reaped,
+        }
@@ -0,0 +1,89 @@
+# 파일명: bus_model.py
+
+from dataclasses import dataclass, asdict
+from types import MappingProxyType
+
+
+@dataclass(frozen=True, slots=True)
+class BusRoute:
+    """버스 노선 한 건 (크롤링 결과 한 행). 변경 불가."""
+    id: str
+    bus_type: str
+    bus_number: str
+    bus_vehicle: str
+    bus_region: str
+    bus_route_detail: str
+    current_seats: int
+    total_seats: int
+
+    @property
+    def is_full(self):
+        """만석 여부 (현재 좌석 수 == 전체 좌석 수)."""
+        return self.current_seats == self.total_seats
+
+    @classmethod
+    def from_dict(cls, data):
+        """크롤러가 반환하는 노선 dict로부터 생성."""
+        return cls(
+            id=data["id"],
+            bus_type=data["bus_type"],
+            bus_number=data["bus_number"],
+            bus_vehicle=data["bus_vehicle"],
+            bus_region=data["bus_region"],
+            bus_route_detail=data["bus_route_detail"],
+            current_seats=data["current_seats"],
+            total_seats=data["total_seats"],
+        )
+
+    def to_dict(self):
+        return asdict(self)
+
+
+class BusSchedule:
+    """
+    한 번의 크롤링 결과 스냅샷. 변경 불가.
+    생성 시 ID -> 노선 인덱스와 지역별/버스 종류별 보조 인덱스를 한 번만 만들어 둠.
+    """
+    __slots__ = ("routes", "by_id", "by_region", "by_type", "fetched_at", "version", "seat_key", "fingerprint")
+
+    def __init__(self, routes=(), fetched_at=None, version=0):
+        self.routes = tuple(routes)
+        by_id = {}
+        by_region = {}
+        by_type = {}
+        for route in self.routes:
+            by_id[route.id] = route
+            by_region.setdefault(route.bus_region, []).append(route)
+            by_type.setdefault(route.bus_type, []).append(route)
+        # 노선 ID와 좌석 수만 모은 튜플과 그 해시(지문): 지문이 다르면 좌석이 바뀐 것이고,
+        # 같으면 (해시 충돌일 수 있으므로) seat_key를 직접 비교해 확인함
+        self.seat_key = tuple((route.id, route.current_seats, route.total_seats) for route in self.routes)
+        self.fingerprint = hash(self.seat_key)
+        self.by_id = MappingProxyType(by_id)
+        self.by_region = MappingProxyType({key: tuple(value) for key, value in by_region.items()})
+        self.by_type = MappingProxyType({key: tuple(value) for key, value in by_type.items()})
+        self.fetched_at = fetched_at # datetime, 크롤링 시각
+        self.version = version       # 스냅샷이 새로 만들어질 때마다 1씩 증가
+
+    @classmethod
+    def from_dicts(cls, route_dicts, fetched_at=None, version=0):
+        return cls((BusRoute.from_dict(data) for data in route_dicts), fetched_at, version)
+
+    def get(self, bus_id):
+        """ID로 노선 조회 (없으면 None)."""
+        return self.by_id.get(bus_id)
+
+    def __contains__(self, bus_id):
+        return bus_id in self.by_id
+
+    def __len__(self):
+        return len(self.routes)
+
+    def __iter__(self):
+        return iter(self.routes)
+
+    def __bool__(self):
+        return bool(self.routes)
+
+
+EMPTY_SCHEDULE = BusSchedule()
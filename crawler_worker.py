@@ -0,0 +1,267 @@
+# 파일명: crawler_worker.py
+# 크롤러(login_crawler)를 봇과 분리된 자식 프로세스에서 실행하고 관리함.
+#  - 봇 프로세스: CrawlerProcess가 자식 프로세스를 띄우고 명령(crawl/prewarm/reap/stats)을 보낸 뒤 답을 기다림.
+#    답이 CRAWLER_TIMEOUT초 안에 오지 않으면 프로세스 트리(chromedriver/크롬 포함)를 강제 종료하고 다음 요청 때 새로 띄움.
+#  - 크롤러 프로세스: 이 파일을 스크립트로 실행 (python crawler_worker.py). 표준 입력으로 명령을 받고,
+#    원래 표준 출력으로 결과를 보냄 (print 출력은 표준 에러로 돌림).
+# 메시지는 [4바이트 길이 + pickle] 프레임. 크롤링 결과는 노선 dict 대신 필드 순서대로의 튜플로 줄여 보냄.
+# multiprocessing(spawn)은 자식에서 봇 메인 모듈을 다시 불러오므로 쓰지 않음 (윈도우 포함 같은 방식으로 동작).
+
+import logging
+import os
+import pickle
+import queue
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+import perf_metrics
+
+# 크롤링 결과 노선 dict의 필드 (grid_parser.make_route와 같은 순서)
+ROUTE_FIELDS = ("id", "bus_type", "bus_number", "bus_vehicle", "bus_region", "bus_route_detail",
+                "current_seats", "total_seats")
+
+_HEADER = struct.Struct(">I")
+CLOSE_TIMEOUT = 10 # 종료 요청 후 크롤러 프로세스가 스스로 끝나기를 기다리는 시간 (초)
+
+
+class CrawlerWorkerError(Exception):
+    """크롤러 프로세스가 멈췄거나 죽었거나, 요청 처리 중 오류를 보고함."""
+
+
+def encode_routes(routes):
+    """노선 dict 리스트 -> 프레임에 싣는 바이트 (필드 이름은 한 번도 싣지 않음)."""
+    return pickle.dumps([tuple(route[field] for field in ROUTE_FIELDS) for route in routes], pickle.HIGHEST_PROTOCOL)
+
+
+def decode_routes(payload):
+    return [dict(zip(ROUTE_FIELDS, values)) for values in pickle.loads(payload)]
+
+
+def write_frame(stream, message):
+    data = pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+    stream.write(_HEADER.pack(len(data)) + data)
+    stream.flush()
+
+
+def read_frame(stream):
+    """프레임 하나를 읽음. 상대가 파이프를 닫았으면 (프로세스 종료) EOFError."""
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise EOFError
+    size, = _HEADER.unpack(header)
+    data = stream.read(size)
+    if len(data) < size:
+        raise EOFError
+    return pickle.loads(data)
+
+
+# --- 봇 프로세스 쪽 ---
+class CrawlerProcess:
+    """
+    크롤러 자식 프로세스 관리자. login_crawler 모듈과 같은 함수(get_bus_schedule, prewarm, reap_orphaned_browsers,
+    close_webdriver, webdriver_session_stats, browser_watchdog_stats)를 제공하므로 봇은 어느 쪽이든 같은 방식으로 씀.
+    요청 메서드는 응답을 기다리며 블로킹하므로 크롤러 스레드에서 호출할 것.
+    상태 조회(*_stats)는 마지막 응답에 실려 온 값을 돌려주므로 이벤트 루프에서 불러도 멈추지 않음.
+    """
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self._lock = threading.Lock()  # 요청은 한 번에 하나씩 (크롤러 스레드가 하나라 보통 경쟁 없음)
+        self._process = None
+        self._replies = None           # 현재 프로세스의 응답 큐 (읽기 스레드가 채움, 종료되면 None이 들어옴)
+        self._session_stats = None
+        self._watchdog_stats = None
+        self.starts = 0
+        self.hangs = 0                 # 응답이 없어 강제 종료한 횟수
+        self.crashes = 0               # 요청 처리 중 프로세스가 죽은 횟수
+        self.last_snapshot_bytes = 0
+        self.last_error = None
+
+    @property
+    def pid(self):
+        process = self._process
+        return process.pid if process is not None and process.poll() is None else None
+
+    def _start(self):
+        script = os.path.abspath(__file__)
+        process = subprocess.Popen([sys.executable, script], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        replies = queue.Queue()
+        threading.Thread(target=_read_replies, args=(process.stdout, replies), name=f"crawler-reader-{self.starts + 1}",
+                         daemon=True).start()
+        self._process, self._replies = process, replies
+        self.starts += 1
+        perf_metrics.increment("crawler_process_starts")
+        logging.info(f"크롤러 프로세스 시작 (pid {process.pid}, {self.starts}번째)")
+
+    def _stop(self):
+        """현재 크롤러 프로세스와 그 하위 프로세스(chromedriver/크롬)를 강제 종료."""
+        process, self._process, self._replies = self._process, None, None
+        if process is None:
+            return
+        if process.poll() is None: # 이미 끝난 프로세스의 pid는 재사용됐을 수 있으므로 살아 있을 때만 트리 종료
+            try:
+                from browser_watchdog import kill_process_tree # psutil은 이 경우에만 필요
+                kill_process_tree(process.pid)
+            except Exception as e:
+                logging.warning(f"크롤러 프로세스 트리 종료 중 오류: {e}")
+                process.kill()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            logging.error(f"크롤러 프로세스 (pid {process.pid})가 종료되지 않습니다.")
+        for stream in (process.stdin, process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+    def _request(self, command):
+        """명령을 보내고 응답 본문을 반환. 멈추면(timeout) 강제 종료하고, 실패하면 CrawlerWorkerError."""
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._stop() # 이미 종료된 프로세스 정리
+                self._start()
+            replies = self._replies
+            with perf_metrics.timer(f"crawler_process_{command}"):
+                try:
+                    write_frame(self._process.stdin, command)
+                    reply = replies.get(timeout=self.timeout)
+                except queue.Empty:
+                    self.hangs += 1
+                    perf_metrics.increment("crawler_process_hangs")
+                    self.last_error = f"'{command}' {self.timeout}초 동안 응답 없음"
+                    logging.error(f"크롤러 프로세스가 {self.last_error}: 강제 종료 후 다음 요청 때 다시 시작합니다.")
+                    self._stop()
+                    raise CrawlerWorkerError(self.last_error) from None
+                except OSError as e: # 파이프가 이미 닫힘 (프로세스 종료)
+                    reply = None
+                    logging.warning(f"크롤러 프로세스에 명령 전송 실패: {e}")
+                if reply is None:
+                    self.crashes += 1
+                    perf_metrics.increment("crawler_process_crashes")
+                    exit_code = self._process.poll()
+                    self.last_error = f"'{command}' 처리 중 크롤러 프로세스 종료 (종료 코드 {exit_code})"
+                    logging.error(self.last_error)
+                    self._stop()
+                    raise CrawlerWorkerError(self.last_error)
+
+        ok, body, stats, forwarded = reply
+        perf_metrics.merge(*forwarded) # 크롤러 프로세스에서 잰 단계별 지연 시간/카운터를 !perf에 합침
+        if stats is not None:
+            self._session_stats, self._watchdog_stats = stats
+        if not ok:
+            raise CrawlerWorkerError(body)
+        return body
+
+    def get_bus_schedule(self):
+        payload = self._request("crawl")
+        self.last_snapshot_bytes = len(payload)
+        with perf_metrics.timer("snapshot_decode"):
+            return decode_routes(payload)
+
+    def prewarm(self):
+        return self._request("prewarm")
+
+    def reap_orphaned_browsers(self):
+        try:
+            return self._request("reap")
+        except CrawlerWorkerError as e:
+            logging.warning(f"고아 브라우저 프로세스 정리 중 오류: {e}")
+            return 0
+
+    def close_webdriver(self):
+        """(봇 종료 시) 브라우저를 닫고 크롤러 프로세스를 끝냄. 응답이 없으면 강제 종료."""
+        if not self._lock.acquire(timeout=CLOSE_TIMEOUT): # 크롤링 중이면 조금 기다렸다가 강제 종료
+            self._stop()
+            return
+        try:
+            process = self._process
+            if process is None:
+                return
+            try:
+                write_frame(process.stdin, "close")
+                process.wait(timeout=CLOSE_TIMEOUT)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+            self._stop()
+        finally:
+            self._lock.release()
+
+    def webdriver_session_stats(self):
+        """마지막 응답 때의 WebDriver 세션 통계 (아직 응답이 없으면 None)."""
+        return self._session_stats
+
+    def browser_watchdog_stats(self):
+        return self._watchdog_stats
+
+    def worker_stats(self):
+        return {
+            "pid": self.pid,
+            "starts": self.starts,
+            "hangs": self.hangs,
+            "crashes": self.crashes,
+            "timeout": self.timeout,
+            "last_snapshot_bytes": self.last_snapshot_bytes,
+            "last_error": self.last_error,
+        }
+
+
+def _read_replies(stream, replies):
+    """(읽기 스레드) 크롤러 프로세스의 응답 프레임을 큐에 넣음. 파이프가 닫히면 None을 넣고 끝냄."""
+    while True:
+        try:
+            reply = read_frame(stream)
+        except (EOFError, OSError, pickle.UnpicklingError):
+            replies.put(None)
+            return
+        replies.put(reply)
+
+
+# --- 크롤러 프로세스 쪽 ---
+def _worker_main():
+    # 결과 채널은 원래 표준 입출력을 복제해서 쓰고, 표준 출력(print, 크롬 로그)은 표준 에러로 돌림.
+    # 복제한 파일 디스크립터는 상속되지 않으므로 chromedriver/크롬이 채널을 물고 있지 않음
+    commands = os.fdopen(os.dup(0), "rb")
+    results = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - [크롤러] %(message)s')
+
+    perf_metrics.start_forwarding()
+    import login_crawler
+    handlers = {
+        "crawl": lambda: encode_routes(login_crawler.get_bus_schedule()),
+        "prewarm": login_crawler.prewarm,
+        "reap": login_crawler.reap_orphaned_browsers,
+        "stats": lambda: None,
+    }
+    login_crawler.reap_orphaned_browsers() # 이전 크롤러 프로세스가 죽으면서 남긴 크롬 정리
+    logging.info(f"크롤러 프로세스 준비 완료 (pid {os.getpid()}, 봇 pid {os.getppid()})")
+    try:
+        while True:
+            try:
+                command = read_frame(commands)
+            except EOFError: # 봇 프로세스가 종료됨
+                break
+            if command == "close":
+                break
+            started = time.perf_counter()
+            try:
+                body, ok = handlers[command](), True
+            except Exception as e:
+                logging.error(f"'{command}' 처리 중 오류: {e}", exc_info=True)
+                body, ok = f"{type(e).__name__}: {e}", False
+            perf_metrics.observe(f"crawler_worker_{command}", time.perf_counter() - started)
+            stats = (login_crawler.webdriver_session_stats(), login_crawler.browser_watchdog_stats())
+            write_frame(results, (ok, body, stats, perf_metrics.take_forwarded()))
+    finally:
+        login_crawler.close_webdriver()
+
+
+if __name__ == "__main__":
+    _worker_main()
@@ -1,21 +1,42 @@
 # 파일명: discord_bot_server.py (개선된 버전)
 
+import time
+_module_started = time.perf_counter() # 시작 시간 측정 기준 (이 모듈을 불러오기 시작한 시각)
+
 import discord
 from discord.ext import commands
-from apscheduler.schedulers.background import BackgroundScheduler
 import asyncio
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-# login_crawler.py에서 필요한 함수들을 임포트
-from login_crawler import get_bus_schedule, close_webdriver
+# login_crawler(selenium, 파서 라이브러리, psutil)는 무거워서 봇 연결 뒤 사전 준비 작업에서 불러옴 (crawler() 참고)
+# 기본 설정에서는 봇 프로세스가 아니라 크롤러 자식 프로세스에서 불러옴 (crawler_worker.py)
+# seat_history(sqlite3)와 seat_forecast(NumPy)도 사전 준비 작업이나 처음 쓸 때 불러옴 (load_analytics() 참고)
+import perf_metrics
+from bus_model import BusSchedule, EMPTY_SCHEDULE
+from schedule_diff import diff_schedules
+from portal_config import SNAPSHOT_MAX_AGE, MONITOR_SNAPSHOT_MAX_AGE, HISTORY_DB_PATH, ALERT_MAX_CONCURRENCY, METRICS_PORT, READ_API_PORT
+from portal_config import CRAWLER_PROCESS, CRAWLER_TIMEOUT
+from snapshot_cache import SnapshotCache
+from snapshot_board import SnapshotBoard
+from watch_actor import WatchStateActor
+from notification_outbox import NotificationOutbox, merge_messages
+from adaptive_poller import AdaptivePollPolicy
+from subscriptions import SubscriptionIndex, collect_alerts, user_target, channel_target, USER
+from alert_rules import RuleBook, collect_rule_alerts, parse_condition, parse_scope, describe_rule
+from async_scheduler import AsyncScheduler
+from route_list import RoutePageCache, paginate_routes
 
 # key.py 파일에서 설정값 불러오기
 from key import DISCORD_BOT_TOKEN, DISCORD_CHANNEL_ID
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# 시작 시간 기록 (!status 표시용): 모듈 로드, 디스코드 연결(on_ready), 사전 준비, 첫 명령 처리
+startup_stats = {"import": None, "ready": None, "prewarm": None, "prewarm_state": "대기", "first_command": None}
+
 # Discord 봇 설정
 intents = discord.Intents.default()
 intents.message_content = True # 메시지 내용을 읽을 권한 (개발자 포털에서도 활성화해야 함)
@@ -23,246 +44,364 @@ intents.guilds = True # 봇이 길드(서버) 정보를 캐시하도록 허용
 intents.members = True # 봇이 멤버 정보를 캐시하도록 허용 (선택 사항이지만 도움이 될 수 있음)
 
 bot = commands.Bot(command_prefix='!', intents=intents, help_command=None) # 내장 help 명령어 비활성화
-scheduler = BackgroundScheduler()
+scheduler = AsyncScheduler() # 봇 이벤트 루프 위에서 도는 주기 작업 스케줄러
+
+# 크롤러(Selenium/HTTP)처럼 오래 걸리는 블로킹 작업은 전용 스레드 하나에서만 실행
+# -> 크롤링이 자연스럽게 한 번에 하나씩 직렬화되고, 이벤트 루프(하트비트 포함)는 멈추지 않음
+# (크롤러 프로세스를 쓰면 이 스레드는 크롤러 프로세스의 응답만 기다림)
+crawler_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="crawler")
 
 # --- 전역 상태 관리 변수 ---
-current_bus_schedules = []        # 현재 크롤링된 버스 노선 정보
-last_update_time = None           # current_bus_schedules가 마지막으로 갱신된 시간
-monitored_bus_ids = set()         # 모니터링할 버스 번호들 (사용자 입력, 여러 개 가능)
-last_monitored_seats = {}         # 마지막으로 모니터링한 버스의 좌석 정보 {bus_id: current_seats}
+# 현재 크롤링된 버스 노선 스냅샷 (BusSchedule, 갱신 시각은 fetched_at). 읽기는 snapshots.current (락 없음),
+# 발행은 크롤러 스레드가 새 스냅샷을 만든 뒤 참조만 교체. 발행마다 이전 스냅샷과의 변화 이벤트(SeatEvent)도 기록됨
+snapshots = SnapshotBoard(EMPTY_SCHEDULE)
+
+# 감시 상태: 아래 값은 watch_actor에 맡긴 작업 안에서만 바꿈 (단일 작성자). 읽기는 이벤트 루프에서 락 없이
+subscriptions = SubscriptionIndex() # 노선 ID -> 구독자(사용자 DM/채널) 역색인 (모니터링 대상 노선 = 구독자가 있는 노선)
+rule_book = RuleBook()              # 사용자 알림 규칙 (남은 좌석/좌석률 임계값, 빈 자리, 새 노선), 범위별 임계값 표로 컴파일됨
+monitor_seen = EMPTY_SCHEDULE       # 모니터링 잡이 마지막으로 평가한 스냅샷 (이후 발행된 변화 이벤트를 다음 실행 때 처리)
+watch_actor = WatchStateActor()
+
+# 모든 스냅샷을 누적 기록하는 좌석 이력 저장소 (재시작 시 마지막 스냅샷 복원에도 사용)와
+# 노선별 좌석 추세 예측기 (스냅샷마다 모든 노선을 한꺼번에 갱신). load_analytics()가 만들기 전에는 None
+# (예측기가 없으면 예측 문구 없이 알림/목록을 보냄)
+history_store = None
+seat_forecaster = None
+_analytics_lock = threading.Lock()
+
+# 봇 공지(시작/정기 업데이트)를 보내는 기본 채널
+SYSTEM_CHANNEL = channel_target(DISCORD_CHANNEL_ID)
+
+
+# --- 크롤러 지연 로딩 ---
+_crawler_module = None
+
+def crawler():
+    """
+    크롤러. CRAWLER_PROCESS면 크롤러 자식 프로세스 관리자(crawler_worker.CrawlerProcess), 아니면 login_crawler 모듈.
+    둘 다 같은 함수(get_bus_schedule, prewarm, close_webdriver, ...)를 제공함. 크롤러 스레드에서 호출할 것.
+    """
+    global _crawler_module
+    if _crawler_module is None:
+        with perf_metrics.timer("crawler_import"):
+            if CRAWLER_PROCESS:
+                from crawler_worker import CrawlerProcess
+                _crawler_module = CrawlerProcess(CRAWLER_TIMEOUT)
+            else:
+                import login_crawler # 수백 ms
+                _crawler_module = login_crawler
+    return _crawler_module
+
+
+def load_analytics():
+    """
+    (이벤트 루프 밖에서 호출) 좌석 이력 저장소와 예측기를 처음 한 번만 만들고 (history_store, seat_forecaster)를 반환.
+    사전 준비 작업에서 먼저 부르고, 그보다 크롤링/!history가 먼저 오면 그때 만듦.
+    """
+    global history_store, seat_forecaster
+    with _analytics_lock:
+        if history_store is None:
+            with perf_metrics.timer("analytics_import"):
+                from seat_history import SeatHistoryStore
+                from seat_forecast import SeatForecaster # NumPy
+                forecaster = SeatForecaster()
+                history_store = SeatHistoryStore(HISTORY_DB_PATH)
+            poll_policy.forecaster = forecaster
+            seat_forecaster = forecaster
+    return history_store, seat_forecaster
+
+
+def current_forecasts():
+    """예측기의 노선별 예측 (예측기를 아직 만들지 않았으면 빈 dict)."""
+    return seat_forecaster.forecast_all() if seat_forecaster is not None else {}
+
+
+def loaded_crawler():
+    """이미 준비된 크롤러 (아직이면 None). 이벤트 루프에서 상태만 볼 때 사용 (불러오느라 멈추지 않음)."""
+    return _crawler_module
 
-# 스레드 동기화를 위한 락
-data_lock = threading.Lock() # 데이터 접근을 위한 락 (크롤링 결과 및 모니터링 목록)
-webdriver_lock = threading.Lock() # WebDriver 인스턴스 접근을 위한 락 (login_crawler.py와 공유)
+
+def monitoring_active():
+    """(이벤트 루프에서 호출) 구독이나 알림 규칙이 하나라도 있으면 메인 모니터링 잡이 돌아야 함."""
+    return bool(subscriptions) or bool(rule_book)
+
+
+def watched_bus_ids(schedule):
+    """(이벤트 루프에서 호출) 구독 또는 규칙이 지켜보는 노선 ID."""
+    return set(subscriptions.bus_ids()) | rule_book.bus_ids(schedule)
+
+
+def start_watching():
+    """(감시 상태 작업 안에서) 첫 구독/규칙이 생길 때 호출: 그 전에 쌓인 변화 이벤트는 알림 대상이 아님."""
+    global monitor_seen
+    if not monitoring_active():
+        monitor_seen = snapshots.current
 
 
 # --- 디스코드 메시지 전송 함수 ---
-async def send_discord_message(channel_id, text_content):
+async def resolve_channel(channel_id):
     """
-    디스코드 채널에 메시지를 보냅니다.
+    채널 ID로 메시지를 보낼 채널을 찾습니다. (캐시에 없으면 fetch 시도, 찾지 못하면 None)
     """
-    try:
-        # 봇이 준비되지 않았으면 대기
+    # 봇이 준비되지 않았으면 대기
+    if not bot.is_ready():
+        logging.warning("봇이 아직 준비되지 않았습니다. 3초 대기 후 재시도...")
+        await asyncio.sleep(3)
         if not bot.is_ready():
-            logging.warning("봇이 아직 준비되지 않았습니다. 3초 대기 후 재시도...")
-            await asyncio.sleep(3)
-            if not bot.is_ready():
-                logging.error("봇이 준비되지 않아 메시지를 보낼 수 없습니다.")
-                return
+            logging.error("봇이 준비되지 않아 메시지를 보낼 수 없습니다.")
+            return None
 
-        channel = bot.get_channel(channel_id)
+    channel = bot.get_channel(channel_id)
+    if channel:
+        return channel
+    # 채널을 직접 fetch 시도
+    try:
+        channel = await bot.fetch_channel(channel_id)
         if channel:
-            logging.info(f"디스코드 메시지 전송 시도 (채널: {channel.name}, 내용: {text_content[:50]}...)")
-            await channel.send(text_content)
-            logging.info("디스코드 메시지 전송 성공!")
-        else:
-            # 채널을 직접 fetch 시도
-            try:
-                channel = await bot.fetch_channel(channel_id)
-                if channel:
-                    logging.info(f"fetch로 채널 찾음. 메시지 전송 시도 (채널: {channel.name})")
-                    await channel.send(text_content)
-                    logging.info("디스코드 메시지 전송 성공!")
-                else:
-                    logging.error(f"채널 ID ({channel_id})를 fetch할 수 없습니다.")
-            except Exception as fetch_error:
-                logging.error(f"채널 fetch 중 오류: {fetch_error}")
-                logging.error(f"지정된 채널 ID ({channel_id})를 찾을 수 없습니다. 봇이 해당 채널에 접근 권한이 있는지 확인하세요.")
-    except Exception as e:
-        logging.error(f"메시지 전송 중 오류 발생: {e}", exc_info=True)
+            logging.info(f"fetch로 채널 찾음 (채널: {channel.name})")
+            return channel
+        logging.error(f"채널 ID ({channel_id})를 fetch할 수 없습니다.")
+    except Exception as fetch_error:
+        logging.error(f"채널 fetch 중 오류: {fetch_error}")
+        logging.error(f"지정된 채널 ID ({channel_id})를 찾을 수 없습니다. 봇이 해당 채널에 접근 권한이 있는지 확인하세요.")
+    return None
+
+
+async def resolve_target(target):
+    """알림 대상(Target)을 메시지를 보낼 수 있는 객체로 변환. 사용자면 DM, 채널이면 채널 (찾지 못하면 None)."""
+    if target.kind != USER:
+        return await resolve_channel(target.id)
+    user = bot.get_user(target.id)
+    if user is None:
+        try:
+            user = await bot.fetch_user(target.id)
+        except Exception as fetch_error:
+            logging.error(f"사용자 ({target.id}) fetch 중 오류: {fetch_error}")
+            return None
+    return user # User.send()는 DM 채널을 만들어(캐시) 보냄
+
+
+# 좌석 변화 빈도/출발 시각/야간 여부에 따라 폴링 간격을 정하는 정책
+poll_policy = AdaptivePollPolicy() # 예측기는 load_analytics()에서 연결
+
+
+def monitor_poll_interval():
+    """메인 모니터링 잡의 다음 실행 간격 (모니터링 대상 노선 중 가장 급한 노선 기준)."""
+    schedule = snapshots.current
+    return poll_policy.next_interval(schedule, watched_bus_ids(schedule))
+
+
+def idle_update_interval():
+    """정기 전체 갱신 잡의 다음 실행 간격 (기본 1시간, 야간에는 더 길게)."""
+    return poll_policy.next_interval(snapshots.current, ())
+
+
+# 한 폴링 주기의 알림을 대상(DM/채널)별로 합쳐서 보내는 발송함 (동시 전송 수 제한, 전송 제한 시 재시도)
+outbox = NotificationOutbox(resolve_target, max_concurrency=ALERT_MAX_CONCURRENCY)
 
 
 # --- 버스 스케줄 초기 로드 및 갱신 함수 (단 한 번의 크롤링으로 모든 데이터 가져옴) ---
 def update_bus_schedules():
-    global current_bus_schedules, last_update_time
+    """(크롤러 전용 스레드에서 실행되므로 WebDriver 접근은 이미 직렬화됨) 크롤링 후 스냅샷을 발행. 성공 여부를 반환."""
     logging.info("버스 스케줄 데이터 갱신 시작...")
-    with webdriver_lock: # WebDriver 접근 시 락 사용
+    try:
+        new_routes = crawler().get_bus_schedule() # login_crawler(또는 크롤러 프로세스)에서 모든 버스 정보 가져옴
+        # 인덱스 생성과 비교는 발행 전에 한 번만 수행하고, 발행은 참조만 교체 (읽는 쪽은 기다리지 않음)
+        with perf_metrics.timer("snapshot_publish"):
+            while True: # 그 사이 다른 발행(재시작 때 스냅샷 복원)이 끼어들었으면 새 스냅샷 기준으로 다시 만듦
+                previous = snapshots.current
+                new_schedule = BusSchedule.from_dicts(new_routes, datetime.now(), previous.version + 1)
+                events = diff_schedules(previous if previous.version > 0 else None, new_schedule)
+                if snapshots.compare_and_publish(previous, new_schedule, events): # 모니터링 잡이 다음 실행 때 이벤트를 가져감
+                    break
+        logging.info(f"버스 스케줄 데이터 갱신 완료. ({len(new_schedule)}개 노선, 변화 {len(events)}건)")
+        store, forecaster = load_analytics()
         try:
-            new_schedules = get_bus_schedule() # login_crawler에서 모든 버스 정보 가져옴
-            with data_lock: # 데이터 갱신 시 락 사용
-                current_bus_schedules = new_schedules
-                last_update_time = datetime.now()
-            logging.info(f"버스 스케줄 데이터 갱신 완료. ({len(current_bus_schedules)}개 노선)")
-            return True # 성공
-        except Exception as e:
-            logging.error(f"버스 스케줄 데이터 갱신 중 오류 발생: {e}", exc_info=True)
-            # 오류 발생 시 WebDriver 닫기
-            try:
-                close_webdriver()
-            except Exception as ce:
-                logging.error(f"WebDriver 닫기 중 오류 발생: {ce}")
-            return False # 실패
+            store.append(new_schedule) # 좌석이 바뀐 노선만 기록됨
+        except Exception as history_error:
+            logging.error(f"좌석 이력 기록 중 오류 발생: {history_error}", exc_info=True)
+        forecaster.update(new_schedule)
+        return True # 성공
+    except Exception as e:
+        perf_metrics.increment("crawl_failures")
+        logging.error(f"버스 스케줄 데이터 갱신 중 오류 발생: {e}", exc_info=True)
+        # WebDriver는 닫지 않음: 다음 크롤링 때 세션 점검 후 필요하면 같은 브라우저에서 재로그인
+        return False # 실패
+
+
+async def refresh_schedules():
+    """크롤러 전용 스레드에서 update_bus_schedules()를 실행하고 결과를 기다림 (이벤트 루프는 막지 않음)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(crawler_executor, update_bus_schedules)
+
+
+# 모든 크롤링 요청은 이 캐시를 거침: 최근 스냅샷 재사용 + 동시 요청은 진행 중인 크롤링 하나에 합류
+schedule_cache = SnapshotCache(refresh_schedules, SNAPSHOT_MAX_AGE)
+
+
+def collect_monitor_alerts(schedule, events):
+    """(감시 상태 작업 안에서 호출) 구독 상태를 갱신하고 보낼 알림 목록 [(대상 튜플, 메시지, 로그)]을 반환."""
+    return collect_alerts(subscriptions, schedule, events, current_forecasts())
+
+
+def evaluate_watch_state():
+    """
+    (감시 상태 작업) 마지막으로 평가한 스냅샷 이후의 변화 이벤트로 구독/규칙 상태를 갱신하고 보낼 알림을 결정.
+    (알림 목록, 더 이상 모니터링할 것이 없는지)를 반환. 이벤트 기록보다 오래 밀렸으면 두 스냅샷을 직접 비교함.
+    """
+    global monitor_seen
+    schedule = snapshots.current
+    events, complete = snapshots.events_since(monitor_seen.version)
+    if not complete:
+        events = diff_schedules(monitor_seen if monitor_seen.version > 0 else None, schedule)
+    monitor_seen = schedule
+    alerts = collect_monitor_alerts(schedule, events)
+    alerts += collect_rule_alerts(rule_book, events) # 규칙은 컴파일된 임계값 표로 한 번에 평가
+    poll_policy.observe(events, watched_bus_ids(schedule))
+    return alerts, not monitoring_active()
+
+
+def drop_all_subscriptions():
+    """(감시 상태 작업) 갱신 실패 시 모든 구독을 해지. (안내할 대상, 규칙이 남아 있는지)를 반환."""
+    global monitor_seen
+    targets = list(subscriptions.targets())
+    subscriptions.clear()
+    monitor_seen = snapshots.current
+    return targets, bool(rule_book)
 
 
 # --- 모니터링 중인 모든 버스 좌석 모니터링 함수 (주기적으로 실행될 메인 잡) ---
-def monitor_all_monitored_buses_job():
+async def monitor_all_monitored_buses_job():
     """
     스케줄러에 의해 주기적으로 실행될 모니터링 작업 함수.
-    모니터링 대상인 모든 버스에 대해 좌석 현황을 확인하고 알림을 보냅니다.
+    크롤링 후 스냅샷 비교 이벤트로 모니터링 대상 버스의 알림을 보냅니다.
     """
-    global last_monitored_seats, current_bus_schedules, monitored_bus_ids
-
-    # 1. 최신 버스 스케줄 데이터 갱신 (단 한 번의 크롤링)
+    # 1. 최신 버스 스케줄 데이터 갱신 (다른 명령이 방금 크롤링했으면 그 스냅샷을 재사용)
     logging.info("모니터링을 위해 전체 버스 스케줄 데이터 갱신 시작...")
-    if not update_bus_schedules():
-        message = "버스 스케줄 갱신 중 오류가 발생하여 현재 모니터링을 정상적으로 수행할 수 없습니다."
-        future = asyncio.run_coroutine_threadsafe(
-            send_discord_message(DISCORD_CHANNEL_ID, message), 
-            bot.loop
-        )
-        try:
-            future.result(timeout=10)
-        except Exception as send_error:
-            logging.error(f"메시지 전송 실패: {send_error}")
+    if not await schedule_cache.get_fresh(MONITOR_SNAPSHOT_MAX_AGE):
         logging.error("전체 버스 스케줄 갱신 실패. 모니터링 작업 중단.")
-        
-        # 오류 시 모든 모니터링 중단 및 WebDriver 닫기
-        with data_lock:
-            monitored_bus_ids.clear()
-            last_monitored_seats.clear()
-        with webdriver_lock:
-            close_webdriver()
+
+        # 오류 시 모든 구독 중단 (WebDriver는 유휴 TTL이 지나면 자동으로 닫힘), 구독자 모두에게 한 번씩 안내
+        # 알림 규칙은 사용자가 지울 때까지 유지되므로, 규칙이 남아 있으면 잡도 남겨 다음 주기에 다시 시도
+        targets, keep_job = await watch_actor.call(drop_all_subscriptions)
+        for target in targets:
+            outbox.put(target, "버스 스케줄 갱신 중 오류가 발생하여 현재 모니터링을 정상적으로 수행할 수 없습니다. 다시 `!monitor`로 등록해주세요.")
+        outbox.dispatch()
         
         # 이 잡 자체를 제거하여 더 이상 실행되지 않도록 함
-        if scheduler.get_job('main_bus_monitor_job'):
+        if not keep_job and scheduler.get_job('main_bus_monitor_job'):
             scheduler.remove_job('main_bus_monitor_job')
             logging.info("메인 모니터링 잡 'main_bus_monitor_job' 제거 완료.")
         return
 
-    # 2. 모니터링 대상 버스들에 대한 알림 로직 처리
-    with data_lock: # current_bus_schedules 및 monitored_bus_ids, last_monitored_seats 접근 시 락 사용
-        buses_to_remove = set() # 모니터링을 중단할 버스 ID 목록
-        for bus_id_to_monitor in list(monitored_bus_ids): # Set을 iterate하면서 remove하면 오류 발생 가능 -> list로 변환 후 사용
-            monitored_bus_info = next((bus for bus in current_bus_schedules if bus['id'] == bus_id_to_monitor), None)
-
-            if monitored_bus_info:
-                current_seats = monitored_bus_info['current_seats']
-                total_seats = monitored_bus_info['total_seats']
-                prev_seats = last_monitored_seats.get(bus_id_to_monitor)
-
-                # 첫 실행 알림 (만석 상태 확인)
-                if prev_seats is None:
-                    if current_seats == total_seats:
-                        initial_message = f"✅ ID '{bus_id_to_monitor}'번 노선이 현재 만석({current_seats}/{total_seats})입니다!\n" \
-                                          f"노선: {monitored_bus_info['bus_route_detail']}"
-                        future = asyncio.run_coroutine_threadsafe(
-                            send_discord_message(DISCORD_CHANNEL_ID, initial_message), 
-                            bot.loop
-                        )
-                        try:
-                            future.result(timeout=10)
-                            logging.info(f"ID '{bus_id_to_monitor}' 첫 모니터링 알림 전송 (만석): {current_seats}/{total_seats}")
-                        except Exception as send_error:
-                            logging.error(f"첫 모니터링 알림 전송 실패: {send_error}")
-                        # 만석이면 계속 모니터링
-                        last_monitored_seats[bus_id_to_monitor] = current_seats
-                    else:
-                        initial_message = f"ID '{bus_id_to_monitor}'번 노선은 현재 만석이 아닙니다. " \
-                                          f"현재 좌석: {current_seats}/{total_seats}\n" \
-                                          f"만석({total_seats}/{total_seats})이 되면 알림을 보내드릴게요."
-                        future = asyncio.run_coroutine_threadsafe(
-                            send_discord_message(DISCORD_CHANNEL_ID, initial_message), 
-                            bot.loop
-                        )
-                        try:
-                            future.result(timeout=10)
-                            logging.info(f"ID '{bus_id_to_monitor}' 첫 모니터링 알림 전송 (만석 아님): {current_seats}/{total_seats}")
-                        except Exception as send_error:
-                            logging.error(f"첫 모니터링 알림 전송 실패: {send_error}")
-                        buses_to_remove.add(bus_id_to_monitor) # 만석이 아니므로 모니터링 중단 요청
-                
-                # 만석 (total_seats/total_seats)일 때 알림 로직
-                elif current_seats == total_seats:
-                    if prev_seats is not None and prev_seats != total_seats: # 만석 상태가 새로 감지되었을 때
-                        message = f"✅ ID '{bus_id_to_monitor}'번 노선이 만석({current_seats}/{total_seats})이 되었습니다!\n" \
-                                  f"노선: {monitored_bus_info['bus_route_detail']}\n" \
-                                  f"예약 페이지: <https://kit.kumoh.ac.kr/jsp/administration/bus/bus_reservation.jsp>"
-                        future = asyncio.run_coroutine_threadsafe(
-                            send_discord_message(DISCORD_CHANNEL_ID, message), 
-                            bot.loop
-                        )
-                        try:
-                            future.result(timeout=10)
-                            logging.info(f"ID '{bus_id_to_monitor}' 만석 알림 전송: {current_seats}/{total_seats}")
-                        except Exception as send_error:
-                            logging.error(f"만석 알림 전송 실패: {send_error}")
-                    else:
-                        logging.info(f"ID '{bus_id_to_monitor}' 계속 만석 유지 중: {current_seats}/{total_seats}")
-                    last_monitored_seats[bus_id_to_monitor] = current_seats # 현재 좌석 상태 저장
-                else: # 만석이 아닐 때 (prev_seats == total_seats 였을 경우)
-                    if prev_seats == total_seats: 
-                        message = f"🚌 ID '{bus_id_to_monitor}'번 노선이 만석이 아니게 되었습니다. " \
-                                  f"현재 좌석: {current_seats}/{total_seats}\n" \
-                                  f"노선: {monitored_bus_info['bus_route_detail']}"
-                        future = asyncio.run_coroutine_threadsafe(
-                            send_discord_message(DISCORD_CHANNEL_ID, message), 
-                            bot.loop
-                        )
-                        try:
-                            future.result(timeout=10)
-                            logging.info(f"ID '{bus_id_to_monitor}' 만석 아님으로 변경 알림 전송: {current_seats}/{total_seats}")
-                        except Exception as send_error:
-                            logging.error(f"만석 아님 알림 전송 실패: {send_error}")
-                    else:
-                        logging.info(f"ID '{bus_id_to_monitor}' 계속 만석 아님 유지 중: {current_seats}/{total_seats}. 추가 알림 없음.")
-                    buses_to_remove.add(bus_id_to_monitor) # 만석이 아니므로 모니터링 중단 요청
-            else:
-                # 버스 정보를 찾을 수 없는 경우
-                message = f"ID '{bus_id_to_monitor}' 노선을 찾을 수 없습니다. 모니터링을 중단합니다."
-                future = asyncio.run_coroutine_threadsafe(
-                    send_discord_message(DISCORD_CHANNEL_ID, message), 
-                    bot.loop
-                )
-                try:
-                    future.result(timeout=10)
-                except Exception as send_error:
-                    logging.error(f"노선 없음 알림 전송 실패: {send_error}")
-                logging.warning(f"ID '{bus_id_to_monitor}' 노선을 찾을 수 없음. 모니터링 중단.")
-                buses_to_remove.add(bus_id_to_monitor) # 해당 버스 ID 제거 요청
-        
-        # 모니터링 중단 요청된 버스들을 실제로 제거
-        for bus_id in buses_to_remove:
-            monitored_bus_ids.discard(bus_id)
-            if bus_id in last_monitored_seats:
-                del last_monitored_seats[bus_id]
-            logging.info(f"ID '{bus_id}' 모니터링 중단 처리 완료.")
-
-    # 3. 모든 모니터링이 중단되면 WebDriver 닫기
-    if not monitored_bus_ids:
-        logging.info("모니터링 중인 버스가 없어 WebDriver를 닫습니다.")
-        with webdriver_lock:
-            close_webdriver()
-        # 모든 모니터링이 끝나면 메인 잡도 제거
+    # 2. 지난 실행 이후 발행된 변화 이벤트로 알림 결정 (상태 갱신은 감시 상태 작성자가, 전송은 그 뒤에)
+    alerts, no_more_monitoring = await watch_actor.call(evaluate_watch_state)
+
+    # 이번 주기의 알림을 대상별로 합쳐 최소한의 메시지로 전송
+    # 전송은 백그라운드에서 동시 전송 수를 제한해 진행되므로, 구독자가 많아도 폴링 주기는 늦어지지 않음
+    for targets, message, log_text in alerts:
+        for target in targets:
+            outbox.put(target, message)
+        logging.info(log_text)
+    outbox.dispatch()
+
+    # 3. 모든 모니터링이 중단되면 메인 잡 제거 (WebDriver는 유휴 TTL 동안 유지되어 다음 !monitor/정기 갱신에서 재사용)
+    if no_more_monitoring:
+        logging.info("모니터링 중인 버스가 없어 메인 모니터링 잡을 중단합니다.")
         if scheduler.get_job('main_bus_monitor_job'):
             scheduler.remove_job('main_bus_monitor_job')
             logging.info("메인 모니터링 잡 'main_bus_monitor_job' 제거 완료 (모든 버스 중단).")
 
 
-# --- 정기 업데이트 함수 (모니터링 중인 버스가 없을 때만 전체 스케줄 갱신) ---
-def scheduled_hourly_update():
-    global monitored_bus_ids
-    with data_lock: # monitored_bus_ids 접근 시 락 사용
-        if not monitored_bus_ids: # 모니터링 중인 버스가 없을 때만 실행
-            logging.info("모니터링 중인 버스가 없어 1시간 주기 전체 버스 스케줄 갱신을 실행합니다.")
-            
-            if not update_bus_schedules():
-                logging.error("1시간 주기 버스 스케줄 갱신 실패.")
-            else:
-                future = asyncio.run_coroutine_threadsafe(
-                    send_discord_message(DISCORD_CHANNEL_ID, "⏰ 정기 업데이트: 버스 노선 정보가 갱신되었습니다. `!list`로 확인하세요."),
-                    bot.loop
-                )
-                try:
-                    future.result(timeout=10)
-                except Exception as send_error:
-                    logging.error(f"정기 업데이트 알림 전송 실패: {send_error}")
-        else:
-            logging.info("모니터링 중인 버스가 있어 1시간 주기 전체 버스 스케줄 갱신을 건너뜁니다 (메인 모니터링 잡이 이미 갱신).")
+# --- 정기 업데이트 함수 (모니터링 중인 버스가 없을 때만 전체 스케줄 갱신, 기본 1시간 주기이며 야간에는 더 길게) ---
+async def scheduled_hourly_update():
+    if monitoring_active():
+        logging.info("모니터링 중인 버스가 있어 1시간 주기 전체 버스 스케줄 갱신을 건너뜁니다 (메인 모니터링 잡이 이미 갱신).")
+        return
+
+    logging.info("모니터링 중인 버스가 없어 1시간 주기 전체 버스 스케줄 갱신을 실행합니다.")
+    if not await schedule_cache.get_fresh():
+        logging.error("1시간 주기 버스 스케줄 갱신 실패.")
+    else:
+        outbox.put(SYSTEM_CHANNEL, "⏰ 정기 업데이트: 버스 노선 정보가 갱신되었습니다. `!list`로 확인하세요.")
+        await outbox.flush()
+
+
+# --- 봇 시작 직후 사전 준비 (마지막 스냅샷 복원 + 크롤러 로드/로그인) ---
+prewarm_task = None
+
+def prewarm_crawler():
+    """(크롤러 스레드에서 실행) 크롤러 모듈을 불러오고, 이전 실행이 남긴 브라우저를 정리한 뒤 미리 로그인해 둠."""
+    module = crawler()
+    module.reap_orphaned_browsers()
+    return module.prewarm()
+
+
+async def prewarm():
+    """
+    재시작 후 첫 명령이 크롤링/로그인을 기다리지 않도록 백그라운드에서 준비.
+    1) 좌석 이력 DB의 마지막 스냅샷을 복원해 바로 !list에 답할 수 있게 하고,
+    2) 크롤러를 불러와 로그인해 둔 뒤, 3) 복원한 스냅샷을 백그라운드 크롤링으로 최신화.
+    """
+    started = time.perf_counter()
+    startup_stats["prewarm_state"] = "진행 중"
+    loop = asyncio.get_running_loop()
+
+    store, _ = await loop.run_in_executor(None, load_analytics)
+    empty = snapshots.current
+    if not empty:
+        with perf_metrics.timer("snapshot_hydrate"):
+            restored = await loop.run_in_executor(None, store.load_latest)
+        # 그 사이 크롤링이 끝났으면 (비교 후 교체 실패) 그 스냅샷을 유지
+        if restored and snapshots.compare_and_publish(empty, restored):
+            logging.info(f"마지막 스냅샷 복원: {len(restored)}개 노선 (v{restored.version})")
+
+    try:
+        backend = await loop.run_in_executor(crawler_executor, prewarm_crawler)
+        startup_stats["prewarm_state"] = f"완료 ({backend})"
+    except Exception as e:
+        startup_stats["prewarm_state"] = "실패 (첫 크롤링 때 다시 로그인)"
+        logging.error(f"크롤러 사전 준비 중 오류 발생: {e}", exc_info=True)
+    startup_stats["prewarm"] = time.perf_counter() - started
+    perf_metrics.observe("startup_prewarm", startup_stats["prewarm"])
+    logging.info(f"사전 준비 {startup_stats['prewarm_state']}: {startup_stats['prewarm']:.1f}초")
+    schedule_cache.revalidate() # 복원한 스냅샷이 오래됐으면 (이미 로그인된 세션으로) 백그라운드 크롤링
+
+
+# --- 로컬 읽기 API (스냅샷/변화 이벤트를 다른 로컬 도구에 제공, 선택) ---
+read_api = None
+
+async def start_read_api():
+    """읽기 API를 한 번만 시작 (READ_API_PORT가 0이면 켜지 않음)."""
+    global read_api
+    if not READ_API_PORT or read_api is not None:
+        return
+    from read_api import ReadApi
+    api = ReadApi(snapshots, READ_API_PORT)
+    try:
+        await api.start()
+    except OSError as e:
+        logging.error(f"읽기 API 시작 실패 (포트 {READ_API_PORT}): {e}")
+        return
+    read_api = api
+
+
+def start_prewarm():
+    """사전 준비 작업을 한 번만 시작 (on_ready는 재연결 때마다 호출될 수 있음)."""
+    global prewarm_task
+    if prewarm_task is None:
+        prewarm_task = asyncio.get_running_loop().create_task(prewarm(), name="prewarm")
+    return prewarm_task
 
 
 # --- 디스코드 봇 이벤트 핸들러 ---
 @bot.event
 async def on_ready():
+    if startup_stats["ready"] is None:
+        startup_stats["ready"] = time.perf_counter() - _module_started
+        logging.info(f"시작부터 디스코드 연결까지 {startup_stats['ready']:.2f}초 (모듈 로드 {startup_stats['import'] * 1000:.0f}ms)")
+    start_prewarm()
+    await start_read_api()
     logging.info(f'Logged in as {bot.user} (ID: {bot.user.id})')
     logging.info(f'설정된 채널 ID: {DISCORD_CHANNEL_ID}')
     
@@ -286,12 +425,25 @@ async def on_ready():
 
     logging.info(f'봇이 연결되었습니다! 디스코드에서 `!help` 명령어를 사용해보세요.')
     
-    if not scheduler.running:
+    if not scheduler.running: # on_ready는 재연결 때마다 다시 호출될 수 있음
         scheduler.start()
-        logging.info("APScheduler 시작됨.")
-        # 1시간 주기 전체 버스 스케줄 갱신 작업 추가 (모니터링 중인 버스가 없을 때만 동작)
-        scheduler.add_job(scheduled_hourly_update, 'interval', hours=1, id='hourly_full_update')
-        logging.info("1시간 주기 전체 버스 스케줄 갱신 작업이 추가되었습니다.")
+        logging.info("비동기 스케줄러 시작됨.")
+        # 정기(기본 1시간, 야간 2시간) 전체 버스 스케줄 갱신 작업 추가 (모니터링 중인 버스가 없을 때만 동작)
+        scheduler.add_job(scheduled_hourly_update, idle_update_interval, id='hourly_full_update')
+        logging.info("정기 전체 버스 스케줄 갱신 작업이 추가되었습니다.")
+
+
+@bot.before_invoke
+async def mark_command_start(ctx):
+    ctx.kba_started = time.perf_counter()
+
+
+@bot.event
+async def on_command_completion(ctx):
+    if startup_stats["first_command"] is None and hasattr(ctx, "kba_started"):
+        startup_stats["first_command"] = time.perf_counter() - ctx.kba_started
+        perf_metrics.observe("startup_first_command", startup_stats["first_command"])
+        logging.info(f"재시작 후 첫 명령(!{ctx.command.qualified_name}) 처리 {startup_stats['first_command'] * 1000:.0f}ms")
 
 
 # --- 디스코드 봇 명령어 ---
@@ -299,215 +451,444 @@ async def on_ready():
 async def load_buses(ctx):
     await ctx.send("버스 조회 프로그램을 실행합니다. 잠시 기다려주세요...")
 
-    def run_initial_crawl_thread_discord():
-        logging.info("초기 크롤링 스레드 시작...")
-        if update_bus_schedules(): # 여기서 한 번만 전체 크롤링
-            asyncio.run_coroutine_threadsafe(
-                ctx.send(f"로그인 및 초기 버스 노선 조회에 성공했습니다. ({len(current_bus_schedules)}개 노선 로드)\n`!list`를 입력하여 노선 리스트를 확인하세요."),
-                bot.loop
-            )
-        else:
-            asyncio.run_coroutine_threadsafe(
-                ctx.send("로그인 및 초기 버스 노선 조회에 실패했거나, 노선 정보가 없습니다."),
-                bot.loop
-            )
-        logging.info("초기 크롤링 스레드 완료.")
-
-    threading.Thread(target=run_initial_crawl_thread_discord, daemon=True).start()
-
-
-@bot.command(name='list', help='현재 로드된 버스 노선 리스트를 표시합니다.')
-async def list_buses(ctx):
-    # 가장 최신 데이터를 보여주기 위해 !list 명령 시에도 한 번 갱신 시도
-    await ctx.send("버스 노선 정보를 갱신 중입니다. 잠시만 기다려주세요...")
-    update_success = False
-    def run_update_in_thread():
-        nonlocal update_success
-        update_success = update_bus_schedules() # 여기서 한 번만 전체 크롤링
-    
-    thread = threading.Thread(target=run_update_in_thread, daemon=True)
-    thread.start()
-    thread.join(timeout=30) # 갱신이 완료될 때까지 최대 30초 대기
-
-    if not update_success:
-        await ctx.send("버스 노선 정보 갱신에 실패했거나 시간이 초과되었습니다. 현재 캐시된 정보를 표시합니다.")
-        if not current_bus_schedules:
+    logging.info("초기 크롤링 시작...")
+    if await schedule_cache.refresh(): # 여기서 한 번만 전체 크롤링 (진행 중인 크롤링이 있으면 합류)
+        await ctx.send(f"로그인 및 초기 버스 노선 조회에 성공했습니다. ({len(snapshots.current)}개 노선 로드)\n`!list`를 입력하여 노선 리스트를 확인하세요.")
+    else:
+        await ctx.send("로그인 및 초기 버스 노선 조회에 실패했거나, 노선 정보가 없습니다.")
+    logging.info("초기 크롤링 완료.")
+
+
+# --- !list 페이지 (스냅샷 버전 + 필터별로 한 번만 만들고, 메시지 하나에서 버튼으로 넘김) ---
+LIST_VIEW_TIMEOUT = 300 # 이 시간(초) 동안 버튼을 누르지 않으면 버튼을 비활성화
+
+
+def build_route_pages(routes, fetched_at, keyword):
+    """노선 목록 -> 페이지 임베드 리스트 (RoutePageCache가 스냅샷/필터마다 한 번만 호출)."""
+    title = f"🚌 현재 버스 노선 리스트 ({keyword})" if keyword else "🚌 현재 버스 노선 리스트"
+    updated = f" · 최종 갱신: {fetched_at.strftime('%Y-%m-%d %H:%M:%S')}" if fetched_at else ""
+    pages = paginate_routes(routes)
+    embeds = []
+    for number, page in enumerate(pages, 1):
+        embed = discord.Embed(title=title, description=page, color=discord.Color.blue())
+        embed.set_footer(text=f"{number}/{len(pages)} 페이지 · 노선 {len(routes)}개{updated}")
+        embeds.append(embed)
+    return embeds
+
+route_pages = RoutePageCache(build_route_pages)
+
+
+class RouteListView(discord.ui.View):
+    """!list 페이지 넘김 버튼. 명령을 입력한 사용자만 넘길 수 있고, 넘길 때는 같은 메시지를 수정함."""
+
+    def __init__(self, pages, author_id):
+        super().__init__(timeout=LIST_VIEW_TIMEOUT)
+        self.pages = pages
+        self.author_id = author_id
+        self.index = 0
+        self.message = None
+        self._update_buttons()
+
+    def _update_buttons(self):
+        self.previous_page.disabled = self.index == 0
+        self.next_page.disabled = self.index == len(self.pages) - 1
+
+    async def interaction_check(self, interaction):
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("`!list`를 직접 입력하면 원하는 페이지를 볼 수 있습니다.", ephemeral=True)
+            return False
+        return True
+
+    async def _show(self, interaction, index):
+        self.index = index
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.pages[index], view=self)
+
+    @discord.ui.button(label="◀ 이전", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction, button):
+        await self._show(interaction, max(self.index - 1, 0))
+
+    @discord.ui.button(label="다음 ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction, button):
+        await self._show(interaction, min(self.index + 1, len(self.pages) - 1))
+
+    async def on_timeout(self):
+        if self.message is None:
+            return
+        for item in self.children:
+            item.disabled = True
+        try:
+            await self.message.edit(view=self)
+        except discord.HTTPException:
+            pass # 메시지가 지워졌으면 무시
+
+
+@bot.command(name='list', help='현재 로드된 버스 노선 리스트를 표시합니다. 지역/버스 종류로 거를 수 있습니다. 예: `!list` 또는 `!list 구미`')
+async def list_buses(ctx, keyword: str = None):
+    revalidating = False
+    if snapshots.current:
+        # 스냅샷이 있으면 바로 응답하고, 오래된 경우에만 백그라운드에서 다시 크롤링
+        revalidating = not schedule_cache.revalidate()
+    else:
+        await ctx.send("버스 노선 정보를 불러오는 중입니다. 잠시만 기다려주세요...")
+        try:
+            # 갱신이 완료될 때까지 최대 30초 대기 (기다리는 동안에도 이벤트 루프는 다른 일을 처리)
+            update_success = await asyncio.wait_for(schedule_cache.refresh(), timeout=30)
+        except asyncio.TimeoutError:
+            update_success = False
+        if not update_success or not snapshots.current:
             await ctx.send("현재 로드된 버스 노선 정보가 없습니다. `!load`를 입력하여 먼저 프로그램을 실행해주세요.")
             return
 
-    with data_lock: # current_bus_schedules 접근 시 락 사용
-        if current_bus_schedules:
-            header = "🚌 현재 버스 노선 리스트:\n"
-            if last_update_time:
-                header += f"최종 갱신: {last_update_time.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-            else:
-                header += "\n"
-
-            bus_list_parts = []
-            current_part = header
-
-            for bus in current_bus_schedules:
-                bus_info = (
-                    f"[{bus['id']}] {bus['bus_type']} - {bus['bus_number']} ({bus['bus_vehicle']})\n"
-                    f"  지역: {bus['bus_region']}\n"
-                    f"  노선: {bus['bus_route_detail']}\n"
-                    f"  좌석: {bus['current_seats']}/{bus['total_seats']}\n"
-                    f"--------------------\n"
-                )
-
-                if len(current_part) + len(bus_info) > 1990:
-                    bus_list_parts.append(current_part)
-                    current_part = "🚌 버스 노선 리스트 (계속):\n"
-                    if last_update_time:
-                        current_part += f"최종 갱신: {last_update_time.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-                    else:
-                        current_part += "\n"
-
-                current_part += bus_info
-
-            if current_part.strip() != header.strip():
-                bus_list_parts.append(current_part)
-            elif not bus_list_parts and current_bus_schedules:
-                bus_list_parts.append(current_part)
-
-            for part in bus_list_parts:
-                await ctx.send(part)
-                await asyncio.sleep(0.5)
-
+    schedule = snapshots.current # 참조만 가져옴 (스냅샷은 변경 불가이므로 락 불필요)
+    if schedule:
+        pages = route_pages.get(schedule, keyword) # 같은 스냅샷/필터면 만들어 둔 페이지를 그대로 씀
+        if not pages:
+            await ctx.send(f"'{keyword}'에 해당하는 지역/버스 종류의 노선이 없습니다.")
+            return
+        notice = "(최신 정보로 갱신 중입니다. 잠시 후 다시 `!list`를 입력하면 반영됩니다.)" if revalidating else None
+        if len(pages) == 1:
+            await ctx.send(notice, embed=pages[0])
         else:
-            await ctx.send("현재 로드된 버스 노선 정보가 없습니다. `!load`를 입력하여 먼저 프로그램을 실행해주세요.")
+            view = RouteListView(pages, ctx.author.id)
+            view.message = await ctx.send(notice, embed=pages[0], view=view)
+
+    else:
+        await ctx.send("현재 로드된 버스 노선 정보가 없습니다. `!load`를 입력하여 먼저 프로그램을 실행해주세요.")
+
+
+def split_target(ctx, args):
+    """명령 인자 맨 앞이 'here'면 현재 채널, 아니면 명령을 보낸 사용자(DM)를 알림 대상으로. (대상, 나머지 인자)를 반환."""
+    if args and args[0].lower() == 'here' and ctx.guild is not None:
+        return channel_target(ctx.channel.id), args[1:]
+    if args and args[0].lower() == 'here':
+        args = args[1:] # DM에서의 here는 본인 구독과 같음
+    return user_target(ctx.author.id), args
+
 
+def describe_target(target):
+    return "이 채널" if target.kind != USER else "DM"
 
-@bot.command(name='monitor', help='만석 알림을 받을 버스 번호(ID)를 설정합니다. 여러 버스를 모니터링할 수 있습니다. 예: `!monitor 5` 또는 `!monitor 5 12`')
-async def monitor_bus(ctx, *bus_ids: str): # 여러 인자를 받을 수 있도록 변경
-    global monitored_bus_ids
+
+@bot.command(name='monitor', help='만석 알림을 받을 버스 번호(ID)를 구독합니다. 알림은 DM으로 오며, `here`를 붙이면 이 채널로 옵니다. 예: `!monitor 5 12` 또는 `!monitor here 5`')
+async def monitor_bus(ctx, *args: str): # 여러 인자를 받을 수 있도록 변경
+    target, bus_ids = split_target(ctx, args)
 
     if not bus_ids:
-        await ctx.send("모니터링할 버스 ID를 입력해주세요. 예: `!monitor 5` 또는 `!monitor 5 12`")
+        await ctx.send("모니터링할 버스 ID를 입력해주세요. 예: `!monitor 5` 또는 `!monitor here 5 12`")
         return
 
-    if not current_bus_schedules:
+    if not snapshots.current:
         await ctx.send("버스 노선 정보가 로드되지 않았습니다. 먼저 `!load` 명령어를 실행해주세요.")
         return
 
-    added_count = 0
-    not_found_ids = []
-
-    with data_lock: # monitored_bus_ids 접근 시 락 사용
+    def subscribe(): # 감시 상태 작성자에서 실행
+        added, already, not_found_ids = [], [], []
+        start_watching()
+        schedule = snapshots.current
         for bus_id in bus_ids:
-            found_bus = next((bus for bus in current_bus_schedules if bus['id'] == bus_id), None)
-
-            if found_bus:
-                if bus_id not in monitored_bus_ids:
-                    monitored_bus_ids.add(bus_id)
-                    added_count += 1
-                    # 첫 알림을 위해 last_monitored_seats 초기화
-                    last_monitored_seats[bus_id] = None # 초기 상태를 None으로 설정하여 첫 크롤링 시 알림 트리거
-                    await ctx.send(f"ID '{bus_id}'번 노선 만석 알림 모니터링 목록에 추가했습니다. 첫 좌석 현황을 확인 중...")
-                else:
-                    await ctx.send(f"ID '{bus_id}'번 노선은 이미 모니터링 중입니다.")
-            else:
+            if bus_id not in schedule:
                 not_found_ids.append(bus_id)
-    
+            elif subscriptions.subscribe(target, bus_id): # 새 구독자는 다음 모니터링 주기에 첫 좌석 확인 알림을 받음
+                added.append(bus_id)
+            else:
+                already.append(bus_id)
+        return added, already, not_found_ids
+
+    added, already, not_found_ids = await watch_actor.call(subscribe)
+
+    # 응답은 상태를 바꾼 뒤 한 메시지로
+    replies = []
+    if added:
+        replies.append(f"ID {', '.join(added)}번 노선 만석 알림을 구독했습니다 ({describe_target(target)}로 알림). 첫 좌석 현황을 확인 중...")
+    if already:
+        replies.append(f"ID {', '.join(already)}번 노선은 이미 구독 중입니다.")
     if not_found_ids:
-        await ctx.send(f"입력하신 ID {', '.join(not_found_ids)}는 존재하지 않습니다. `!list`를 입력하여 노선 리스트를 확인해주세요.")
-    
-    if added_count > 0:
-        await ctx.send(f"총 {added_count}개의 버스 노선 모니터링을 시작했습니다.")
-        # 메인 모니터링 잡이 없으면 추가
-        if not scheduler.get_job('main_bus_monitor_job'):
-            scheduler.add_job(monitor_all_monitored_buses_job, 'interval', minutes=1, id='main_bus_monitor_job')
-            logging.info("메인 모니터링 잡 'main_bus_monitor_job' 시작됨.")
-            # 잡이 추가된 직후 바로 한 번 실행하여 초기 상태 확인
-            def run_initial_monitor_thread():
-                logging.info("메인 모니터링 잡 초기 실행 스레드 시작...")
-                monitor_all_monitored_buses_job()
-                logging.info("메인 모니터링 잡 초기 실행 스레드 완료.")
-            threading.Thread(target=run_initial_monitor_thread, daemon=True).start()
-
-
-@bot.command(name='stop', help='버스 노선 모니터링을 중지합니다. 예: `!stop 5` (5번 버스 중지), `!stop all` (모든 버스 중지)')
-async def stop_monitoring(ctx, bus_id_or_all: str = None):
-    global monitored_bus_ids, last_monitored_seats
-
-    if bus_id_or_all is None:
-        await ctx.send("어떤 버스 모니터링을 중지할지 지정해주세요. 예: `!stop 5` (5번 버스 중지), `!stop all` (모든 버스 중지)")
+        replies.append(f"입력하신 ID {', '.join(not_found_ids)}는 존재하지 않습니다. `!list`를 입력하여 노선 리스트를 확인해주세요.")
+    await ctx.send("\n".join(replies))
+
+    if added:
+        ensure_monitor_job()
+
+
+def ensure_monitor_job():
+    """메인 모니터링 잡이 없으면 추가하고, 추가 직후 바로 한 번 실행하여 초기 상태 확인."""
+    if not scheduler.get_job('main_bus_monitor_job'):
+        scheduler.add_job(monitor_all_monitored_buses_job, monitor_poll_interval, id='main_bus_monitor_job', run_now=True)
+        logging.info("메인 모니터링 잡 'main_bus_monitor_job' 시작됨.")
+
+
+def stop_monitor_job_if_idle():
+    """구독도 규칙도 없으면 메인 모니터링 잡 중단 (WebDriver는 유휴 TTL이 지나면 자동으로 닫힘)."""
+    if monitoring_active():
         return
+    logging.info("모든 모니터링이 중단되어 메인 모니터링 잡을 중단합니다.")
+    if scheduler.get_job('main_bus_monitor_job'):
+        scheduler.remove_job('main_bus_monitor_job')
+        logging.info("메인 모니터링 잡 'main_bus_monitor_job' 제거 완료.")
 
-    stopped_count = 0
-    with data_lock: # monitored_bus_ids, last_monitored_seats 접근 시 락 사용
+
+@bot.command(name='stop', help='버스 노선 구독을 해지합니다. 본인 구독만 해지되며, `here`를 붙이면 이 채널 구독을 해지합니다. 예: `!stop 5`, `!stop all`, `!stop here all`')
+async def stop_monitoring(ctx, *args: str):
+    target, rest = split_target(ctx, args)
+    if not rest:
+        await ctx.send("어떤 버스 모니터링을 중지할지 지정해주세요. 예: `!stop 5` (5번 버스 중지), `!stop all` (내 구독 모두 중지)")
+        return
+    bus_id_or_all = rest[0]
+
+    def unsubscribe(): # 감시 상태 작성자에서 실행
         if bus_id_or_all.lower() == 'all':
-            current_monitored = list(monitored_bus_ids) # Set을 iterate하면서 remove하면 오류 발생 가능 -> list로 변환 후 사용
-            for bus_id in current_monitored:
-                monitored_bus_ids.discard(bus_id)
-                if bus_id in last_monitored_seats:
-                    del last_monitored_seats[bus_id]
-                stopped_count += 1
-            
-            if stopped_count > 0:
-                await ctx.send(f"모든 ({stopped_count}개) 버스 노선 모니터링을 중지했습니다.")
-            else:
-                await ctx.send("현재 모니터링 중인 버스 노선이 없습니다.")
-        else:
-            bus_id = bus_id_or_all
-            if bus_id in monitored_bus_ids:
-                monitored_bus_ids.discard(bus_id)
-                if bus_id in last_monitored_seats:
-                    del last_monitored_seats[bus_id]
-                stopped_count += 1
-                await ctx.send(f"ID '{bus_id}'번 버스 노선 모니터링을 중지했습니다.")
-            else:
-                await ctx.send(f"ID '{bus_id}'번 버스 노선은 현재 모니터링 중이 아닙니다.")
-    
-    # 모든 모니터링이 중단되면 WebDriver도 닫고 메인 모니터링 잡도 중단
-    if not monitored_bus_ids:
-        logging.info("모든 모니터링이 중단되어 WebDriver를 닫고 메인 모니터링 잡을 중단합니다.")
-        with webdriver_lock:
-            close_webdriver()
-        if scheduler.get_job('main_bus_monitor_job'):
-            scheduler.remove_job('main_bus_monitor_job')
-            logging.info("메인 모니터링 잡 'main_bus_monitor_job' 제거 완료.")
+            stopped = subscriptions.unsubscribe_all(target) # 이 대상의 구독만 해지 (다른 사용자의 구독은 그대로)
+            if stopped:
+                return f"{describe_target(target)} 구독 {len(stopped)}개({', '.join(stopped)})를 모두 해지했습니다."
+            return f"{describe_target(target)}로 구독 중인 버스 노선이 없습니다."
+        bus_id = bus_id_or_all
+        if subscriptions.unsubscribe(target, bus_id):
+            return f"ID '{bus_id}'번 버스 노선 구독을 해지했습니다."
+        return f"ID '{bus_id}'번 버스 노선은 {describe_target(target)}로 구독 중이 아닙니다."
 
+    await ctx.send(await watch_actor.call(unsubscribe))
+    stop_monitor_job_if_idle() # 구독도 규칙도 남지 않았으면 메인 모니터링 잡 중단
 
-@bot.command(name='monitoring_list', help='현재 모니터링 중인 버스 노선 리스트를 표시합니다.')
+
+@bot.command(name='monitoring_list', help='내(와 이 채널)가 구독 중인 버스 노선 리스트를 표시합니다.')
 async def monitoring_list(ctx):
-    with data_lock: # monitored_bus_ids, current_bus_schedules 접근 시 락 사용
-        if monitored_bus_ids:
-            msg = "👀 **현재 모니터링 중인 버스 노선 ID:**\n"
-            
-            # 최신 버스 노선 정보로 current_bus_schedules를 갱신 (선택 사항이지만 최신 정보를 보여주는 것이 좋음)
-            # 이 부분은 monitor_all_monitored_buses_job이 주기적으로 갱신하므로, 
-            # 여기서는 캐시된 current_bus_schedules를 사용해도 무방
-            # 만약 정말 즉각적인 최신 정보가 필요하면 여기서도 update_bus_schedules()를 호출할 수 있음.
-            # 하지만 잦은 호출은 부하가 될 수 있으므로, 현재 캐시된 정보 사용을 우선 고려.
-            # (현재 코드는 !list처럼 별도 스레드에서 업데이트를 시도하는 방식)
-
-            for bus_id in sorted(list(monitored_bus_ids)):
-                bus_info = next((bus for bus in current_bus_schedules if bus['id'] == bus_id), None)
+    targets = [user_target(ctx.author.id)]
+    if ctx.guild is not None:
+        targets.append(channel_target(ctx.channel.id))
+    # 이벤트 루프에서 한 번에 읽으므로 (중간에 await 없음) 감시 상태 작성자와 겹치지 않음
+    watched = [(target, subscriptions.subscriptions_of(target)) for target in targets]
+    schedule = snapshots.current
+    total_buses = len(subscriptions.bus_ids())
+
+    if any(bus_ids for _, bus_ids in watched):
+        msg = "👀 **현재 구독 중인 버스 노선 ID:**\n"
+        # 모니터링 잡이 주기적으로 갱신하므로 여기서는 캐시된 스냅샷을 사용
+        forecasts = current_forecasts()
+        if forecasts: # 예측이 있으면 예측기(seat_forecast)는 이미 불러온 상태
+            from seat_forecast import describe_forecast
+        for target, bus_ids in watched:
+            if not bus_ids:
+                continue
+            msg += f"[{describe_target(target)}]\n"
+            for bus_id in bus_ids:
+                bus_info = schedule.get(bus_id)
                 if bus_info:
-                    msg += f"- ID: {bus_id}, 노선: {bus_info['bus_route_detail']}, 현재 좌석: {bus_info['current_seats']}/{bus_info['total_seats']}\n"
+                    msg += f"- ID: {bus_id}, 노선: {bus_info.bus_route_detail}, 현재 좌석: {bus_info.current_seats}/{bus_info.total_seats}"
+                    note = describe_forecast(forecasts.get(bus_id)) if forecasts else ""
+                    msg += f" ({note})\n" if note else "\n"
                 else:
-                    msg += f"- ID: {bus_id} (정보를 찾을 수 없음, `!load`로 갱신 필요)\n" 
-            await ctx.send(msg)
-        else:
-            await ctx.send("현재 모니터링 중인 버스 노선이 없습니다. `!monitor [버스ID]` 명령어로 모니터링을 시작하세요.")
+                    msg += f"- ID: {bus_id} (정보를 찾을 수 없음, `!load`로 갱신 필요)\n"
+        msg += f"(전체 모니터링 중인 노선: {total_buses}개)"
+        await ctx.send(msg)
+    else:
+        await ctx.send("현재 구독 중인 버스 노선이 없습니다. `!monitor [버스ID]` 명령어로 모니터링을 시작하세요.")
+
+
+@bot.group(name='rule', invoke_without_command=True,
+           help='좌석 조건 알림 규칙을 관리합니다. 예: `!rule add 5 seats<=3`, `!rule add 구미 fill>=90%`, `!rule add 구미 open`, '
+                '`!rule add * appears`, `!rule list`, `!rule del 3` (`add here`는 이 채널로 알림)')
+async def rule_command(ctx):
+    await ctx.send("사용법: `!rule add [here] <노선ID|지역|버스종류|*> <조건>`, `!rule list`, `!rule del <규칙번호>`\n"
+                   "조건: `seats<=3` (남은 좌석 3석 이하), `fill>=90%` (좌석률 90% 이상), `open` (빈 자리 생김), `appears` (새 노선 등장)")
+
+
+def rule_owners(ctx):
+    """규칙을 보거나 지울 수 있는 대상: 명령을 보낸 사용자와 (서버 채널이면) 현재 채널."""
+    owners = [user_target(ctx.author.id)]
+    if ctx.guild is not None:
+        owners.append(channel_target(ctx.channel.id))
+    return owners
+
+
+@rule_command.command(name='add')
+async def rule_add(ctx, *args: str):
+    target, rest = split_target(ctx, args)
+    if len(rest) < 2:
+        await ctx.send("범위와 조건을 입력해주세요. 예: `!rule add 5 seats<=3` 또는 `!rule add here 구미 fill>=90%`")
+        return
+    try:
+        kind, value = parse_condition(" ".join(rest[1:]))
+    except ValueError as e:
+        await ctx.send(str(e))
+        return
+
+    def add_rule(): # 감시 상태 작성자에서 실행 (다음 평가 때 임계값 표가 다시 컴파일됨)
+        start_watching()
+        return rule_book.add(target, kind, parse_scope(rest[0], snapshots.current), value)
+
+    rule = await watch_actor.call(add_rule)
+
+    await ctx.send(f"규칙 #{rule.id} 등록: {describe_rule(rule)} ({describe_target(target)}로 알림). 조건을 새로 만족할 때마다 알려드려요.")
+    ensure_monitor_job()
+
+
+@rule_command.command(name='list')
+async def rule_list(ctx):
+    owners = rule_owners(ctx)
+    rules = rule_book.rules_of(owners)
+    if not rules:
+        await ctx.send("등록된 알림 규칙이 없습니다. `!rule add 5 seats<=3`처럼 등록하세요.")
+        return
+    msg = "📏 **알림 규칙:**\n"
+    for rule in rules:
+        msg += f"- #{rule.id}: {describe_rule(rule)} ({describe_target(rule.owner)})\n"
+    await ctx.send(msg)
+
+
+@rule_command.command(name='del')
+async def rule_delete(ctx, rule_id: int = None):
+    if rule_id is None:
+        await ctx.send("삭제할 규칙 번호를 입력해주세요. 예: `!rule del 3` (`!rule list`로 확인)")
+        return
+    owners = rule_owners(ctx)
+    rule = await watch_actor.call(lambda: rule_book.remove(rule_id, owners))
+    if rule is None:
+        await ctx.send(f"규칙 #{rule_id}을(를) 찾을 수 없거나 삭제 권한이 없습니다.")
+        return
+    await ctx.send(f"규칙 #{rule.id} ({describe_rule(rule)})을(를) 삭제했습니다.")
+    stop_monitor_job_if_idle()
+
+
+def format_duration(seconds):
+    """초를 'N시간 M분' 형식으로."""
+    minutes = int(seconds // 60)
+    if minutes < 60:
+        return f"{minutes}분"
+    return f"{minutes // 60}시간 {minutes % 60}분"
+
+
+@bot.command(name='history', help='노선의 좌석 변화 기록과 만석까지 걸린 시간을 표시합니다. 예: `!history 5` 또는 `!history 5 72` (최근 72시간)')
+async def show_history(ctx, bus_id: str = None, hours: int = 24):
+    if bus_id is None:
+        await ctx.send("기록을 볼 버스 ID를 입력해주세요. 예: `!history 5` 또는 `!history 5 72`")
+        return
+    hours = max(1, min(hours, 24 * 30))
+
+    loop = asyncio.get_running_loop()
+    store, _ = await loop.run_in_executor(None, load_analytics)
+    from seat_history import fill_curve, time_to_full, summarize_durations # load_analytics에서 이미 불러옴
+    samples = await loop.run_in_executor(None, store.samples, bus_id, hours * 3600) # 인덱스 조회 (루프 밖에서)
+    if not samples:
+        await ctx.send(f"ID '{bus_id}'번 노선의 최근 {hours}시간 좌석 기록이 없습니다.")
+        return
+
+    route = snapshots.current.get(bus_id)
+    now = datetime.now().timestamp()
+    start = now - hours * 3600
+    changes = [sample for sample in samples if sample[0] >= start] # 첫 행은 기간 직전 상태일 수 있음
+    msg = f"📈 **ID '{bus_id}'번 노선 좌석 기록 (최근 {hours}시간)**\n"
+    if route:
+        msg += f"노선: {route.bus_route_detail} / 현재 좌석: {route.current_seats}/{route.total_seats}\n"
+    msg += f"채움 곡선: `{fill_curve(samples, start, now)}`\n"
+    if changes:
+        msg += f"좌석 변화 기록: {len(changes)}건 (첫 기록 {datetime.fromtimestamp(changes[0][0]).strftime('%m-%d %H:%M')})\n"
+    else:
+        msg += f"이 기간에는 좌석 변화가 없습니다 (마지막 변화 {datetime.fromtimestamp(samples[0][0]).strftime('%m-%d %H:%M')}).\n"
+    summary = summarize_durations(time_to_full(samples))
+    if summary:
+        count, median, shortest, longest = summary
+        msg += f"만석까지 걸린 시간: {count}회, 중앙값 {format_duration(median)} " \
+               f"(최소 {format_duration(shortest)}, 최대 {format_duration(longest)})\n"
+    else:
+        msg += "이 기간에는 만석이 된 기록이 없습니다.\n"
+    await ctx.send(msg)
 
 
 @bot.command(name='status', help='현재 봇 상태와 채널 정보를 확인합니다.')
 async def bot_status(ctx):
-    with data_lock: # 전역 변수 접근 시 락 사용
-        status_msg = f"🤖 **봇 상태 정보**\n"
-        status_msg += f"• 봇 이름: {bot.user.name}\n"
-        status_msg += f"• 봇 ID: {bot.user.id}\n"
-        status_msg += f"• 설정된 채널 ID: {DISCORD_CHANNEL_ID}\n"
-        status_msg += f"• 현재 채널 ID: {ctx.channel.id}\n"
-        status_msg += f"• 로드된 버스 노선: {len(current_bus_schedules)}개\n"
-        status_msg += f"• 모니터링 중인 버스: {', '.join(sorted(list(monitored_bus_ids))) if monitored_bus_ids else '없음'}\n"
-        if last_update_time:
-            status_msg += f"• 마지막 업데이트: {last_update_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
-        status_msg += f"• 메인 모니터링 잡 활성화: {'예' if scheduler.get_job('main_bus_monitor_job') else '아니오'}\n"
-        
-        await ctx.send(status_msg)
+    schedule = snapshots.current
+    watched = sorted(subscriptions.bus_ids())
+    subscription_count = len(subscriptions)
+    subscriber_count = len(subscriptions.targets())
+    rule_count = len(rule_book)
+
+    status_msg = f"🤖 **봇 상태 정보**\n"
+    status_msg += f"• 봇 이름: {bot.user.name}\n"
+    status_msg += f"• 봇 ID: {bot.user.id}\n"
+    status_msg += f"• 설정된 채널 ID: {DISCORD_CHANNEL_ID}\n"
+    status_msg += f"• 현재 채널 ID: {ctx.channel.id}\n"
+    status_msg += f"• 로드된 버스 노선: {len(schedule)}개 (스냅샷 v{schedule.version})\n"
+    status_msg += f"• 모니터링 중인 버스: {', '.join(watched) if watched else '없음'} " \
+                  f"(구독자 {subscriber_count}명, 구독 {subscription_count}건, 알림 규칙 {rule_count}개)\n"
+    if schedule.fetched_at:
+        status_msg += f"• 마지막 업데이트: {schedule.fetched_at.strftime('%Y-%m-%d %H:%M:%S')}\n"
+    status_msg += f"• 메인 모니터링 잡 활성화: {'예' if scheduler.get_job('main_bus_monitor_job') else '아니오'}\n"
+    crawler_module = loaded_crawler()
+    worker = crawler_module.worker_stats() if hasattr(crawler_module, "worker_stats") else None
+    if worker is not None:
+        status_msg += f"• 크롤러 프로세스: {'pid ' + str(worker['pid']) if worker['pid'] else '종료됨 (다음 크롤링 때 시작)'} " \
+                      f"(시작 {worker['starts']}회, 멈춰서 재시작 {worker['hangs']}회, 비정상 종료 {worker['crashes']}회, " \
+                      f"응답 제한 {worker['timeout']}초, 마지막 스냅샷 {worker['last_snapshot_bytes']}바이트)\n"
+        if worker['last_error']:
+            status_msg += f"  (마지막 오류: {worker['last_error']})\n"
+    session = crawler_module.webdriver_session_stats() if crawler_module is not None else None
+    if session is None:
+        status_msg += "• 크롤러: 아직 준비되지 않음 (사전 준비 중)\n"
+    else:
+        status_msg += f"• WebDriver 세션: {'유지 중' if session['alive'] else '없음'} " \
+                      f"(콜드 스타트 {session['cold_starts']}회, 회피 {session['cold_starts_avoided']}회, " \
+                      f"재로그인 {session['reauths']}회, 저장된 세션 복원 {session['resumes']}회, 유휴 TTL {session['idle_ttl']}초)\n"
+        watchdog = crawler_module.browser_watchdog_stats()
+        status_msg += f"• 브라우저 감시: 드라이버 {watchdog['drivers']}개, 메모리 {watchdog['rss_mb']:.0f}MB " \
+                      f"(최대 {watchdog['peak_rss_mb']:.0f}MB, 상한 {watchdog['rss_limit_mb']:.0f}MB), " \
+                      f"이번 브라우저 크롤링 {watchdog['crawls']}/{watchdog['max_crawls'] or '무제한'}회, " \
+                      f"재시작 {watchdog['recycles']}회, 정리한 고아 프로세스 {watchdog['reaped']}개\n"
+        if watchdog['last_recycle_reason']:
+            status_msg += f"  (마지막 재시작 이유: {watchdog['last_recycle_reason']})\n"
+    status_msg += f"• 시작: 모듈 로드 {startup_stats['import'] * 1000:.0f}ms"
+    if startup_stats["ready"] is not None:
+        status_msg += f", 디스코드 연결까지 {startup_stats['ready']:.1f}초"
+    status_msg += f", 사전 준비 {startup_stats['prewarm_state']}"
+    if startup_stats["prewarm"] is not None:
+        status_msg += f" {startup_stats['prewarm']:.1f}초"
+    if startup_stats["first_command"] is not None:
+        status_msg += f", 첫 명령 처리 {startup_stats['first_command'] * 1000:.0f}ms"
+    status_msg += "\n"
+    if poll_policy.last_decision:
+        interval, reason = poll_policy.last_decision
+        status_msg += f"• 폴링 간격: {interval}초 ({reason})\n"
+    cache = schedule_cache.stats()
+    status_msg += f"• 스냅샷 캐시: 적중 {cache['hits']}회, 크롤링 {cache['misses']}회, 합류 {cache['coalesced']}회, " \
+                  f"백그라운드 갱신 {cache['revalidations']}회 (신선도 기준 {SNAPSHOT_MAX_AGE}초)\n"
+    pages = route_pages.stats()
+    status_msg += f"• !list 페이지: 만들어 둔 페이지 재사용 {pages['hits']}회, 새로 만듦 {pages['renders']}회 (현재 스냅샷 필터 {pages['cached']}개)\n"
+    sent = outbox.stats()
+    status_msg += f"• 알림 발송함: 알림 {sent['queued']}건 -> 메시지 {sent['sent_messages']}개, " \
+                  f"재시도 {sent['retries']}회, 실패 {sent['dropped']}건" \
+                  f"{', 전송 중' if sent['dispatching'] else ''} (동시 전송 {outbox.max_concurrency}개)\n"
+    board = snapshots.stats()
+    actor = watch_actor.stats()
+    status_msg += f"• 스냅샷 발행: {board['publishes']}회 (발행 충돌 {board['conflicts']}회), " \
+                  f"감시 상태 변경 {actor['ops']}건 (대기 {actor['queued']}건, 최대 {actor['max_depth']}건, 실패 {actor['failures']}건)\n"
+    if read_api is not None:
+        api = read_api.stats()
+        status_msg += f"• 읽기 API: {api['url']} (요청 {api['requests']}회, 304 응답 {api['not_modified']}회, " \
+                      f"롱폴링 대기 {api['waiting']}개, SSE 연결 {api['streams']}개, 보낸 데이터 {api['bytes_sent'] / 1024:.0f}KB)\n"
+    status_msg += "• 단계별 지연 시간과 락/큐 대기 시간은 `!perf`로 확인하세요.\n"
+
+    await ctx.send(status_msg)
+
+@bot.command(name='perf', help='크롤링/알림 단계별 지연 시간(p50/p95/p99)과 락/큐 대기 시간, 실패 횟수를 표시합니다.')
+async def show_perf(ctx):
+    latencies = perf_metrics.latency_summary()
+    counts = perf_metrics.counters()
+    if not latencies and not counts:
+        await ctx.send("아직 측정된 성능 지표가 없습니다. `!load`로 한 번 크롤링한 뒤 다시 확인하세요.")
+        return
+
+    msg = "⏱️ **성능 지표** (ms, 최근 측정 기준)\n```\n"
+    msg += f"{'단계':<28}{'횟수':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'최대':>9}\n"
+    for name, (count, p50, p95, p99, peak) in sorted(latencies.items()):
+        msg += f"{name:<28}{count:>6}{p50 * 1000:>9.1f}{p95 * 1000:>9.1f}{p99 * 1000:>9.1f}{peak * 1000:>9.1f}\n"
+    msg += "```"
+    if counts:
+        msg += "누적 횟수: " + ", ".join(f"{name} {value}" for name, value in sorted(counts.items())) + "\n"
+    if METRICS_PORT:
+        msg += f"Prometheus: http://127.0.0.1:{METRICS_PORT}/metrics\n"
+    for part in merge_messages([msg]):
+        await ctx.send(part)
+
 
 @bot.command(name='help', help='사용 가능한 모든 명령어를 표시합니다.')
 async def show_help(ctx):
@@ -517,6 +898,22 @@ async def show_help(ctx):
             help_text += f"• `!{command.name}`: {command.help}\n"
     await ctx.send(help_text)
 
+startup_stats["import"] = time.perf_counter() - _module_started
+perf_metrics.observe("startup_import", startup_stats["import"])
+
 # 봇 실행
 if __name__ == '__main__':
-    bot.run(DISCORD_BOT_TOKEN)
\ No newline at end of file
+    # 마지막 스냅샷 복원, 크롤러 로드/로그인, 남은 브라우저 정리는 on_ready 뒤 사전 준비 작업(prewarm)에서 함
+    if METRICS_PORT: # 로컬에서만 접근 가능한 Prometheus 텍스트 엔드포인트 (선택)
+        try:
+            perf_metrics.start_metrics_server(METRICS_PORT)
+        except OSError as e: # 포트를 다른 프로세스가 쓰고 있어도 봇은 지표 엔드포인트 없이 계속 실행
+            logging.warning(f"성능 지표 엔드포인트 시작 실패 (포트 {METRICS_PORT}): {e}")
+    try:
+        bot.run(DISCORD_BOT_TOKEN)
+    finally:
+        crawler_module = loaded_crawler()
+        if crawler_module is not None:
+            crawler_module.close_webdriver() # 크롤러 프로세스를 쓰면 프로세스도 종료 (남은 크롬은 종료 전에 정리됨)
+            if not CRAWLER_PROCESS:
+                crawler_module.reap_orphaned_browsers() # 비정상 종료된 브라우저 정리
\ No newline at end of file
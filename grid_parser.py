@@ -0,0 +1,229 @@
+# 파일명: grid_parser.py
+
+import logging
+import time
+
+# 파서 라이브러리는 설치된 것만 사용 (bs4는 기존 구현, 나머지는 선택 사항)
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser # selectolax 1.0 이상
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser # 이전 버전 (modest 백엔드)
+    except ImportError:
+        HTMLParser = None
+
+HEADER_ROWS = 2 # cl-grid-row 중 앞의 2개는 헤더 행
+ROUTE_COLUMNS = 7 # ID, 종류, 번호, 차량, 지역, 노선, 좌석
+
+
+def parse_seats(seats_info):
+    """'현재/전체' 형식의 좌석 문자열을 (current_seats, total_seats)로 변환. 형식이 다르면 (0, 0)."""
+    current_seats, total_seats = 0, 0
+    if '/' in seats_info:
+        try:
+            current_seats, total_seats = map(int, seats_info.split('/'))
+        except ValueError:
+            pass
+    return current_seats, total_seats
+
+
+def make_route(values):
+    """그리드 한 행의 셀 값 7개(ID, 종류, 번호, 차량, 지역, 노선, 좌석)를 노선 dict로 변환."""
+    bus_id, bus_type, bus_number, bus_vehicle, bus_region, bus_route_detail, seats_info = values[:7]
+    current_seats, total_seats = parse_seats(seats_info)
+    return {
+        "id": bus_id,
+        "bus_type": bus_type,
+        "bus_number": bus_number,
+        "bus_vehicle": bus_vehicle,
+        "bus_region": bus_region,
+        "bus_route_detail": bus_route_detail,
+        "current_seats": current_seats,
+        "total_seats": total_seats
+    }
+
+
+def rows_to_routes(rows):
+    """
+    엔진이 추출한 데이터 행(셀 값 리스트)들을 노선 dict 리스트로 변환.
+    셀이 7개 미만인 행은 경고만 남기고 건너뜀.
+    """
+    if not rows:
+        print("실제 데이터 행을 찾을 수 없습니다.")
+        return []
+
+    bus_routes_data = []
+    for i, cells in enumerate(rows):
+        if len(cells) >= ROUTE_COLUMNS:
+            try:
+                bus_routes_data.append(make_route(cells))
+            except Exception as ex:
+                logging.error(f"컬럼 데이터 추출 중 오류 (행 {i+1}, HTML 인덱스 {i+3}): {ex} - 행 내용: {cells}", exc_info=True)
+                continue
+        else:
+            logging.warning(f"불완전한 행 감지 (컬럼 수 부족, 행 {i+1}, HTML 인덱스 {i+3}): {len(cells)}개 - 행 내용: {cells}")
+    return bus_routes_data
+
+
+# --- 엔진별 행 추출 ---
+# 모든 엔진은 헤더를 제외한 데이터 행마다 앞 7개 셀의 텍스트 리스트를 반환함.
+# (셀이 7개 미만인 행은 있는 셀만 담아서 반환 -> rows_to_routes에서 경고 처리)
+
+def extract_rows_bs4(html):
+    """기존 구현: BeautifulSoup(html.parser)."""
+    if '\r' in html: # html.parser는 줄바꿈(\r\n, \r)을 그대로 두므로 HTML 표준(브라우저/다른 엔진)처럼 \n으로 맞춤
+        html = html.replace('\r\n', '\n').replace('\r', '\n')
+    soup = BeautifulSoup(html, 'html.parser')
+
+    def get_text_from_cell(cell_div):
+        cl_text_element = cell_div.find(class_='cl-text')
+        if cl_text_element:
+            if cl_text_element.name == 'input':
+                return cl_text_element.get('value', '').strip()
+            else:
+                return cl_text_element.text.strip()
+        return ""
+
+    all_rows = soup.find_all('div', class_=lambda x: x and 'cl-grid-row' in x)
+    rows = []
+    for row in all_rows[HEADER_ROWS:]:
+        cols_divs = row.find_all('div', class_=lambda x: x and 'cl-grid-cell' in x)
+        rows.append([get_text_from_cell(cell) for cell in cols_divs[:ROUTE_COLUMNS]])
+    return rows
+
+
+_LXML_ROW_XPATH = "//div[contains(@class, 'cl-grid-row')]"
+_LXML_CELL_XPATH = ".//div[contains(@class, 'cl-grid-cell')]"
+_LXML_TEXT_XPATH = "(.//*[contains(concat(' ', normalize-space(@class), ' '), ' cl-text ')])[1]"
+
+
+def extract_rows_lxml(html):
+    """lxml + XPath (C 파서)."""
+    tree = lxml.html.fromstring(html)
+    lxml.etree.strip_elements(tree, 'script', 'style', with_tail=False) # bs4처럼 스크립트/스타일 내용은 텍스트에서 뺌
+    rows = []
+    for row in tree.xpath(_LXML_ROW_XPATH)[HEADER_ROWS:]:
+        cells = []
+        for cell in row.xpath(_LXML_CELL_XPATH)[:ROUTE_COLUMNS]:
+            found = cell.xpath(_LXML_TEXT_XPATH)
+            if not found:
+                cells.append("")
+            elif found[0].tag == 'input':
+                cells.append(found[0].get('value', '').strip())
+            else:
+                cells.append(found[0].text_content().strip())
+        rows.append(cells)
+    return rows
+
+
+def extract_rows_selectolax(html):
+    """selectolax (lexbor 기반 C 파서 + CSS 선택자)."""
+    tree = HTMLParser(html)
+    tree.strip_tags(['script', 'style']) # bs4처럼 스크립트/스타일 내용은 텍스트에서 뺌
+    rows = []
+    for row in tree.css('div[class*="cl-grid-row"]')[HEADER_ROWS:]:
+        cells = []
+        for cell in row.css('div[class*="cl-grid-cell"]')[:ROUTE_COLUMNS]:
+            found = cell.css_first('.cl-text')
+            if found is None:
+                cells.append("")
+            elif found.tag == 'input':
+                cells.append((found.attributes.get('value') or '').strip())
+            else:
+                cells.append(found.text(deep=True).strip())
+        rows.append(cells)
+    return rows
+
+
+# 브라우저 안에서 행 값만 뽑아 반환 (page_source와 같은 결과가 나오도록 input은 value '속성'을 읽음)
+_IN_PAGE_SCRIPT = """
+var rows = document.querySelectorAll('div[class*="cl-grid-row"]');
+var out = [];
+for (var i = arguments[0]; i < rows.length; i++) {
+    var cells = rows[i].querySelectorAll('div[class*="cl-grid-cell"]');
+    var values = [];
+    for (var j = 0; j < cells.length && j < arguments[1]; j++) {
+        var el = cells[j].querySelector('.cl-text');
+        if (!el) { values.push(''); }
+        else if (el.tagName.toLowerCase() === 'input') { values.push((el.getAttribute('value') || '').trim()); }
+        else {
+            if (el.querySelector('script, style')) { // bs4처럼 스크립트/스타일 내용은 뺌
+                el = el.cloneNode(true);
+                el.querySelectorAll('script, style').forEach(function (s) { s.remove(); });
+            }
+            values.push(el.textContent.trim());
+        }
+    }
+    out.push(values);
+}
+return out;
+"""
+
+
+def extract_rows_in_page(driver):
+    """execute_script로 브라우저 안에서 행 값만 추출 (현재 컨텍스트가 iframeA여야 함)."""
+    return driver.execute_script(_IN_PAGE_SCRIPT, HEADER_ROWS, ROUTE_COLUMNS)
+
+
+# page_source(HTML 문자열)를 받는 엔진들
+ENGINES = {}
+if BeautifulSoup is not None:
+    ENGINES["bs4"] = extract_rows_bs4
+if lxml is not None:
+    ENGINES["lxml"] = extract_rows_lxml
+if HTMLParser is not None:
+    ENGINES["selectolax"] = extract_rows_selectolax
+
+
+def resolve_engine(name):
+    """설정된 엔진 이름을 실제 사용할 엔진 이름으로 변환. 'in_page'는 그대로 반환."""
+    if name == "in_page":
+        return name
+    if name == "auto":
+        for candidate in ("selectolax", "lxml", "bs4"):
+            if candidate in ENGINES:
+                return candidate
+        raise RuntimeError("사용 가능한 HTML 파서가 없습니다. (bs4, lxml, selectolax 중 하나를 설치하세요)")
+    if name not in ENGINES:
+        raise RuntimeError(f"파서 엔진 '{name}'을(를) 사용할 수 없습니다. 설치된 엔진: {', '.join(ENGINES) or '없음'}")
+    return name
+
+
+def parse_grid(html, engine="auto"):
+    """page_source를 지정한 엔진으로 파싱해 노선 dict 리스트를 반환."""
+    return rows_to_routes(ENGINES[resolve_engine(engine)](html))
+
+
+def benchmark_engines(html, repeat=20):
+    """
+    설치된 모든 엔진으로 같은 HTML을 repeat번 파싱해 {엔진: 1회 평균 초}를 반환.
+    결과가 기준 구현(bs4)과 다르면 AssertionError.
+    """
+    results = {}
+    reference = extract_rows_bs4(html) if "bs4" in ENGINES else None
+    for name, extract in ENGINES.items():
+        rows = extract(html)
+        if reference is not None and rows != reference:
+            raise AssertionError(f"엔진 '{name}'의 추출 결과가 bs4와 다릅니다.")
+        started = time.perf_counter()
+        for _ in range(repeat):
+            extract(html)
+        results[name] = (time.perf_counter() - started) / repeat
+    return results
+
+
+if __name__ == '__main__':
+    # 저장해 둔 page_source로 엔진 비교: python grid_parser.py page.html
+    import sys
+    with open(sys.argv[1], encoding='utf-8') as f:
+        page_html = f.read()
+    for engine_name, seconds in benchmark_engines(page_html).items():
+        print(f"{engine_name:>10}: {seconds * 1000:.2f}ms / 회")
@@ -0,0 +1,161 @@
+# 파일명: grid_readiness.py
+
+import logging
+import time
+
+import perf_metrics
+from portal_config import GRID_QUERY_MATCH
+
+
+def record_phase(phase, seconds):
+    """크롤링 단계(phase)별 소요 시간을 기록 (perf_metrics의 지연 시간 히스토그램으로 들어감)."""
+    perf_metrics.observe(phase, seconds)
+    logging.info(f"[readiness] {phase}: {seconds * 1000:.0f}ms")
+
+
+# --- 브라우저 안에서 실행할 스크립트 (iframeA 컨텍스트 기준) ---
+# 그리드 행 수와 행 내용(텍스트 + input 값)의 해시를 계산. fresh는 표시(data-kba-seen)가 없는 새 행 수.
+# done은 표시 이후 응답까지 끝난 조회 요청 수 (Resource Timing에서 주소에 arguments[1]이 들어간 XHR/fetch만).
+# 브라우저가 지원하지 않으면 -1. other는 그 밖의 XHR/fetch 수 (세션 유지/폴링 등, 조회 완료로 보지 않음).
+# 표시할 때(arguments[0]) Resource Timing 기록도 비워서, 이후에는 '조회' 클릭 뒤에 끝난 요청만 셈.
+_GRID_STATE_SCRIPT = """
+var rows = document.querySelectorAll('div[class*="cl-grid-row"]');
+var h = 5381, fresh = 0;
+for (var i = 0; i < rows.length; i++) {
+    if (!rows[i].hasAttribute('data-kba-seen')) { fresh++; }
+    var s = rows[i].textContent;
+    var inputs = rows[i].getElementsByTagName('input');
+    for (var j = 0; j < inputs.length; j++) { s += '|' + inputs[j].value; }
+    for (var k = 0; k < s.length; k++) { h = ((h * 33) ^ s.charCodeAt(k)) >>> 0; }
+}
+var perf = window.performance, done = -1, other = 0;
+if (perf && perf.getEntriesByType && perf.clearResourceTimings) {
+    done = 0;
+    var entries = perf.getEntriesByType('resource');
+    for (var e = 0; e < entries.length; e++) {
+        var type = entries[e].initiatorType;
+        if (type !== 'xmlhttprequest' && type !== 'fetch') { continue; }
+        if (entries[e].name.indexOf(arguments[1]) >= 0) { done++; } else { other++; }
+    }
+}
+if (arguments[0]) {
+    for (var m = 0; m < rows.length; m++) { rows[m].setAttribute('data-kba-seen', '1'); }
+    if (done >= 0) { perf.clearResourceTimings(); done = 0; other = 0; }
+}
+return [rows.length, h, fresh, done, other];
+"""
+
+# 로그인 폼이 사라지고 '조회' 버튼이 나타났는지 확인
+_LOGIN_STATE_SCRIPT = """
+var pw = document.getElementById('user_password');
+var formVisible = !!(pw && pw.offsetParent !== null);
+var buttons = document.querySelectorAll('div.cl-text');
+for (var i = 0; i < buttons.length; i++) {
+    if (buttons[i].textContent === '조회') { return !formVisible; }
+}
+return false;
+"""
+
+
+# 저장된 세션으로 페이지를 연 뒤: 로그인 폼이 보이면 'login', '조회' 버튼이 보이면 'ok', 아직 그리는 중이면 null
+_SESSION_STATE_SCRIPT = """
+var pw = document.getElementById('user_password');
+if (pw && pw.offsetParent !== null) { return 'login'; }
+var buttons = document.querySelectorAll('div.cl-text');
+for (var i = 0; i < buttons.length; i++) {
+    if (buttons[i].textContent === '조회') { return 'ok'; }
+}
+return null;
+"""
+
+
+def _grid_state(driver, mark=False, query_match=GRID_QUERY_MATCH):
+    count, fingerprint, fresh, done, other = driver.execute_script(_GRID_STATE_SCRIPT, mark, query_match)
+    return count, fingerprint, fresh, done, other
+
+
+def wait_for_login(driver, timeout=15, poll=0.1):
+    """doLogin() 호출 후 로그인 폼이 사라지고 '조회' 버튼이 나타날 때까지 대기. 시간 초과 시 TimeoutError."""
+    started = time.monotonic()
+    deadline = started + timeout
+    while True:
+        try:
+            if driver.execute_script(_LOGIN_STATE_SCRIPT):
+                break
+        except Exception:
+            pass # 로그인 처리 중 iframe이 다시 로드되는 동안에는 스크립트 실행이 실패할 수 있음
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"로그인 완료 신호를 {timeout}초 안에 받지 못했습니다.")
+        time.sleep(poll)
+    record_phase("login_wait", time.monotonic() - started)
+
+
+def wait_for_session(driver, timeout=10, poll=0.1):
+    """
+    저장된 세션 쿠키로 예약 페이지를 연 뒤 (iframe 안에서) 로그인 상태인지 확인.
+    '조회' 버튼이 보이면 True, 로그인 폼이 보이거나 timeout초 안에 판단하지 못하면 False.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    state = None
+    while state is None and time.monotonic() < deadline:
+        try:
+            state = driver.execute_script(_SESSION_STATE_SCRIPT)
+        except Exception:
+            pass # iframe이 아직 로드 중
+        if state is None:
+            time.sleep(poll)
+    record_phase("session_check", time.monotonic() - started)
+    return state == 'ok'
+
+
+def mark_grid(driver):
+    """'조회' 클릭 직전에 호출. 현재 그리드 행에 표시를 남기고 그 상태의 지문을 반환."""
+    count, fingerprint, _, _, _ = _grid_state(driver, mark=True)
+    return count, fingerprint
+
+
+def wait_for_grid(driver, before, timeout=15, settle=0.3, poll=0.1, query_match=GRID_QUERY_MATCH):
+    """
+    '조회' 클릭 후 그리드가 다 그려질 때까지 대기.
+    - 조회 요청(주소에 query_match가 들어간 XHR/fetch)의 응답이 끝났고, 그 뒤로 행 수와 데이터 지문이
+      settle초 동안 그대로면 준비 완료. 행 수와 상관없음 (운행이 없는 시간/휴일에 행이 없거나 적어도 그대로 진행)
+    - 좌석 변화가 없어 데이터가 그대로인 경우도 응답 완료 후 settle초만 기다림 (고정 대기 없음)
+    - 다른 XHR(세션 유지, 폴링 등)이 끝난 것은 완료 신호로 보지 않음. 조회 완료 신호를 못 봤어도 행이 다시 그려졌으면
+      (새 행이 생기거나 지문이 바뀜) 응답이 온 것이므로 그때부터 settle초 안정되면 준비 완료
+    - 브라우저가 완료 신호를 주지 않으면 (Resource Timing 미지원) 행 수와 지문이 settle초 동안 그대로인 것으로 판단
+    - timeout초가 지나면 경고를 남기고 현재 상태 그대로 진행
+    반환값(기록 이름 render_wait_<이유>): 'changed' (데이터가 바뀜), 'unchanged' (그대로), 'timeout'
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    _, before_fingerprint = before
+    last_state = None
+    stable_since = None
+    done_at = None # 조회 응답이 끝난 것(또는 행이 다시 그려진 것)을 처음 본 시각
+    reason = "timeout"
+
+    while True:
+        now = time.monotonic()
+        count, fingerprint, fresh, done, other = _grid_state(driver, query_match=query_match)
+        state = (count, fingerprint)
+        if state != last_state:
+            last_state = state
+            stable_since = now
+        redrawn = fresh > 0 or fingerprint != before_fingerprint
+        if done_at is None and (done != 0 or redrawn): # 완료 신호가 없으면(-1) 처음부터 안정 상태만 봄
+            done_at = started if done < 0 else now
+        # 응답이 끝난 직후 그리기가 아직 시작되지 않았을 수 있으므로, 안정 구간은 응답 완료 시점부터 셈
+        if done_at is not None and now - max(stable_since, done_at) >= settle:
+            reason = "changed" if redrawn else "unchanged"
+            break
+        if now >= deadline:
+            hint = ""
+            if done == 0 and other:
+                hint = f" 다른 XHR {other}개는 끝났지만 주소에 '{query_match}'가 들어간 요청이 없습니다 (KUMOH_GRID_QUERY_MATCH 확인)."
+            logging.warning(f"그리드 준비 신호를 {timeout}초 안에 받지 못했습니다. (행 {count}개) 현재 상태로 진행합니다.{hint}")
+            break
+        time.sleep(poll)
+
+    record_phase(f"render_wait_{reason}", time.monotonic() - started)
+    return reason
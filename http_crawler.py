@@ -0,0 +1,208 @@
+# 파일명: http_crawler.py
+
+import json
+import logging
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# key.py 파일에서 설정값 불러오기
+from key import YOUR_ID, YOUR_PASSWORD
+from portal_config import (
+    PORTAL_BASE_URL, BUS_RESERVATION_URL, LOGIN_URL, GRID_QUERY_URL, GRID_DATASET_KEY, GRID_COLUMNS,
+    HTTP_TIMEOUT, HTTP_POOL_MAXSIZE, PORTAL_VERIFIED_PATH
+)
+from grid_parser import make_route
+from session_store import session_store
+
+
+LOGIN_FIELDS = ("user_id", "user_password") # 로그인 요청 폼 필드 (추정값)
+_LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+class PortalSessionExpired(Exception):
+    """포털 세션이 만료되어 다시 로그인해야 할 때 발생."""
+
+
+class PortalNotVerified(RuntimeError):
+    """HTTP 백엔드의 요청 주소/필드가 실제 포털 기록으로 확인되지 않아 로그인 요청을 보내지 않을 때 발생."""
+
+
+def http_config():
+    """HTTP 백엔드가 기대는 portal_config 값 (capture_portal.py check가 실제 기록과 비교해 확인하는 값)."""
+    return {
+        "origin": PORTAL_BASE_URL,
+        "login_path": urlsplit(LOGIN_URL).path,
+        "login_fields": list(LOGIN_FIELDS),
+        "grid_path": urlsplit(GRID_QUERY_URL).path,
+        "dataset_key": GRID_DATASET_KEY,
+        "columns": list(GRID_COLUMNS),
+    }
+
+
+def save_verification(capture_path):
+    """(capture_portal.py check 성공 시) 지금 설정을 실제 포털 기록과 맞는 것으로 기록."""
+    with open(PORTAL_VERIFIED_PATH, "w", encoding="utf-8") as f:
+        json.dump({"capture": capture_path, "config": http_config()}, f, ensure_ascii=False, indent=1)
+
+
+def verification_problem():
+    """HTTP 백엔드를 쓰면 안 되는 이유 (쓸 수 있으면 None). 로컬 대역 서버는 확인 없이 허용."""
+    if urlsplit(PORTAL_BASE_URL).hostname in _LOCAL_HOSTS:
+        return None
+    try:
+        with open(PORTAL_VERIFIED_PATH, encoding="utf-8") as f:
+            verified = json.load(f).get("config")
+    except FileNotFoundError:
+        return f"실제 포털 기록으로 확인한 적이 없습니다 ({PORTAL_VERIFIED_PATH} 없음)"
+    except (OSError, ValueError) as e:
+        return f"확인 기록을 읽을 수 없습니다: {e}"
+    if verified != http_config():
+        return "portal_config 값이 실제 포털 기록으로 확인한 값과 다릅니다"
+    return None
+
+
+def require_verified():
+    """확인되지 않은 설정이면 PortalNotVerified 발생 (추정한 주소로 계정 정보/세션 쿠키를 보내지 않기 위함)."""
+    problem = verification_problem()
+    if problem:
+        raise PortalNotVerified(f"HTTP 백엔드를 쓸 수 없습니다: {problem}. "
+                                "python benchmarks/capture_portal.py capture 후 check를 먼저 실행하세요.")
+
+
+def _is_login_page(resp):
+    """응답이 로그인 폼(세션 만료/로그인 실패)인지 확인."""
+    content_type = resp.headers.get("Content-Type", "")
+    return "html" in content_type and "user_password" in resp.text
+
+
+class HttpPortalSession:
+    """
+    doLogin()과 그리드 조회를 브라우저 없이 HTTP 요청으로 재현하는 세션.
+    keep-alive 커넥션 풀을 유지하고, 세션이 만료되면 한 번만 다시 로그인함.
+    요청 주소/폼 필드/응답 형식은 portal_config의 추정값을 따름. capture_portal.py check로 실제 포털 기록과 맞는 것을
+    확인하기 전에는 (verification_problem()) 로그인/세션 복원 없이 PortalNotVerified를 발생시킴.
+    """
+
+    def __init__(self, timeout=HTTP_TIMEOUT, pool_maxsize=HTTP_POOL_MAXSIZE):
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self._session = None
+        self._logged_in = False
+        self._lock = threading.Lock()
+
+    def _build_session(self):
+        session = requests.Session()
+        retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+                      allowed_methods=frozenset(["GET", "POST"]))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "User-Agent": "Mozilla/5.0 (kumoh_bus_alarm)",
+            "Referer": BUS_RESERVATION_URL,
+        })
+        return session
+
+    def login(self):
+        """예약 페이지에서 세션 쿠키를 받은 뒤 doLogin()과 같은 로그인 요청을 보냄."""
+        require_verified()
+        if self._session is None:
+            self._session = self._build_session()
+        self._session.get(BUS_RESERVATION_URL, timeout=self.timeout).raise_for_status()
+        resp = self._session.post(
+            LOGIN_URL,
+            data=dict(zip(LOGIN_FIELDS, (YOUR_ID, YOUR_PASSWORD))),
+            timeout=self.timeout,
+        )
+        resp.raise_for_status()
+        if _is_login_page(resp):
+            raise RuntimeError("HTTP 로그인 실패: 로그인 폼이 다시 반환되었습니다.")
+        self._logged_in = True
+        logging.info("HTTP 세션 로그인 완료.")
+        # 쿠키만 갱신: 브라우저 로그인이 저장해 둔 iframe localStorage/sessionStorage는 그대로 둠
+        session_store.save([
+            {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path, "secure": c.secure,
+             "httpOnly": c.has_nonstandard_attr("HttpOnly"), "expires": c.expires}
+            for c in self._session.cookies
+        ])
+
+    def resume(self):
+        """
+        저장된 세션 쿠키(브라우저 로그인으로 저장된 것 포함)를 넣고 로그인된 것으로 간주.
+        바로 다음 조회 요청이 유효성 확인을 겸하며, 만료됐으면 그때 전체 로그인함. 복원할 세션이 없으면 False.
+        """
+        saved = session_store.load()
+        if not saved:
+            return False
+        if self._session is None:
+            self._session = self._build_session()
+        for cookie in saved["cookies"]:
+            self._session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ""),
+                                      path=cookie.get("path", "/"), secure=cookie.get("secure", False))
+        self._logged_in = True
+        logging.info(f"저장된 로그인 세션 쿠키 {len(saved['cookies'])}개로 HTTP 세션 복원.")
+        return True
+
+    def fetch_rows(self):
+        """'조회' 요청을 보내고 그리드 컬럼 순서대로 정렬된 셀 값 리스트를 반환."""
+        resp = self._session.post(GRID_QUERY_URL, timeout=self.timeout, headers={"Accept": "application/json"})
+        if resp.status_code in (401, 403) or _is_login_page(resp):
+            raise PortalSessionExpired(f"세션 만료 (HTTP {resp.status_code})")
+        resp.raise_for_status()
+        rows = resp.json().get(GRID_DATASET_KEY)
+        if rows is None:
+            raise ValueError(f"조회 응답에 '{GRID_DATASET_KEY}' 데이터셋이 없습니다.")
+        return [[str(row.get(col, "")).strip() for col in GRID_COLUMNS] for row in rows]
+
+    def ensure_login(self):
+        """로그인되어 있지 않으면 저장된 세션을 복원하거나 로그인함 (봇 시작 직후 사전 준비에서도 사용)."""
+        with self._lock:
+            self._ensure_login()
+
+    def _ensure_login(self):
+        if not self._logged_in:
+            require_verified()
+        if not self._logged_in and not self.resume():
+            self.login()
+
+    def get_bus_schedule(self):
+        """login_crawler.get_bus_schedule()과 같은 형식의 노선 dict 리스트를 반환."""
+        with self._lock:
+            self._ensure_login()
+            try:
+                rows = self.fetch_rows()
+            except PortalSessionExpired as e:
+                logging.info(f"HTTP 세션 재로그인: {e}")
+                self._logged_in = False
+                self.login()
+                rows = self.fetch_rows()
+        return [make_route(values) for values in rows]
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            self._logged_in = False
+
+
+_portal_session = HttpPortalSession()
+
+
+def get_bus_schedule():
+    """모듈 전역 HTTP 세션으로 버스 노선 정보를 가져옴."""
+    return _portal_session.get_bus_schedule()
+
+
+def prewarm():
+    """모듈 전역 HTTP 세션을 미리 로그인해 둠."""
+    _portal_session.ensure_login()
+
+
+def close_session():
+    """모듈 전역 HTTP 세션을 닫음."""
+    _portal_session.close()
@@ -6,159 +6,327 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
+import json
 import time
 import logging
-import threading
+from urllib.parse import urlsplit
 
 # key.py 파일에서 설정값 불러오기
 from key import CHROMEDRIVER_PATH, YOUR_ID, YOUR_PASSWORD
+from portal_config import BUS_RESERVATION_URL, CRAWLER_BACKEND, HTTP_FALLBACK_COOLDOWN, WEBDRIVER_IDLE_TTL, PARSER_ENGINE
+from portal_config import WEBDRIVER_LEAN_PROFILE, WEBDRIVER_BLOCKED_URLS, WEBDRIVER_JS_HEAP_MB
+from portal_config import WEBDRIVER_RSS_LIMIT_MB, WEBDRIVER_MAX_CRAWLS
+from grid_readiness import wait_for_login, wait_for_session, mark_grid, wait_for_grid
+from session_keeper import WebDriverSessionKeeper, SESSION_OK, SESSION_EXPIRED
+from grid_parser import resolve_engine, parse_grid, rows_to_routes, extract_rows_in_page
+from browser_watchdog import BrowserWatchdog, chrome_marker_argument
+from session_store import session_store
+import http_crawler
+import perf_metrics
 
 logging.basicConfig(level=logging.INFO)
 
-# --- WebDriver 인스턴스 관리 (전역적으로, 그러나 스레드 안전하게) ---
-_webdriver_local = threading.local() 
-_webdriver_lock = threading.Lock() # <-- 추가: WebDriver 접근을 위한 스레드 잠금
+# --- WebDriver 인스턴스 관리 (로그인된 브라우저 하나를 오래 유지) ---
+# 가벼운 프로필에서 추가하는 크롬 옵션 (확장/GPU/백그라운드 통신/동기화 끄기, 렌더러 하나, JS 힙 상한)
+_LEAN_ARGUMENTS = (
+    "--disable-extensions",
+    "--disable-gpu",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--no-first-run",
+    "--mute-audio",
+    "--renderer-process-limit=1",
+    "--window-size=1280,900",
+)
+
+# 크롬 프로세스 트리 메모리/드라이버 수 감시 (상한을 넘으면 크롤링 후 브라우저 재시작, 고아 프로세스 정리)
+browser_watchdog = BrowserWatchdog(WEBDRIVER_RSS_LIMIT_MB, WEBDRIVER_MAX_CRAWLS)
+
+def _chrome_options(headless=True, lean=WEBDRIVER_LEAN_PROFILE):
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument(chrome_marker_argument()) # 고아 프로세스 정리용 표시
+    if lean:
+        for argument in _LEAN_ARGUMENTS:
+            chrome_options.add_argument(argument)
+        chrome_options.add_argument(f"--js-flags=--max-old-space-size={WEBDRIVER_JS_HEAP_MB}")
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    return chrome_options
+
+def _block_assets(driver):
+    """CDP로 이미지/폰트/미디어 요청을 네트워크 단계에서 막음 (실패해도 크롤링은 계속)."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(WEBDRIVER_BLOCKED_URLS)})
+    except Exception as e:
+        logging.warning(f"리소스 차단 설정 실패 (전체 리소스를 받아옴): {e}")
+
+def _keep_single_tab(driver):
+    """팝업/공지 창이 열려 있으면 닫고 첫 탭 하나만 남김. 닫은 탭 수를 반환 (닫았으면 최상위 문서로 돌아와 있음)."""
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    if len(handles) > 1:
+        driver.switch_to.window(handles[0])
+        logging.info(f"추가로 열린 탭 {len(handles) - 1}개를 닫았습니다.")
+    return len(handles) - 1
+
+def _create_webdriver(headless=True, lean=WEBDRIVER_LEAN_PROFILE):
+    """새 크롬 WebDriver 인스턴스를 생성. lean이면 가벼운 프로필(리소스 차단, 불필요한 기능 끄기, 메모리 상한)로 띄움."""
+    service = Service(executable_path=CHROMEDRIVER_PATH)
+    driver = webdriver.Chrome(service=service, options=_chrome_options(headless, lean))
+    browser_watchdog.attach(driver)
+    if lean:
+        _block_assets(driver)
+    print(f"새로운 WebDriver 인스턴스 생성 및 초기화.{' (가벼운 프로필)' if lean else ''}")
+    return driver
+
+def _login(driver):
+    """예약 페이지를 열고 iframeA 안의 로그인 폼으로 로그인. 끝나면 iframe 컨텍스트에 머무름."""
+    with perf_metrics.timer("login"):
+        driver.get(BUS_RESERVATION_URL)
+
+        WebDriverWait(driver, 25).until(EC.presence_of_element_located((By.NAME, "iframeA")))
+        driver.switch_to.frame(driver.find_element(By.NAME, "iframeA"))
+        print("iframe으로 컨텍스트 전환 완료.")
+
+        WebDriverWait(driver, 25).until(EC.presence_of_element_located((By.ID, "user_id")))
+        driver.find_element(By.ID, "user_id").send_keys(YOUR_ID)
+        driver.find_element(By.ID, "user_password").send_keys(YOUR_PASSWORD)
+        print("아이디/비밀번호 입력 완료.")
+
+        WebDriverWait(driver, 20).until(lambda d: d.execute_script("return typeof doLogin === 'function';"))
+        driver.execute_script("doLogin()")
+        print("로그인 버튼 클릭 완료.")
+        wait_for_login(driver)
+        if WEBDRIVER_LEAN_PROFILE and _keep_single_tab(driver): # 로그인 후 공지 팝업 등은 닫고 탭 하나만 재사용
+            driver.switch_to.frame(driver.find_element(By.NAME, "iframeA"))
+    _save_session(driver)
+
+# --- 로그인 세션 저장/복원 (브라우저/봇 재시작 때 전체 로그인 대신 쿠키를 넣고 페이지 한 번만 불러옴) ---
+_STORAGE_SCRIPT = "return [JSON.stringify(localStorage), JSON.stringify(sessionStorage)];"
+
+# 새 문서가 열릴 때 페이지 스크립트보다 먼저 실행되어, 포털 주소에서만 비어 있는 스토리지 값을 채움
+_SEED_STORAGE_SCRIPT = """
+(function (origin, local, session) {
+    if (location.origin !== origin) { return; }
+    var seed = function (storage, values) {
+        for (var key in values) { if (storage.getItem(key) === null) { storage.setItem(key, values[key]); } }
+    };
+    seed(localStorage, local);
+    seed(sessionStorage, session);
+})(%s, %s, %s);
+"""
+
+def _save_session(driver):
+    """(로그인 직후 iframe 안에서 호출) 쿠키와 웹 스토리지를 저장. 실패해도 로그인에는 영향 없음."""
+    if not session_store:
+        return
+    try:
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"] # HttpOnly, iframe 쿠키 포함
+        local, session = driver.execute_script(_STORAGE_SCRIPT)
+        session_store.save(cookies, json.loads(local), json.loads(session))
+    except Exception as e:
+        logging.warning(f"로그인 세션 저장 중 오류: {e}")
+
+def _resume_session(driver):
+    """
+    (콜드 스타트 직후) 저장된 쿠키/스토리지를 넣고 예약 페이지를 한 번 불러와 로그인 상태인지 확인.
+    성공하면 iframe 컨텍스트에 머무르고 True, 저장된 세션이 없거나 만료됐으면 False (전체 로그인으로 진행).
+    """
+    saved = session_store.load()
+    if not saved:
+        return False
+    driver.execute_cdp_cmd("Network.setCookies", {"cookies": saved["cookies"]})
+    script_id = None
+    if saved["local_storage"] or saved["session_storage"]:
+        parts = urlsplit(BUS_RESERVATION_URL)
+        source = _SEED_STORAGE_SCRIPT % (json.dumps(f"{parts.scheme}://{parts.netloc}"),
+                                         json.dumps(saved["local_storage"]), json.dumps(saved["session_storage"]))
+        script_id = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})["identifier"]
+    try:
+        driver.get(BUS_RESERVATION_URL)
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.NAME, "iframeA")))
+        driver.switch_to.frame(driver.find_element(By.NAME, "iframeA"))
+        resumed = wait_for_session(driver)
+    finally:
+        if script_id is not None:
+            driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id})
+    if not resumed:
+        logging.info("저장된 로그인 세션이 만료되어 전체 로그인으로 진행합니다.")
+        driver.switch_to.default_content()
+        return False
+    logging.info("저장된 로그인 세션으로 복원 완료 (전체 로그인 생략).")
+    return True
+
+# 스크립트 한 번으로 예약 페이지 여부와 iframe 안 로그인 폼 노출 여부를 확인 (세션 만료 감지)
+_PROBE_SCRIPT = """
+if (location.href.indexOf('bus_reservation.jsp') < 0) { return 'nopage'; }
+var frame = document.getElementsByName('iframeA')[0];
+if (!frame) { return 'nopage'; }
+var doc = frame.contentDocument;
+if (!doc) { return 'ok'; }
+var pw = doc.getElementById('user_password');
+return (pw && pw.offsetParent !== null) ? 'login' : 'ok';
+"""
+
+def _probe_session(driver):
+    """드라이버의 생존 여부와 로그인 유지 여부를 가볍게 점검."""
+    driver.switch_to.default_content() # 드라이버가 죽었으면 여기서 예외 발생 -> SESSION_DEAD
+    result = driver.execute_script(_PROBE_SCRIPT)
+    return SESSION_OK if result == 'ok' else SESSION_EXPIRED
+
+session_keeper = WebDriverSessionKeeper(_create_webdriver, _login, _probe_session, WEBDRIVER_IDLE_TTL,
+                                        on_quit=browser_watchdog.detach, resume_fn=_resume_session)
 
 def get_webdriver():
-    """스레드 로컬에 WebDriver 인스턴스가 없으면 새로 생성하여 반환."""
-    with _webdriver_lock: # <-- 추가: WebDriver 생성 및 접근 시 잠금
-        if not hasattr(_webdriver_local, "driver") or _webdriver_local.driver is None:
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            service = Service(executable_path=CHROMEDRIVER_PATH)
-            _webdriver_local.driver = webdriver.Chrome(service=service, options=chrome_options)
-            print("새로운 WebDriver 인스턴스 생성 및 초기화.")
-        return _webdriver_local.driver
+    """로그인된 WebDriver 인스턴스를 반환. 사용 후 release_webdriver()를 호출해야 함."""
+    with perf_metrics.timer("webdriver_acquire"): # 상태 점검, 필요 시 재로그인/콜드 스타트 포함
+        return session_keeper.acquire()
+
+def release_webdriver():
+    """WebDriver 사용 종료. 유휴 TTL이 지나면 브라우저가 자동으로 닫힘."""
+    session_keeper.release()
 
 def close_webdriver(): # 이 함수가 반드시 존재해야 합니다.
-    """스레드 로컬의 WebDriver 인스턴스를 닫음."""
-    with _webdriver_lock: # <-- 추가: WebDriver 종료 시 잠금
-        if hasattr(_webdriver_local, "driver") and _webdriver_local.driver is not None:
-            try:
-                _webdriver_local.driver.quit()
-            except Exception as e:
-                print(f"WebDriver 종료 중 오류 발생: {e}")
-            finally:
-                _webdriver_local.driver = None
-                print("WebDriver 인스턴스 닫음.")
+    """WebDriver 인스턴스를 즉시 닫음."""
+    session_keeper.close()
+
+def webdriver_session_stats():
+    """WebDriver 세션 관리 통계 (콜드 스타트/회피 횟수 등)."""
+    return session_keeper.stats()
+
+def browser_watchdog_stats():
+    """브라우저 감시 상태 (프로세스 트리 RSS, 드라이버 수, 재시작/정리 횟수)."""
+    return browser_watchdog.stats()
+
+def reap_orphaned_browsers():
+    """이전 실행이 남긴 크롬/chromedriver 프로세스 정리 (봇 시작/종료 시 호출). 정리한 수를 반환."""
+    try:
+        return browser_watchdog.reap_orphans()
+    except Exception as e:
+        logging.warning(f"고아 브라우저 프로세스 정리 중 오류: {e}")
+        return 0
+
+_http_disabled_until = 0.0 # HTTP 백엔드 실패 시 이 시각(monotonic)까지 Selenium만 사용
+_http_unverified_logged = False
+
+def _use_http():
+    """
+    이번 크롤링에 HTTP 백엔드를 쓸지 여부.
+    http는 확인되지 않은 설정이어도 True (http_crawler가 PortalNotVerified로 거부함),
+    auto는 capture_portal.py check로 확인되기 전에는 요청을 보내지 않고 처음 한 번만 경고한 뒤 Selenium만 사용.
+    """
+    global _http_unverified_logged
+    if CRAWLER_BACKEND not in ("http", "auto") or time.monotonic() < _http_disabled_until:
+        return False
+    if CRAWLER_BACKEND == "auto":
+        problem = http_crawler.verification_problem()
+        if problem:
+            if not _http_unverified_logged:
+                logging.warning(f"HTTP 백엔드를 쓰지 않고 Selenium만 사용합니다: {problem}")
+                _http_unverified_logged = True
+            return False
+    return True
 
 def get_bus_schedule():
     """
-    버스 노선 정보를 크롤링하여 리스트로 반환합니다.
+    버스 노선 정보를 리스트로 반환합니다.
+    CRAWLER_BACKEND 설정에 따라 HTTP 세션 백엔드를 우선 사용하고, 실패하면 Selenium으로 대체합니다.
+    """
+    global _http_disabled_until
+    if _use_http():
+        try:
+            with perf_metrics.timer("crawl_http"):
+                return http_crawler.get_bus_schedule()
+        except Exception as e:
+            perf_metrics.increment("crawl_failures_http")
+            if CRAWLER_BACKEND == "http":
+                raise
+            logging.warning(f"HTTP 백엔드 조회 실패, {HTTP_FALLBACK_COOLDOWN}초 동안 Selenium으로 대체합니다: {e}")
+            _http_disabled_until = time.monotonic() + HTTP_FALLBACK_COOLDOWN
+            perf_metrics.increment("http_fallbacks")
+            http_crawler.close_session()
+    with perf_metrics.timer("crawl_selenium"):
+        return get_bus_schedule_selenium()
+
+def prewarm():
+    """
+    (크롤러 스레드에서) 첫 크롤링 전에 미리 로그인해 둠. 실제 크롤링에 쓸 백엔드와 같은 것을 준비하고 그 이름을 반환.
+    HTTP 백엔드 준비에 실패하면 (auto일 때) WebDriver를 띄워 로그인해 둠.
+    """
+    if _use_http():
+        try:
+            http_crawler.prewarm()
+            return "http"
+        except Exception as e:
+            if CRAWLER_BACKEND == "http":
+                raise
+            logging.warning(f"HTTP 세션 사전 준비 실패, WebDriver를 준비합니다: {e}")
+    get_webdriver()
+    release_webdriver()
+    return "selenium"
+
+def get_bus_schedule_selenium():
+    """
+    헤드리스 크롬으로 버스 노선 정보를 크롤링하여 리스트로 반환합니다.
     WebDriver 인스턴스는 내부적으로 관리합니다.
     """
     driver = get_webdriver()
 
     try:
-        current_url = driver.current_url
-        if "bus_reservation.jsp" not in current_url:
-            print("드라이버가 올바른 페이지에 있지 않음. 초기화 및 로그인 시도.")
-            driver.get("https://kit.kumoh.ac.kr/jsp/administration/bus/bus_reservation.jsp")
-            
-            WebDriverWait(driver, 25).until(EC.presence_of_element_located((By.NAME, "iframeA")))
-            driver.switch_to.frame(driver.find_element(By.NAME, "iframeA"))
-            print("iframe으로 컨텍스트 전환 완료.")
-
-            WebDriverWait(driver, 25).until(EC.presence_of_element_located((By.ID, "user_id")))
-            driver.find_element(By.ID, "user_id").send_keys(YOUR_ID)
-            driver.find_element(By.ID, "user_password").send_keys(YOUR_PASSWORD)
-            print("아이디/비밀번호 입력 완료.")
-
-            WebDriverWait(driver, 20).until(lambda d: d.execute_script("return typeof doLogin === 'function';"))
-            driver.execute_script("doLogin()")
-            print("로그인 버튼 클릭 완료.")
-            time.sleep(3)
-        else:
-            try:
+        try:
+            with perf_metrics.timer("iframe_switch"):
                 driver.switch_to.default_content()
                 WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.NAME, "iframeA")))
                 driver.switch_to.frame(driver.find_element(By.NAME, "iframeA"))
-                print("기존 드라이버를 사용하여 iframe으로 컨텍스트 재전환.")
-            except Exception as e_switch:
-                print(f"iframe 재전환 실패 (이미 iframe에 있거나, 구조 변경): {e_switch}")
-                close_webdriver()
-                return get_bus_schedule()
-
-        search_button = WebDriverWait(driver, 15).until(EC.element_to_be_clickable((By.XPATH, "//div[@class='cl-text' and text()='조회']")))
-        search_button.click()
+            print("기존 드라이버를 사용하여 iframe으로 컨텍스트 재전환.")
+        except Exception as e_switch:
+            perf_metrics.increment("iframe_switch_failures")
+            print(f"iframe 재전환 실패 (구조 변경 또는 페이지 이탈), 같은 브라우저에서 재로그인: {e_switch}")
+            session_keeper.reauthenticate()
+
+        with perf_metrics.timer("query_click"):
+            search_button = WebDriverWait(driver, 15).until(EC.element_to_be_clickable((By.XPATH, "//div[@class='cl-text' and text()='조회']")))
+            before = mark_grid(driver)
+            search_button.click()
         print("조회 버튼 클릭 완료.")
-        time.sleep(5)
-
-        page_source = driver.page_source
-        soup = BeautifulSoup(page_source, 'html.parser')
-        bus_routes_data = []
-
-        all_rows = soup.find_all('div', class_=lambda x: x and 'cl-grid-row' in x)
-        data_rows = all_rows[2:]
-
-        if not data_rows:
-            print("실제 데이터 행을 찾을 수 없습니다.")
-            return []
-
-        def get_text_from_cell(cell_div):
-            cl_text_element = cell_div.find(class_='cl-text')
-            if cl_text_element:
-                if cl_text_element.name == 'input':
-                    return cl_text_element.get('value', '').strip()
-                else:
-                    return cl_text_element.text.strip()
-            return ""
-
-        for i, row in enumerate(data_rows):
-            cols_divs = row.find_all('div', class_=lambda x: x and 'cl-grid-cell' in x)
-            if len(cols_divs) >= 7:
-                try:
-                    bus_id = get_text_from_cell(cols_divs[0])
-                    bus_type = get_text_from_cell(cols_divs[1])
-                    bus_number = get_text_from_cell(cols_divs[2])
-                    bus_vehicle = get_text_from_cell(cols_divs[3])
-                    bus_region = get_text_from_cell(cols_divs[4])
-                    bus_route_detail = get_text_from_cell(cols_divs[5])
-                    seats_info = get_text_from_cell(cols_divs[6])
-
-                    current_seats, total_seats = 0, 0
-                    if '/' in seats_info:
-                        try:
-                            current_seats, total_seats = map(int, seats_info.split('/'))
-                        except ValueError:
-                            pass
-
-                    bus_routes_data.append({
-                        "id": bus_id,
-                        "bus_type": bus_type,
-                        "bus_number": bus_number,
-                        "bus_vehicle": bus_vehicle,
-                        "bus_region": bus_region,
-                        "bus_route_detail": bus_route_detail,
-                        "current_seats": current_seats,
-                        "total_seats": total_seats
-                    })
-                except Exception as ex:
-                    logging.error(f"컬럼 데이터 추출 중 오류 (행 {i+1}, HTML 인덱스 {i+3}): {ex} - 행 내용: {row}", exc_info=True)
-                    continue
+        wait_for_grid(driver, before) # render_wait_<이유>로 기록됨
+
+        engine = resolve_engine(PARSER_ENGINE)
+        with perf_metrics.timer(f"parse_{engine}"):
+            if engine == "in_page":
+                bus_routes_data = rows_to_routes(extract_rows_in_page(driver))
             else:
-                logging.warning(f"불완전한 행 감지 (컬럼 수 부족, 행 {i+1}, HTML 인덱스 {i+3}): {len(cols_divs)}개 - 행 내용: {row}")
+                bus_routes_data = parse_grid(driver.page_source, engine)
 
     except Exception as e:
+        perf_metrics.increment("crawl_failures_selenium")
         logging.error(f"버스 스케줄 크롤링 중 치명적인 오류 발생: {e}", exc_info=True)
-        close_webdriver()
+        session_keeper.mark_stale() # 다음 크롤링 때 브라우저 재시작 없이 재로그인부터 시도
         raise
+    finally:
+        release_webdriver()
 
+    # 메모리가 상한을 넘었거나 한 브라우저로 너무 오래 크롤링했으면 지금 닫고 다음 크롤링 때 새로 띄움
+    reason = browser_watchdog.check()
+    if reason and session_keeper.recycle(reason):
+        browser_watchdog.record_recycle(reason)
     return bus_routes_data
 
 if __name__ == '__main__':
     print("login_crawler.py 단독 실행 (테스트 모드)")
     try:
-        from selenium.webdriver.chrome.service import Service
-        from selenium.webdriver.chrome.options import Options
-        
-        test_driver_options = Options()
-        _webdriver_local.driver = webdriver.Chrome(service=Service(executable_path=CHROMEDRIVER_PATH), options=test_driver_options)
+        session_keeper.driver_factory = lambda: _create_webdriver(headless=False)
 
-        bus_data = get_bus_schedule()
+        bus_data = get_bus_schedule_selenium()
         print("\n--- 크롤링된 버스 노선 정보 (단독 실행) ---")
         if bus_data:
             for route in bus_data:
@@ -0,0 +1,158 @@
+# 파일명: notification_outbox.py
+
+import asyncio
+import logging
+import discord
+
+import perf_metrics
+
+DISCORD_MESSAGE_LIMIT = 1990 # 디스코드 메시지 최대 길이(2000자)에 여유를 둔 값
+
+
+def _retry_after_seconds(error, default):
+    """429 응답의 Retry-After / X-RateLimit-Reset-After 헤더(또는 retry_after 속성)에서 대기 시간을 읽음."""
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after:
+        return float(retry_after)
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for header in ("Retry-After", "X-RateLimit-Reset-After"):
+        value = headers.get(header)
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    return default
+
+
+def merge_messages(texts, limit=DISCORD_MESSAGE_LIMIT):
+    """여러 알림을 빈 줄로 이어 붙여 limit자 이하의 최소 개수 메시지로 합침."""
+    merged = []
+    current = ""
+    for text in texts:
+        while len(text) > limit: # 알림 하나가 한도를 넘으면 잘라서 보냄
+            if current:
+                merged.append(current)
+                current = ""
+            merged.append(text[:limit])
+            text = text[limit:]
+        if not current:
+            current = text
+        elif len(current) + 2 + len(text) <= limit:
+            current += "\n\n" + text
+        else:
+            merged.append(current)
+            current = text
+    if current:
+        merged.append(current)
+    return merged
+
+
+class NotificationOutbox:
+    """
+    한 번의 폴링 주기 동안 생긴 알림을 모았다가 대상(채널/사용자 DM)별로 합쳐서 한꺼번에 보내는 발송함.
+    put()은 대기 없이 쌓기만 하므로 락을 잡은 상태에서 호출해도 되지만, flush()는 락 밖에서 호출해야 함.
+    동시에 전송 중인 대상 수는 max_concurrency개로 제한됨 (구독자가 수천 명이어도 요청이 한꺼번에 몰리지 않음).
+    """
+
+    def __init__(self, resolve_channel, max_retries=4, base_delay=1.0, max_concurrency=8):
+        self.resolve_channel = resolve_channel # async (대상 키) -> 메시지를 보낼 수 있는 객체 또는 None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_concurrency = max_concurrency
+        self._pending = {} # {대상 키: [text, ...]} (대상별 삽입 순서 유지)
+        self._slots = None # 전송 동시성 제한 세마포어 (이벤트 루프 안에서 처음 쓸 때 생성)
+        self._drainer = None # dispatch()가 띄운 백그라운드 전송 태스크
+
+        self.queued = 0
+        self.sent_messages = 0
+        self.retries = 0
+        self.dropped = 0
+
+    def put(self, target, text):
+        self._pending.setdefault(target, []).append(text)
+        self.queued += 1
+
+    def pending_count(self):
+        return sum(len(texts) for texts in self._pending.values())
+
+    async def flush(self):
+        """쌓인 알림을 대상별로 합쳐 전송. 대상끼리는 최대 max_concurrency개까지 동시에 보냄."""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        await asyncio.gather(*(self._flush_target(target, texts) for target, texts in pending.items()))
+
+    def dispatch(self):
+        """
+        쌓인 알림을 백그라운드 태스크에서 전송하고 바로 반환 (폴링 주기가 전송 완료를 기다리지 않음).
+        이미 전송 중이면 그 태스크가 끝난 뒤 새로 쌓인 알림까지 이어서 보냄. 전송 태스크를 반환.
+        """
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.get_running_loop().create_task(self._drain())
+        return self._drainer
+
+    async def _drain(self):
+        while self._pending:
+            await self.flush()
+
+    def stats(self):
+        return {
+            "queued": self.queued,
+            "sent_messages": self.sent_messages,
+            "retries": self.retries,
+            "dropped": self.dropped,
+            "pending": self.pending_count(),
+            "dispatching": self._drainer is not None and not self._drainer.done(),
+        }
+
+    async def _flush_target(self, target, texts):
+        async with self._slots:
+            await self._deliver(target, texts)
+
+    async def _deliver(self, target, texts):
+        try:
+            channel = await self.resolve_channel(target)
+        except Exception as e:
+            logging.error(f"알림 대상 ({target}) 조회 중 오류: {e}")
+            channel = None
+        if channel is None:
+            logging.error(f"알림 대상 ({target})을 찾을 수 없어 알림 {len(texts)}건을 버립니다.")
+            self.dropped += len(texts)
+            return
+        messages = merge_messages(texts)
+        logging.debug(f"{target}: 알림 {len(texts)}건을 메시지 {len(messages)}개로 합쳐 전송")
+        for content in messages:
+            await self._send_with_retry(channel, content)
+
+    async def _send_with_retry(self, channel, content):
+        for attempt in range(self.max_retries + 1):
+            try:
+                with perf_metrics.timer("discord_send"):
+                    await channel.send(content)
+                self.sent_messages += 1
+                return True
+            except discord.HTTPException as e:
+                if attempt == self.max_retries:
+                    break
+                if e.status == 429:
+                    perf_metrics.increment("discord_rate_limited")
+                    delay = _retry_after_seconds(e, self.base_delay * (2 ** attempt))
+                    logging.warning(f"디스코드 전송 제한(429): {delay:.2f}초 후 재시도")
+                elif e.status >= 500:
+                    delay = self.base_delay * (2 ** attempt)
+                    logging.warning(f"디스코드 서버 오류({e.status}): {delay:.2f}초 후 재시도")
+                else:
+                    logging.error(f"메시지 전송 실패 (재시도하지 않음): {e}")
+                    break
+                self.retries += 1
+                await asyncio.sleep(delay)
+            except Exception as e:
+                logging.error(f"메시지 전송 중 오류 발생: {e}", exc_info=True)
+                break
+        self.dropped += 1
+        perf_metrics.increment("discord_send_failures")
+        return False
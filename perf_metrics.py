@@ -0,0 +1,181 @@
+# 파일명: perf_metrics.py
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- 지연 시간 / 카운터 기록 ---
+WINDOW_SIZE = 512          # 지표마다 최근 이 개수의 측정값으로 백분위를 계산
+QUANTILES = (0.5, 0.95, 0.99)
+METRIC_PREFIX = "kumoh_bus"
+
+_lock = threading.Lock()   # 크롤러 스레드와 이벤트 루프가 같이 기록하므로 짧게 잡는 내부 락
+_latencies = {}            # {이름: _Series}
+_counters = {}             # {이름: 누적 횟수}
+_forwarded = None          # 크롤러 프로세스에서만 사용: 봇 프로세스로 넘길 기록 ([(이름, 초)], {이름: 증가량})
+
+
+class _Series:
+    """지표 하나의 최근 측정값 창 + 전체 누적 횟수/합계 (Prometheus summary의 _count/_sum)."""
+    __slots__ = ("window", "count", "total")
+
+    def __init__(self):
+        self.window = deque(maxlen=WINDOW_SIZE)
+        self.count = 0
+        self.total = 0.0
+
+
+def observe(name, seconds):
+    """지연 시간(초) 한 번 기록."""
+    with _lock:
+        series = _latencies.get(name)
+        if series is None:
+            series = _latencies[name] = _Series()
+        series.window.append(seconds)
+        series.count += 1
+        series.total += seconds
+        if _forwarded is not None:
+            _forwarded[0].append((name, seconds))
+
+
+def increment(name, amount=1):
+    """카운터 증가 (콜드 스타트, 실패 횟수 등)."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+        if _forwarded is not None:
+            _forwarded[1][name] = _forwarded[1].get(name, 0) + amount
+
+
+@contextmanager
+def timer(name):
+    """with 블록의 소요 시간을 name으로 기록. 예외가 나도 기록하고, 예외는 그대로 전달."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started)
+
+
+class TimedLock:
+    """
+    with 문으로 잡을 때 락을 기다린 시간을 lock_wait_<name>으로 기록하는 락 래퍼.
+    threading.Lock/RLock 대신 그대로 쓸 수 있음 (acquire/release/with 지원).
+    """
+
+    def __init__(self, name, lock=None):
+        self.name = f"lock_wait_{name}"
+        self._lock = lock if lock is not None else threading.Lock()
+
+    def acquire(self, blocking=True, timeout=-1):
+        started = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        if acquired:
+            observe(self.name, time.perf_counter() - started)
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def latency_summary():
+    """{이름: (전체 횟수, p50, p95, p99, 최대)} (초 단위, 백분위/최대는 최근 WINDOW_SIZE개 기준)."""
+    with _lock:
+        windows = {name: (series.count, sorted(series.window)) for name, series in _latencies.items() if series.window}
+    return {
+        name: (count,) + tuple(_percentile(ordered, q) for q in QUANTILES) + (ordered[-1],)
+        for name, (count, ordered) in windows.items()
+    }
+
+
+def counters():
+    with _lock:
+        return dict(_counters)
+
+
+def prometheus_text():
+    """Prometheus 텍스트 형식 (지연 시간은 summary, 카운터는 counter)."""
+    with _lock:
+        series = {name: (sorted(s.window), s.count, s.total) for name, s in _latencies.items()}
+        counts = dict(_counters)
+    lines = [f"# HELP {METRIC_PREFIX}_latency_seconds 크롤링/알림 단계별 지연 시간 (최근 {WINDOW_SIZE}개 기준 백분위)",
+             f"# TYPE {METRIC_PREFIX}_latency_seconds summary"]
+    for name, (ordered, count, total) in sorted(series.items()):
+        if ordered:
+            for q in QUANTILES:
+                lines.append(f'{METRIC_PREFIX}_latency_seconds{{name="{name}",quantile="{q}"}} {_percentile(ordered, q):.6f}')
+        lines.append(f'{METRIC_PREFIX}_latency_seconds_sum{{name="{name}"}} {total:.6f}')
+        lines.append(f'{METRIC_PREFIX}_latency_seconds_count{{name="{name}"}} {count}')
+    lines.append(f"# HELP {METRIC_PREFIX}_events_total 누적 횟수 (콜드 스타트, 실패 등)")
+    lines.append(f"# TYPE {METRIC_PREFIX}_events_total counter")
+    for name, value in sorted(counts.items()):
+        lines.append(f'{METRIC_PREFIX}_events_total{{name="{name}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def start_forwarding():
+    """(크롤러 프로세스에서) 이후 기록을 모아 두었다가 take_forwarded()로 봇 프로세스에 넘길 수 있게 함."""
+    global _forwarded
+    with _lock:
+        _forwarded = ([], {})
+
+
+def take_forwarded():
+    """start_forwarding() 이후 (또는 마지막 호출 이후) 기록된 (측정값 리스트, 카운터 증가량)을 꺼냄."""
+    global _forwarded
+    with _lock:
+        taken, _forwarded = _forwarded, ([], {})
+    return taken
+
+
+def merge(observations, counts):
+    """다른 프로세스에서 넘겨받은 기록을 이 프로세스의 지표에 더함."""
+    for name, seconds in observations:
+        observe(name, seconds)
+    for name, amount in counts.items():
+        increment(name, amount)
+
+
+def reset():
+    """모든 기록 삭제 (벤치마크/단독 실행용)."""
+    with _lock:
+        _latencies.clear()
+        _counters.clear()
+
+
+# --- Prometheus 텍스트 엔드포인트 (선택) ---
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # 스크레이프마다 로그가 쌓이지 않도록
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """http://host:port/metrics 에서 Prometheus 텍스트를 제공하는 서버를 데몬 스레드로 시작. 서버 객체를 반환."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logging.info(f"성능 지표 엔드포인트 시작: http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,111 @@
+# 파일명: portal_config.py
+
+import os
+
+# --- 포털 주소 설정 ---
+# 로컬 대역(stand-in) 서버로 테스트할 때는 KUMOH_PORTAL_URL 환경변수로 주소를 바꿀 수 있음
+PORTAL_BASE_URL = os.environ.get("KUMOH_PORTAL_URL", "https://kit.kumoh.ac.kr").rstrip("/")
+BUS_RESERVATION_URL = PORTAL_BASE_URL + "/jsp/administration/bus/bus_reservation.jsp"
+
+# --- HTTP 백엔드 요청 주소 (실험적, 확인 안 됨) ---
+# 아래 로그인/조회 주소, 폼 필드(user_id/user_password), 데이터셋 키, 컬럼명은 실제 포털에서 기록한 값이 아니라
+# 페이지 구조를 보고 추정한 값임. benchmarks/fake_portal.py도 같은 값으로 응답하므로 가짜 포털에서 동작하는 것은 검증이 아님.
+# 실제 요청은 python benchmarks/capture_portal.py capture 로 기록하고, check로 이 값들과 비교한 뒤 맞춰줄 것.
+LOGIN_URL = PORTAL_BASE_URL + os.environ.get("KUMOH_LOGIN_PATH", "/jsp/administration/bus/bus_login_proc.jsp")
+GRID_QUERY_PATH = os.environ.get("KUMOH_GRID_PATH", "/jsp/administration/bus/bus_reservation_list.jsp")
+GRID_QUERY_URL = PORTAL_BASE_URL + GRID_QUERY_PATH
+
+# 조회 응답(JSON)에서 노선 목록이 들어있는 데이터셋 키와, 그리드 컬럼 순서대로의 컬럼명
+GRID_DATASET_KEY = "ds_busList"
+GRID_COLUMNS = ("BUS_ID", "BUS_TYPE", "BUS_NO", "BUS_VEHICLE", "BUS_REGION", "BUS_ROUTE", "BUS_SEATS")
+
+# --- 그리드 준비 신호 (Selenium) ---
+# '조회' 클릭 뒤 끝난 XHR/fetch 요청 중 주소에 이 문자열이 들어간 것만 조회 완료 신호로 봄 (grid_readiness.wait_for_grid).
+# 다른 요청(세션 유지, 폴링, 통계)이 먼저 끝나도 이전 행을 '그대로'로 받아들이지 않도록 하기 위함.
+# 기본값은 위 조회 주소와 같은 추정값이므로 capture_portal.py capture 로 '조회' 때 나가는 요청 주소를 확인해 맞출 것.
+# 맞지 않으면 행이 다시 그려질 때까지 기다리고, 그대로인 경우에는 시간 초과 경고를 남김.
+GRID_QUERY_MATCH = os.environ.get("KUMOH_GRID_QUERY_MATCH", GRID_QUERY_PATH)
+
+# --- 크롤러 백엔드 선택 ---
+# "selenium"(기본): 헤드리스 크롬만 사용, "http": HTTP 세션만 사용, "auto": HTTP 세션 우선, 실패하면 Selenium으로 대체
+# HTTP 백엔드는 위 주소들을 실제 포털 요청과 맞춘 뒤에만 켤 것 (맞지 않으면 실제 계정 정보가 엉뚱한 주소로 전송되고,
+# auto에서는 쿨다운마다 실패하는 요청을 한 번 더 보냄)
+CRAWLER_BACKEND = os.environ.get("KUMOH_CRAWLER_BACKEND", "selenium")
+# capture_portal.py check가 실제 포털 기록과 위 값들이 맞는 것을 확인하면 확인한 값을 이 파일에 남김.
+# http/auto 백엔드는 이 파일의 값이 지금 설정과 같을 때만 로그인 요청을 보냄 (로컬 대역 서버 127.0.0.1/localhost는 예외).
+# 없거나 다르면 http는 조회를 거부하고, auto는 Selenium만 사용함
+PORTAL_VERIFIED_PATH = os.environ.get("KUMOH_PORTAL_VERIFIED", os.path.join(os.path.dirname(os.path.abspath(__file__)), "portal_verified.json"))
+HTTP_FALLBACK_COOLDOWN = 600 # HTTP 백엔드 실패 후 Selenium만 사용할 시간 (초)
+HTTP_TIMEOUT = 10            # HTTP 요청 타임아웃 (초)
+HTTP_POOL_MAXSIZE = 4        # keep-alive 커넥션 풀 크기
+
+# --- 크롤러 프로세스 ---
+# 크롤러(login_crawler: 크롬/Selenium/파서)를 봇과 분리된 자식 프로세스에서 실행함.
+# 크롤링이 멈추거나 파싱이 오래 걸려도 봇 프로세스(디스코드 하트비트, 명령 처리)는 영향을 받지 않음.
+# KUMOH_CRAWLER_PROCESS=0 이면 예전처럼 봇 프로세스 안의 크롤러 스레드에서 실행
+CRAWLER_PROCESS = os.environ.get("KUMOH_CRAWLER_PROCESS", "1") != "0"
+# 크롤러 프로세스가 요청 하나(로그인 포함 크롤링, 사전 준비)에 이 시간(초) 안에 답하지 않으면 멈춘 것으로 보고
+# 프로세스 트리(크롬 포함)를 강제 종료함. 다음 요청 때 새로 띄움
+CRAWLER_TIMEOUT = int(os.environ.get("KUMOH_CRAWLER_TIMEOUT", 180))
+
+# --- 브라우저(WebDriver) 세션 설정 ---
+# 마지막 크롤링 후 이 시간(초) 동안 쓰이지 않으면 크롬을 종료함.
+# 1시간 주기 갱신이 따뜻한 세션을 재사용할 수 있도록 기본값을 1시간보다 조금 길게 잡음.
+WEBDRIVER_IDLE_TTL = int(os.environ.get("KUMOH_WEBDRIVER_IDLE_TTL", 65 * 60))
+
+# 가벼운 크롬 프로필: 파서가 보지 않는 이미지/폰트/미디어 요청을 CDP로 막고, 확장/GPU/백그라운드 통신을 끄고,
+# 렌더러 프로세스 수와 JS 힙 크기를 제한함. 문제가 생기면 KUMOH_WEBDRIVER_LEAN=0 으로 기존 설정 사용
+WEBDRIVER_LEAN_PROFILE = os.environ.get("KUMOH_WEBDRIVER_LEAN", "1") != "0"
+# 막을 요청 주소 패턴 (Network.setBlockedURLs 와일드카드).
+# CSS는 막지 않음: 로그인 폼/그리드 표시 여부(offsetParent)로 로그인 상태를 판단하므로 스타일이 필요함
+WEBDRIVER_BLOCKED_URLS = (
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.webp", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3",
+)
+WEBDRIVER_JS_HEAP_MB = int(os.environ.get("KUMOH_WEBDRIVER_JS_HEAP_MB", 256)) # 렌더러 JS 힙 상한 (MB)
+
+# 브라우저 감시: chromedriver + 크롬 프로세스 트리 RSS가 이 값(MB)을 넘거나 한 브라우저로 이만큼 크롤링하면
+# 크롤링이 끝난 뒤 브라우저를 새로 띄움 (0이면 크롤링 수 제한 없음)
+WEBDRIVER_RSS_LIMIT_MB = int(os.environ.get("KUMOH_WEBDRIVER_RSS_LIMIT_MB", 1024))
+WEBDRIVER_MAX_CRAWLS = int(os.environ.get("KUMOH_WEBDRIVER_MAX_CRAWLS", 500))
+
+# --- 로그인 세션 저장 ---
+# 로그인 후 쿠키/웹 스토리지를 이 파일에 저장(권한 0600)해 두고, 브라우저/봇 재시작 때 전체 로그인 대신 복원함.
+# 파일에는 로그인된 세션 쿠키가 들어 있으므로 공유하지 말 것. 빈 문자열이면 저장하지 않음
+SESSION_STORE_PATH = os.environ.get("KUMOH_SESSION_STORE", "portal_session.json")
+SESSION_STORE_MAX_AGE = int(os.environ.get("KUMOH_SESSION_STORE_MAX_AGE", 12 * 60 * 60)) # 이보다 오래된 세션은 쓰지 않음 (초)
+
+# --- 그리드 파서 엔진 ---
+# "auto": 설치된 것 중 가장 빠른 엔진 (selectolax > lxml > bs4)
+# "bs4" / "lxml" / "selectolax": page_source를 해당 라이브러리로 파싱
+# "in_page": 브라우저 안에서 execute_script로 행 값만 JSON으로 받아옴 (page_source 전송 없음)
+PARSER_ENGINE = os.environ.get("KUMOH_PARSER_ENGINE", "auto")
+
+# --- 스냅샷 캐시 ---
+# 이 시간(초) 안에 크롤링한 스냅샷은 새로 크롤링하지 않고 그대로 사용
+SNAPSHOT_MAX_AGE = int(os.environ.get("KUMOH_SNAPSHOT_MAX_AGE", 60))
+# 모니터링 잡은 좌석 변화를 놓치지 않도록 더 짧은 기준을 사용
+MONITOR_SNAPSHOT_MAX_AGE = int(os.environ.get("KUMOH_MONITOR_SNAPSHOT_MAX_AGE", 20))
+
+# --- 적응형 폴링 ---
+POLL_MIN_INTERVAL = 30        # 좌석이 막 바뀌었거나 출발이 가까운 노선이 있을 때 (초)
+POLL_BASE_INTERVAL = 60       # 평소 모니터링 간격 (초)
+POLL_MAX_INTERVAL = 10 * 60   # 오래 변화가 없거나 야간일 때 모니터링 간격 상한 (초)
+POLL_IDLE_INTERVAL = 60 * 60  # 모니터링 대상이 없을 때 전체 갱신 간격 (초)
+POLL_NIGHT_HOURS = (1, 6)     # 야간 시간대 [시작시, 끝시)
+
+# --- 좌석 이력 저장소 (SQLite) ---
+HISTORY_DB_PATH = os.environ.get("KUMOH_HISTORY_DB", "bus_history.sqlite3")
+
+# --- 알림 전송 ---
+# 동시에 메시지를 보내는 대상(DM/채널) 수 상한. 디스코드 전역 전송 제한(초당 약 50회)보다 충분히 낮게 유지
+ALERT_MAX_CONCURRENCY = int(os.environ.get("KUMOH_ALERT_MAX_CONCURRENCY", 8))
+
+# --- 성능 지표 ---
+# 0이 아니면 http://127.0.0.1:<포트>/metrics 에서 Prometheus 텍스트 형식으로 지표를 제공
+METRICS_PORT = int(os.environ.get("KUMOH_METRICS_PORT", 0))
+
+# --- 로컬 읽기 API (대시보드/다른 봇용) ---
+# 0이 아니면 http://127.0.0.1:<포트>/snapshot (ETag/304), /events (롱폴링), /events/stream (SSE) 제공
+READ_API_PORT = int(os.environ.get("KUMOH_READ_API_PORT", 0))
@@ -0,0 +1,242 @@
+# 파일명: read_api.py
+# 대시보드/다른 봇 같은 로컬 소비자에게 현재 버스 스냅샷과 좌석 변화 이벤트를 HTTP로 제공 (읽기 전용).
+# 크롤러 하나가 만든 스냅샷을 여럿이 나눠 쓰므로, 소비자마다 포털에 크롬을 띄워 로그인할 필요가 없음.
+#   GET /snapshot                   현재 스냅샷 JSON. ETag를 주고 If-None-Match가 같으면 304 (본문 없음)
+#   GET /events?since=V&timeout=T   롱폴링: 버전 V 이후 변화 이벤트. 없으면 새 발행이 있거나 T초가 지날 때까지 기다림
+#   GET /events/stream?since=V      SSE: 발행마다 "event: seats" (id = 스냅샷 버전). Last-Event-ID로 이어 받기
+# 응답 본문은 스냅샷/발행 버전마다 한 번만 JSON으로 만들어 두고 모든 요청이 같은 바이트를 씀.
+# 봇 이벤트 루프 위에서 돌고 (aiohttp), 스냅샷은 SnapshotBoard에서 락 없이 읽음.
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+
+from aiohttp import web
+
+import perf_metrics
+from snapshot_board import EVENT_HISTORY
+
+MAX_POLL_TIMEOUT = 60      # 롱폴링 한 번에 기다리는 최대 시간 (초)
+DEFAULT_POLL_TIMEOUT = 25
+HEARTBEAT_INTERVAL = 15    # SSE 연결 유지용 주석 줄을 보내는 간격 (초, 프록시/클라이언트 유휴 타임아웃 방지)
+
+
+def route_json(route):
+    return route.to_dict() if route is not None else None
+
+
+def event_json(event):
+    """SeatEvent -> JSON 객체 (route는 새 상태, previous는 이전 상태. 추가/삭제면 한쪽이 null)."""
+    return {"kind": event.kind, "bus_id": event.bus_id, "route": route_json(event.route), "previous": route_json(event.previous)}
+
+
+def schedule_etag(schedule):
+    """스냅샷 ETag. 버전은 봇을 재시작하면 다시 쓰일 수 있으므로 크롤링 시각도 넣음."""
+    fetched = int(schedule.fetched_at.timestamp() * 1000) if schedule.fetched_at else 0
+    return f'"{schedule.version}-{fetched}"'
+
+
+def etag_matches(header, etag):
+    """If-None-Match 헤더(여러 개, *, 약한 비교 W/ 허용)에 etag가 있는지."""
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or any(value.removeprefix("W/") == etag for value in candidates)
+
+
+def parse_version(value, default):
+    try:
+        return int(value) if value not in (None, "") else default
+    except ValueError:
+        raise web.HTTPBadRequest(text="since는 정수(스냅샷 버전)여야 합니다.")
+
+
+class ReadApi:
+    """SnapshotBoard를 읽기 전용 HTTP로 공개하는 서버. start()/stop()은 봇 이벤트 루프에서 호출."""
+
+    def __init__(self, board, port, host="127.0.0.1"):
+        self.board = board
+        self.host = host
+        self.port = port
+        self._runner = None
+        self._loop = None
+        self._changed = None        # 다음 발행 때 set되는 asyncio.Event (발행마다 새로 만듦)
+        self._snapshot_body = (None, b"") # (스냅샷, 인코딩한 본문)
+        self._batches = OrderedDict()     # 발행 버전 -> 인코딩한 이벤트 리스트 (발행 기록 보관 개수만큼)
+        self._poll_bodies = (None, {})    # (스냅샷, since -> 롱폴링 응답 본문). 같은 버전에서 깨어난 요청들은 본문 하나를 나눠 씀
+        self.requests = 0
+        self.not_modified = 0
+        self.waiting = 0            # 지금 기다리는 롱폴링 요청 수
+        self.streams = 0            # 지금 열려 있는 SSE 연결 수
+        self.bytes_sent = 0
+
+    async def start(self):
+        """서버를 시작하고 실제 포트를 반환 (port=0이면 빈 포트를 고름)."""
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+        app = web.Application()
+        app.router.add_get("/snapshot", self.get_snapshot)
+        app.router.add_get("/events", self.get_events)
+        app.router.add_get("/events/stream", self.stream_events)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        self.board.add_listener(self._on_publish)
+        logging.info(f"읽기 API 시작: http://{self.host}:{self.port}/snapshot, /events, /events/stream")
+        return self.port
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # --- 발행 알림 ---
+    def _on_publish(self, schedule):
+        """(발행한 스레드에서) 기다리는 요청들을 이벤트 루프에서 깨우도록 넘김."""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def _wait_for_publish(self, changed, timeout):
+        """changed(상태를 확인하기 전에 잡아 둔 이벤트)가 set되거나 timeout초가 지날 때까지 기다림."""
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    # --- 인코딩 캐시 ---
+    def snapshot_body(self, schedule):
+        cached, body = self._snapshot_body
+        if cached is not schedule:
+            with perf_metrics.timer("read_api_encode_snapshot"):
+                body = json.dumps({
+                    "version": schedule.version,
+                    "fetched_at": schedule.fetched_at.isoformat() if schedule.fetched_at else None,
+                    "routes": [route.to_dict() for route in schedule.routes],
+                }, ensure_ascii=False).encode("utf-8")
+            self._snapshot_body = (schedule, body)
+        return body
+
+    def encoded_batch(self, version, events):
+        batch = self._batches.get(version)
+        if batch is None:
+            batch = self._batches[version] = [event_json(event) for event in events]
+            while len(self._batches) > EVENT_HISTORY:
+                self._batches.popitem(last=False)
+        return batch
+
+    def poll_body(self, since):
+        """(현재 스냅샷, since 이후 변화를 담은 롱폴링 응답 본문). since가 현재보다 크면 (봇 재시작) 빠짐 있음으로 봄."""
+        current, batches, complete = self.board.batches_since(since)
+        cached, bodies = self._poll_bodies
+        if cached is not current:
+            bodies = {}
+            self._poll_bodies = (current, bodies)
+        body = bodies.get(since)
+        if body is None:
+            complete = complete and since <= current.version
+            body = bodies[since] = json.dumps({
+                "version": current.version,
+                "fetched_at": current.fetched_at.isoformat() if current.fetched_at else None,
+                "complete": complete,
+                "events": [item for version, batch in batches for item in self.encoded_batch(version, batch)],
+            }, ensure_ascii=False).encode("utf-8")
+        return current, body
+
+    def _respond(self, body, status=200, headers=None):
+        self.bytes_sent += len(body)
+        return web.Response(body=body, status=status, content_type="application/json", charset="utf-8", headers=headers)
+
+    # --- 핸들러 ---
+    async def get_snapshot(self, request):
+        self.requests += 1
+        schedule = self.board.current
+        etag = schedule_etag(schedule)
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Snapshot-Version": str(schedule.version)}
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            self.not_modified += 1
+            perf_metrics.increment("read_api_not_modified")
+            return web.Response(status=304, headers=headers)
+        perf_metrics.increment("read_api_snapshot")
+        return self._respond(self.snapshot_body(schedule), headers=headers)
+
+    async def get_events(self, request):
+        """롱폴링. 응답의 version을 다음 요청의 since로 쓰면 이벤트를 빠짐없이/중복 없이 받음. complete=false면 /snapshot을 새로 받을 것."""
+        self.requests += 1
+        since = parse_version(request.query.get("since"), self.board.version)
+        try:
+            timeout = min(float(request.query.get("timeout", DEFAULT_POLL_TIMEOUT)), MAX_POLL_TIMEOUT)
+        except ValueError:
+            raise web.HTTPBadRequest(text="timeout은 초 단위 숫자여야 합니다.")
+        deadline = time.monotonic() + max(timeout, 0)
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            while True:
+                changed = self._changed # 확인 전에 잡아 둬야 확인과 대기 사이의 발행을 놓치지 않음
+                current, body = self.poll_body(since)
+                remaining = deadline - time.monotonic()
+                if current.version != since or remaining <= 0: # since가 현재와 다르면 새 이벤트나 빠짐 (complete=false)
+                    break
+                await self._wait_for_publish(changed, remaining)
+        finally:
+            self.waiting -= 1
+        perf_metrics.observe("read_api_poll", time.perf_counter() - started)
+        return self._respond(body)
+
+    async def stream_events(self, request):
+        """SSE. 발행마다 id(버전)와 이벤트를 보내고, 이어 받을 수 없을 만큼 밀렸으면 event: reset (스냅샷을 새로 받을 것)."""
+        self.requests += 1
+        since = parse_version(request.headers.get("Last-Event-ID") or request.query.get("since"), self.board.version)
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream; charset=utf-8", "Cache-Control": "no-cache",
+                                               "X-Accel-Buffering": "no"})
+        await response.prepare(request)
+        self.streams += 1
+        perf_metrics.increment("read_api_streams")
+        try:
+            await self._send(response, f"retry: 3000\n: 스냅샷 v{self.board.version}\n\n")
+            while True:
+                changed = self._changed
+                current, batches, complete = self.board.batches_since(since)
+                if not complete or since > current.version:
+                    await self._send(response, f"id: {current.version}\nevent: reset\ndata: {json.dumps({'version': current.version})}\n\n")
+                else:
+                    for version, batch in batches:
+                        if batch: # 변화가 없던 발행은 보내지 않고 버전만 넘어감
+                            data = json.dumps({"version": version, "events": self.encoded_batch(version, batch)}, ensure_ascii=False)
+                            await self._send(response, f"id: {version}\nevent: seats\ndata: {data}\n\n")
+                since = current.version
+                if changed.is_set():
+                    continue
+                try:
+                    await asyncio.wait_for(changed.wait(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    await self._send(response, ": ping\n\n")
+        except ConnectionResetError:
+            pass # 클라이언트가 연결을 끊음
+        finally:
+            self.streams -= 1
+        return response
+
+    async def _send(self, response, text):
+        data = text.encode("utf-8")
+        self.bytes_sent += len(data)
+        await response.write(data)
+
+    def stats(self):
+        return {
+            "url": f"http://{self.host}:{self.port}",
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "waiting": self.waiting,
+            "streams": self.streams,
+            "bytes_sent": self.bytes_sent,
+        }
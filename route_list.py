@@ -0,0 +1,78 @@
+# 파일명: route_list.py
+
+import perf_metrics
+
+EMBED_PAGE_LIMIT = 4000 # 임베드 설명 최대 길이(4096자)에 여유를 둔 값 (페이지 하나 = 임베드 하나)
+
+
+def filter_routes(schedule, keyword=None):
+    """키워드가 있으면 지역/버스 종류 보조 인덱스로 거른 노선, 없으면 전체 노선 (해당 노선이 없으면 빈 튜플)."""
+    if not keyword:
+        return schedule.routes
+    return schedule.by_region.get(keyword) or schedule.by_type.get(keyword) or ()
+
+
+def format_route(bus):
+    return (
+        f"[{bus.id}] {bus.bus_type} - {bus.bus_number} ({bus.bus_vehicle})\n"
+        f"  지역: {bus.bus_region}\n"
+        f"  노선: {bus.bus_route_detail}\n"
+        f"  좌석: {bus.current_seats}/{bus.total_seats}\n"
+        f"--------------------\n"
+    )
+
+
+def paginate_routes(routes, limit=EMBED_PAGE_LIMIT):
+    """
+    !list 페이지 본문들을 만듦 (디스코드 전송 없이 문자열 리스트만 반환하는 순수 함수).
+    노선 하나의 설명이 두 페이지에 걸치지 않게 나누고, 각 페이지는 limit자 이하 (노선이 없으면 빈 리스트).
+    """
+    pages = []
+    current_page = ""
+    for bus in routes:
+        bus_info = format_route(bus)
+        if current_page and len(current_page) + len(bus_info) > limit:
+            pages.append(current_page)
+            current_page = ""
+        current_page += bus_info
+    if current_page:
+        pages.append(current_page)
+    return pages
+
+
+class RoutePageCache:
+    """
+    (스냅샷, 필터 키워드) -> !list 페이지. 같은 스냅샷에서 같은 필터로 다시 부르면 만들어 둔 페이지를 그대로 돌려줌.
+    페이지는 render(노선들, 크롤링 시각, 키워드)가 만들고 (봇에서는 임베드 튜플), 새 스냅샷이 발행되면 이전 페이지는 모두 버림.
+    해당 노선이 없는 키워드는 저장하지 않음 (사용자가 아무 키워드나 입력해도 캐시가 커지지 않게).
+    """
+
+    def __init__(self, render):
+        self._render = render
+        self._schedule = None
+        self._pages = {}
+        self.hits = 0
+        self.renders = 0
+
+    def get(self, schedule, keyword=None):
+        """페이지 튜플 (해당 노선이 없으면 빈 튜플)."""
+        if schedule is not self._schedule: # 새 스냅샷 (버전이 바뀜)
+            self._schedule = schedule
+            self._pages = {}
+        keyword = keyword or None
+        pages = self._pages.get(keyword)
+        if pages is not None:
+            self.hits += 1
+            return pages
+        routes = filter_routes(schedule, keyword)
+        if not routes:
+            return ()
+        with perf_metrics.timer("list_render"):
+            pages = tuple(self._render(routes, schedule.fetched_at, keyword))
+        self._pages[keyword] = pages
+        self.renders += 1
+        return pages
+
+    def stats(self):
+        return {"hits": self.hits, "renders": self.renders, "cached": len(self._pages),
+                "version": self._schedule.version if self._schedule is not None else None}
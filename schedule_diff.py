@@ -0,0 +1,55 @@
+# 파일명: schedule_diff.py
+
+from dataclasses import dataclass
+
+# 이벤트 종류 (노선 하나당 가장 구체적인 이벤트 하나만 생성)
+SEATS_CHANGED = "seats_changed"       # 좌석 수 변화 (만석 여부는 그대로)
+BECAME_FULL = "became_full"           # 만석이 됨
+BECAME_AVAILABLE = "became_available" # 만석이었다가 자리가 남
+ROUTE_ADDED = "route_added"           # 새 노선이 나타남
+ROUTE_REMOVED = "route_removed"       # 노선이 사라짐
+
+# 좌석 수가 바뀐 것으로 취급하는 이벤트 종류
+SEAT_EVENT_KINDS = frozenset((SEATS_CHANGED, BECAME_FULL, BECAME_AVAILABLE))
+
+
+@dataclass(frozen=True, slots=True)
+class SeatEvent:
+    """두 스냅샷 사이에서 노선 하나에 일어난 변화."""
+    kind: str
+    bus_id: str
+    route: object     # 새 스냅샷의 BusRoute (ROUTE_REMOVED면 None)
+    previous: object  # 이전 스냅샷의 BusRoute (ROUTE_ADDED면 None)
+
+
+def diff_schedules(old, new):
+    """
+    이전/새 BusSchedule을 비교해 SeatEvent 리스트를 반환 (새 스냅샷의 노선 순서, 사라진 노선은 마지막).
+    좌석 지문(해시)이 같고 좌석 튜플도 같으면 바로 빈 리스트를 반환하므로 변화 없는 폴링은 노선별 비교를 하지 않음.
+    """
+    if old is None:
+        return []
+    if old.fingerprint == new.fingerprint and old.seat_key == new.seat_key: # 지문만 같으면 해시 충돌일 수 있음
+        return []
+
+    events = []
+    old_by_id = old.by_id
+    for route in new.routes:
+        previous = old_by_id.get(route.id)
+        if previous is None:
+            events.append(SeatEvent(ROUTE_ADDED, route.id, route, None))
+        elif previous.current_seats != route.current_seats or previous.total_seats != route.total_seats:
+            if route.is_full and not previous.is_full:
+                kind = BECAME_FULL
+            elif previous.is_full and not route.is_full:
+                kind = BECAME_AVAILABLE
+            else:
+                kind = SEATS_CHANGED
+            events.append(SeatEvent(kind, route.id, route, previous))
+
+    if len(old_by_id) + sum(1 for event in events if event.kind == ROUTE_ADDED) != len(new.by_id):
+        new_by_id = new.by_id
+        for previous in old.routes:
+            if previous.id not in new_by_id:
+                events.append(SeatEvent(ROUTE_REMOVED, previous.id, None, previous))
+    return events
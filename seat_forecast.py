@@ -0,0 +1,147 @@
+# 파일명: seat_forecast.py
+
+import threading
+from dataclasses import dataclass
+from datetime import timedelta
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class Forecast:
+    """노선 하나의 좌석 추세 예측."""
+    slope_per_hour: float  # 시간당 좌석 증감 (양수면 차는 중)
+    eta_full: object       # 만석 예상 시각 (datetime, 없으면 None)
+    eta_free: object       # 만석이 풀릴 예상 시각 (datetime, 없으면 None)
+
+
+class SeatForecaster:
+    """
+    모든 노선의 좌석 수 추세를 지수 가중 선형회귀로 한꺼번에 추정하는 예측기.
+    노선별 누적합(가중치, t, y, t², ty)만 NumPy 배열로 들고 있다가 스냅샷마다 갱신하므로,
+    한 번 갱신하는 비용은 기록 길이와 무관하게 노선 수에만 비례함.
+    시간 축은 항상 '마지막 스냅샷 = 0'(시간 단위)이 되도록 원점을 옮겨 수치 오차를 막음.
+    """
+
+    def __init__(self, half_life=30 * 60, min_weight=3.0, flat_slope=0.5, horizon_hours=6.0):
+        self.half_life = half_life       # 관측 가중치가 절반이 되는 시간 (초)
+        self.min_weight = min_weight     # 예측에 필요한 최소 누적 가중치 (관측 수에 해당)
+        self.flat_slope = flat_slope     # 시간당 이 값보다 적게 변하면 '변화 없음'으로 봄
+        self.horizon_hours = horizon_hours # 이보다 먼 예상 시각은 보고하지 않음
+        self._index = {}                 # {bus_id: 배열 인덱스}
+        self._sums = np.zeros((5, 0))    # 행: s0(가중치), st, sy, stt, sty
+        self._total = np.zeros(0)
+        self._last = np.zeros(0)
+        self._last_time = None           # 마지막 스냅샷 시각 (datetime)
+        self._lock = threading.Lock()
+        self._forecasts = (None, {})     # (계산한 시점의 updates, forecast_all 결과): 스냅샷이 새로 반영될 때까지 재사용
+        self.updates = 0
+
+    def _grow(self, new_ids):
+        start = len(self._index)
+        for offset, bus_id in enumerate(new_ids):
+            self._index[bus_id] = start + offset
+        extra = len(new_ids)
+        self._sums = np.concatenate([self._sums, np.zeros((5, extra))], axis=1)
+        self._total = np.concatenate([self._total, np.zeros(extra)])
+        self._last = np.concatenate([self._last, np.zeros(extra)])
+
+    def update(self, schedule):
+        """스냅샷 하나를 반영 (크롤링마다 호출)."""
+        if schedule.fetched_at is None or not schedule:
+            return
+        with self._lock:
+            new_ids = [route.id for route in schedule.routes if route.id not in self._index]
+            if new_ids:
+                self._grow(new_ids)
+            idx = np.fromiter((self._index[route.id] for route in schedule.routes), dtype=np.intp, count=len(schedule))
+            seats = np.fromiter((route.current_seats for route in schedule.routes), dtype=float, count=len(schedule))
+            totals = np.fromiter((route.total_seats for route in schedule.routes), dtype=float, count=len(schedule))
+
+            s0, st, sy, stt, sty = self._sums
+            if self._last_time is not None:
+                dt = (schedule.fetched_at - self._last_time).total_seconds() / 3600.0
+                if dt < 0:
+                    return # 순서가 뒤바뀐 스냅샷은 무시
+                # 원점을 dt만큼 뒤로 옮김 (t -> t - dt): 지난 관측 시각이 모두 -dt만큼 이동
+                stt -= 2 * dt * st - dt * dt * s0
+                sty -= dt * sy
+                st -= dt * s0
+                # 오래된 관측일수록 가중치 감소
+                self._sums *= 0.5 ** (dt * 3600.0 / self.half_life)
+
+            # 새 관측은 t = 0이므로 st, stt, sty에는 더할 것이 없음
+            s0[idx] += 1.0
+            sy[idx] += seats
+            self._total[idx] = totals
+            self._last[idx] = seats
+            self._last_time = schedule.fetched_at
+            self.updates += 1
+
+    def _estimate(self):
+        """모든 노선의 (기울기, 현재 추정값)을 벡터 연산으로 계산."""
+        s0, st, sy, stt, sty = self._sums
+        denom = s0 * stt - st * st
+        ok = (s0 >= self.min_weight) & (denom > 1e-9)
+        slope = np.zeros_like(s0)
+        np.divide(s0 * sty - st * sy, denom, out=slope, where=ok)
+        level = np.zeros_like(s0)
+        np.divide(sy - slope * st, s0, out=level, where=s0 > 0)
+        return slope, level, ok
+
+    def forecast_all(self):
+        """
+        {bus_id: Forecast} (예측할 만큼 기록이 쌓인 노선만). 결과는 다음 update 전까지 캐시해 두고
+        같은 dict를 돌려주므로 호출한 쪽에서 바꾸지 말 것.
+        """
+        with self._lock:
+            if self._last_time is None:
+                return {}
+            computed_at, cached = self._forecasts
+            if computed_at == self.updates:
+                return cached
+            slope, level, ok = self._estimate()
+            total, last = self._total, self._last
+            # 만석까지 남은 시간 (차는 중인 노선) / 만석 해제까지 남은 시간 (만석이면서 줄어드는 추세)
+            rising = ok & (slope > self.flat_slope) & (last < total)
+            falling = ok & (slope < -self.flat_slope) & (last >= total)
+            hours_to_full = np.full_like(slope, np.inf)
+            hours_to_free = np.full_like(slope, np.inf)
+            np.divide(total - level, slope, out=hours_to_full, where=rising)
+            np.divide(level - (total - 1), -slope, out=hours_to_free, where=falling)
+            base = self._last_time
+            result = {}
+            for bus_id, i in self._index.items():
+                if not ok[i]:
+                    continue
+                result[bus_id] = Forecast(
+                    float(slope[i]),
+                    self._eta(base, hours_to_full[i]),
+                    self._eta(base, hours_to_free[i]),
+                )
+            self._forecasts = (self.updates, result)
+            return result
+
+    def _eta(self, base, hours):
+        if not np.isfinite(hours) or hours > self.horizon_hours:
+            return None
+        return base + timedelta(hours=max(0.0, float(hours)))
+
+    def forecast(self, bus_id):
+        return self.forecast_all().get(bus_id)
+
+    def is_flat(self, bus_id, forecasts=None):
+        """충분한 기록이 있고 좌석이 거의 움직이지 않을 것으로 예측되면 True. forecasts: 이미 구한 forecast_all() 결과."""
+        forecast = (forecasts if forecasts is not None else self.forecast_all()).get(bus_id)
+        return forecast is not None and abs(forecast.slope_per_hour) < self.flat_slope
+
+
+def describe_forecast(forecast):
+    """알림/목록에 붙일 짧은 예측 문구 (예측이 없으면 빈 문자열)."""
+    if forecast is None:
+        return ""
+    if forecast.eta_full is not None:
+        return f"예상 만석: {forecast.eta_full.strftime('%H:%M')}경 (시간당 +{forecast.slope_per_hour:.1f}석)"
+    if forecast.eta_free is not None:
+        return f"예상 만석 해제: {forecast.eta_free.strftime('%H:%M')}경 (시간당 {forecast.slope_per_hour:.1f}석)"
+    return f"추세: 시간당 {round(forecast.slope_per_hour, 1) + 0.0:+.1f}석"
@@ -0,0 +1,213 @@
+# 파일명: seat_history.py
+
+import logging
+import sqlite3
+import statistics
+import threading
+import time
+from datetime import datetime
+
+from bus_model import BusRoute, BusSchedule
+from schedule_diff import diff_schedules, ROUTE_ADDED, ROUTE_REMOVED
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+-- 노선별 최신 상태 (시작 시 마지막 스냅샷 복원용)
+CREATE TABLE IF NOT EXISTS routes (
+    bus_id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    bus_type TEXT NOT NULL,
+    bus_number TEXT NOT NULL,
+    bus_vehicle TEXT NOT NULL,
+    bus_region TEXT NOT NULL,
+    bus_route_detail TEXT NOT NULL,
+    current_seats INTEGER NOT NULL,
+    total_seats INTEGER NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1
+);
+-- 좌석 변화 기록 (델타): 좌석 수가 바뀐 노선만 한 행씩 추가
+CREATE TABLE IF NOT EXISTS seat_samples (
+    bus_id TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    current_seats INTEGER NOT NULL,
+    total_seats INTEGER NOT NULL,
+    PRIMARY KEY (bus_id, taken_at)
+) WITHOUT ROWID;
+"""
+
+
+class SeatHistoryStore:
+    """
+    크롤링 스냅샷을 SQLite(WAL)에 누적 저장하는 저장소.
+    좌석이 바뀐 노선만 seat_samples에 기록하므로, 변화 없는 폴링은 meta 한 행 갱신으로 끝남.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+        self._last = None # 마지막으로 기록한 BusSchedule
+        # 조회(!history, 예측) 전용 연결 하나를 계속 씀 (WAL이라 기록과 동시에 읽을 수 있고, 기록 락을 기다리지 않음)
+        self._reader_lock = threading.Lock()
+        self._reader = sqlite3.connect(self.path, check_same_thread=False)
+        self._reader.execute("PRAGMA query_only=ON")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _set_meta(self, key, value):
+        self._conn.execute("INSERT INTO meta(key, value) VALUES (?, ?) "
+                           "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, str(value)))
+
+    def append(self, schedule):
+        """스냅샷 하나를 기록. 기록한 좌석 변화 행 수를 반환."""
+        taken_at = (schedule.fetched_at or datetime.now()).timestamp()
+        with self._lock, self._conn:
+            if self._last is None:
+                self._write_full(schedule, taken_at)
+                written = len(schedule)
+            else:
+                events = diff_schedules(self._last, schedule)
+                written = self._write_delta(schedule, events, taken_at)
+            self._set_meta("last_snapshot_at", taken_at)
+            self._set_meta("last_version", schedule.version)
+            self._last = schedule
+        return written
+
+    def _write_full(self, schedule, taken_at):
+        self._conn.execute("UPDATE routes SET active = 0")
+        self._upsert_routes(schedule.routes, {route.id: index for index, route in enumerate(schedule.routes)})
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO seat_samples(bus_id, taken_at, current_seats, total_seats) VALUES (?, ?, ?, ?)",
+            [(route.id, taken_at, route.current_seats, route.total_seats) for route in schedule.routes],
+        )
+
+    def _write_delta(self, schedule, events, taken_at):
+        if not events:
+            return 0
+        positions = {route.id: index for index, route in enumerate(schedule.routes)}
+        changed = [event.route for event in events if event.kind != ROUTE_REMOVED]
+        removed = [(event.bus_id,) for event in events if event.kind == ROUTE_REMOVED]
+        if removed or any(event.kind == ROUTE_ADDED for event in events):
+            # 노선 구성이 바뀌면 순서를 다시 맞춤 (드문 경우)
+            self._conn.executemany("UPDATE routes SET position = ? WHERE bus_id = ?",
+                                   [(index, bus_id) for bus_id, index in positions.items()])
+        self._upsert_routes(changed, positions)
+        self._conn.executemany("UPDATE routes SET active = 0 WHERE bus_id = ?", removed)
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO seat_samples(bus_id, taken_at, current_seats, total_seats) VALUES (?, ?, ?, ?)",
+            [(route.id, taken_at, route.current_seats, route.total_seats) for route in changed],
+        )
+        return len(changed)
+
+    def _upsert_routes(self, routes, positions):
+        self._conn.executemany(
+            "INSERT INTO routes(bus_id, position, bus_type, bus_number, bus_vehicle, bus_region, bus_route_detail, "
+            "current_seats, total_seats, active) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1) "
+            "ON CONFLICT(bus_id) DO UPDATE SET position = excluded.position, bus_type = excluded.bus_type, "
+            "bus_number = excluded.bus_number, bus_vehicle = excluded.bus_vehicle, bus_region = excluded.bus_region, "
+            "bus_route_detail = excluded.bus_route_detail, current_seats = excluded.current_seats, "
+            "total_seats = excluded.total_seats, active = 1",
+            [(route.id, positions[route.id], route.bus_type, route.bus_number, route.bus_vehicle, route.bus_region,
+              route.bus_route_detail, route.current_seats, route.total_seats) for route in routes],
+        )
+
+    def load_latest(self):
+        """마지막으로 기록한 스냅샷을 복원 (기록이 없으면 None)."""
+        with self._lock:
+            meta = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+            if "last_snapshot_at" not in meta:
+                return None
+            rows = self._conn.execute(
+                "SELECT bus_id, bus_type, bus_number, bus_vehicle, bus_region, bus_route_detail, current_seats, total_seats "
+                "FROM routes WHERE active = 1 ORDER BY position"
+            ).fetchall()
+            schedule = BusSchedule(
+                (BusRoute(*row) for row in rows),
+                datetime.fromtimestamp(float(meta["last_snapshot_at"])),
+                int(meta.get("last_version", 0)),
+            )
+            self._last = schedule
+        logging.info(f"좌석 이력 저장소에서 마지막 스냅샷 복원 ({len(schedule)}개 노선, {schedule.fetched_at})")
+        return schedule
+
+    def samples(self, bus_id, since_seconds):
+        """
+        노선 하나의 좌석 기록 [(시각 timestamp, current_seats, total_seats)] (오래된 순).
+        좌석이 바뀔 때만 기록하므로, 기간 시작 시점의 상태를 알 수 있게 기간 직전의 마지막 기록 하나를 맨 앞에 붙임
+        (그 행의 시각은 기간 시작보다 이름).
+        """
+        since = time.time() - since_seconds
+        with self._reader_lock:
+            # 직전 기록과 기간 내 기록 모두 기본 키 (bus_id, taken_at) 인덱스로 조회
+            return self._reader.execute(
+                "SELECT * FROM (SELECT taken_at, current_seats, total_seats FROM seat_samples "
+                "WHERE bus_id = ? AND taken_at < ? ORDER BY taken_at DESC LIMIT 1) "
+                "UNION ALL SELECT taken_at, current_seats, total_seats FROM seat_samples "
+                "WHERE bus_id = ? AND taken_at >= ? ORDER BY taken_at", (bus_id, since, bus_id, since)
+            ).fetchall()
+
+    def close(self):
+        with self._reader_lock:
+            self._reader.close()
+        with self._lock:
+            self._conn.close()
+
+
+# --- 이력 분석 ---
+_SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+def fill_curve(samples, start, end, buckets=24):
+    """기간을 buckets개 구간으로 나눠 구간 끝 시점의 채움 비율을 막대 문자로 표현 (기록 전 구간은 공백)."""
+    if not samples or end <= start:
+        return ""
+    step = (end - start) / buckets
+    curve = []
+    index = 0
+    last = None
+    for bucket in range(buckets):
+        bucket_end = start + step * (bucket + 1)
+        while index < len(samples) and samples[index][0] <= bucket_end:
+            last = samples[index]
+            index += 1
+        if last is None or last[2] <= 0:
+            curve.append(" ")
+        else:
+            ratio = min(1.0, last[1] / last[2])
+            curve.append(_SPARK_CHARS[min(len(_SPARK_CHARS) - 1, int(ratio * len(_SPARK_CHARS)))])
+    return "".join(curve)
+
+
+def time_to_full(samples):
+    """
+    만석이 아니던 시점부터 만석이 되기까지 걸린 시간(초) 목록.
+    (기록 시작 또는 만석 해제 시점부터, 다시 만석이 처음 관측된 시점까지. samples의 첫 행이 기간 직전 기록이면
+    기간 전에 자리가 난 경우도 실제로 자리가 난 시점부터 잼)
+    """
+    durations = []
+    open_since = None
+    for taken_at, current_seats, total_seats in samples:
+        full = current_seats == total_seats
+        if full:
+            if open_since is not None:
+                durations.append(taken_at - open_since)
+                open_since = None
+        elif open_since is None:
+            open_since = taken_at
+    return durations
+
+
+def summarize_durations(durations):
+    """(횟수, 중앙값, 최소, 최대) 초 단위. 기록이 없으면 None."""
+    if not durations:
+        return None
+    return len(durations), statistics.median(durations), min(durations), max(durations)
@@ -0,0 +1,212 @@
+# 파일명: session_keeper.py
+
+import logging
+import threading
+import time
+
+import perf_metrics
+
+# 세션 상태 점검 결과
+SESSION_OK = "ok"            # 로그인된 예약 페이지에 있음
+SESSION_EXPIRED = "expired"  # 브라우저는 살아 있지만 로그인이 풀렸거나 다른 페이지에 있음
+SESSION_DEAD = "dead"        # 브라우저/드라이버 세션 자체가 죽음
+
+
+class WebDriverSessionKeeper:
+    """
+    로그인된 WebDriver 하나를 오래 유지하는 관리자.
+    매 사용 전 가벼운 상태 점검을 하고, 로그인이 풀린 경우에만 같은 브라우저에서 다시 로그인함.
+    마지막 사용 후 idle_ttl초가 지나면 브라우저를 종료함.
+    """
+
+    def __init__(self, driver_factory, login_fn, probe_fn, idle_ttl, on_quit=None, resume_fn=None):
+        self.driver_factory = driver_factory # () -> driver
+        self.login_fn = login_fn             # (driver) -> None, 로그인 후 iframe 안에 있어야 함
+        self.probe_fn = probe_fn             # (driver) -> SESSION_OK / SESSION_EXPIRED / SESSION_DEAD
+        self.idle_ttl = idle_ttl
+        self.on_quit = on_quit               # (driver) -> None, 드라이버를 닫은 뒤 호출 (남은 프로세스 정리 등)
+        self.resume_fn = resume_fn           # (driver) -> bool, 콜드 스타트 때 저장된 세션 복원 시도 (실패하면 login_fn)
+
+        self._driver = None
+        self._stale = False       # 직전 크롤링 실패 등으로 다시 로그인이 필요한 상태
+        self._in_use = 0
+        self._generation = 0      # 유휴 종료 타이머가 오래된 것인지 구분하기 위한 세대 번호
+        self._idle_timer = None
+        self._last_used = None
+        self._lock = perf_metrics.TimedLock("webdriver_lock", threading.RLock()) # 기다린 시간은 lock_wait_webdriver_lock
+
+        self.cold_starts = 0
+        self.cold_starts_avoided = 0
+        self.reauths = 0
+        self.idle_teardowns = 0
+        self.recycles = 0
+        self.resumes = 0
+
+    def acquire(self):
+        """로그인된 드라이버를 반환. 필요할 때만 재로그인/재시작함."""
+        with self._lock:
+            self._cancel_idle_timer()
+            self._in_use += 1
+            try:
+                if self._driver is None:
+                    self._cold_start()
+                    return self._driver
+
+                state = SESSION_EXPIRED if self._stale else self._probe()
+                if state == SESSION_DEAD:
+                    logging.warning("WebDriver 세션이 응답하지 않아 브라우저를 새로 시작합니다.")
+                    self._quit_driver()
+                    self._cold_start()
+                elif state == SESSION_EXPIRED:
+                    self.reauthenticate()
+                    self.cold_starts_avoided += 1
+                else:
+                    self.cold_starts_avoided += 1
+                return self._driver
+            except Exception:
+                self._in_use -= 1
+                raise
+
+    def release(self):
+        """크롤링이 끝났음을 알림. 사용 중인 곳이 없으면 유휴 종료 타이머를 시작함."""
+        with self._lock:
+            self._in_use = max(0, self._in_use - 1)
+            self._last_used = time.monotonic()
+            if self._in_use == 0 and self._driver is not None:
+                self._start_idle_timer()
+
+    def mark_stale(self):
+        """다음 사용 시 같은 브라우저에서 다시 로그인하도록 표시 (크롤링 실패 시 호출)."""
+        with self._lock:
+            self._stale = True
+
+    def reauthenticate(self):
+        """브라우저를 재시작하지 않고 현재 드라이버로 다시 로그인."""
+        with self._lock:
+            try:
+                self.login_fn(self._driver)
+            except Exception:
+                # 재로그인조차 실패하면 다음 사용 시 브라우저를 새로 시작하도록 정리
+                perf_metrics.increment("login_failures")
+                self._quit_driver()
+                raise
+            self._stale = False
+            self.reauths += 1
+            perf_metrics.increment("webdriver_reauths")
+            logging.info(f"기존 WebDriver로 재로그인 완료. (누적 재로그인 {self.reauths}회)")
+
+    def recycle(self, reason):
+        """사용 중인 곳이 없으면 브라우저를 닫아 다음 사용 때 새로 띄우게 함 (메모리 누수 대비). 닫았으면 True."""
+        with self._lock:
+            if self._in_use > 0 or self._driver is None:
+                return False
+            logging.info(f"WebDriver를 새로 시작하기 위해 종료합니다: {reason}")
+            self._cancel_idle_timer()
+            self._quit_driver()
+            self.recycles += 1
+            return True
+
+    def close(self):
+        """드라이버를 즉시 종료."""
+        with self._lock:
+            self._cancel_idle_timer()
+            self._quit_driver()
+
+    def stats(self):
+        """통계 조회. 콜드 스타트 중에도 기다리지 않도록 락 없이 읽음 (값은 대략적인 스냅샷)."""
+        idle_for = None
+        if self._driver is not None and self._in_use == 0 and self._last_used is not None:
+            idle_for = time.monotonic() - self._last_used
+        return {
+            "alive": self._driver is not None,
+            "in_use": self._in_use,
+            "idle_seconds": idle_for,
+            "idle_ttl": self.idle_ttl,
+            "cold_starts": self.cold_starts,
+            "cold_starts_avoided": self.cold_starts_avoided,
+            "reauths": self.reauths,
+            "idle_teardowns": self.idle_teardowns,
+            "recycles": self.recycles,
+            "resumes": self.resumes,
+        }
+
+    # --- 내부 함수 ---
+    def _cold_start(self):
+        with perf_metrics.timer("webdriver_cold_start"): # 브라우저 시작 + 세션 복원 또는 로그인
+            driver = self.driver_factory()
+            self._driver = driver
+            self.cold_starts += 1
+            perf_metrics.increment("webdriver_cold_starts")
+            resumed = self._resume(driver)
+            if not resumed:
+                try:
+                    self.login_fn(driver)
+                except Exception:
+                    perf_metrics.increment("login_failures")
+                    self._quit_driver()
+                    raise
+        self._stale = False
+        logging.info(f"WebDriver 콜드 스타트 및 {'세션 복원' if resumed else '로그인'} 완료. "
+                     f"(콜드 스타트 {self.cold_starts}회, 회피 {self.cold_starts_avoided}회, 세션 복원 {self.resumes}회)")
+
+    def _resume(self, driver):
+        if self.resume_fn is None:
+            return False
+        try:
+            with perf_metrics.timer("session_resume"):
+                resumed = self.resume_fn(driver)
+        except Exception as e:
+            logging.warning(f"저장된 세션 복원 실패, 전체 로그인으로 진행: {e}")
+            resumed = False
+        if resumed:
+            self.resumes += 1
+            perf_metrics.increment("session_resumes")
+        return resumed
+
+    def _probe(self):
+        try:
+            with perf_metrics.timer("session_probe"):
+                return self.probe_fn(self._driver)
+        except Exception as e:
+            logging.warning(f"WebDriver 상태 점검 실패: {e}")
+            perf_metrics.increment("webdriver_dead_sessions")
+            return SESSION_DEAD
+
+    def _quit_driver(self):
+        if self._driver is not None:
+            driver = self._driver
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"WebDriver 종료 중 오류 발생: {e}")
+            finally:
+                self._driver = None
+                self._stale = False
+                print("WebDriver 인스턴스 닫음.")
+            if self.on_quit is not None:
+                try:
+                    self.on_quit(driver) # quit()이 실패해도 남은 프로세스는 여기서 정리
+                except Exception as e:
+                    logging.warning(f"WebDriver 종료 후 정리 중 오류: {e}")
+
+    def _start_idle_timer(self):
+        self._generation += 1
+        generation = self._generation
+        self._idle_timer = threading.Timer(self.idle_ttl, self._idle_teardown, args=(generation,))
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _cancel_idle_timer(self):
+        self._generation += 1
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _idle_teardown(self, generation):
+        with self._lock:
+            if generation != self._generation or self._in_use > 0 or self._driver is None:
+                return
+            logging.info(f"WebDriver가 {self.idle_ttl}초 동안 사용되지 않아 종료합니다.")
+            self._idle_timer = None
+            self._quit_driver()
+            self.idle_teardowns += 1
@@ -0,0 +1,117 @@
+# 파일명: session_store.py
+
+import json
+import logging
+import os
+import time
+
+from portal_config import PORTAL_BASE_URL, SESSION_STORE_PATH, SESSION_STORE_MAX_AGE
+
+# 저장/복원하는 쿠키 속성 (CDP Network.setCookies의 CookieParam과 같은 이름)
+COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+
+def _clean_cookie(cookie):
+    cleaned = {key: cookie[key] for key in COOKIE_FIELDS if cookie.get(key) is not None}
+    if cleaned.get("expires", 0) <= 0:
+        cleaned.pop("expires", None) # 세션 쿠키
+    return cleaned
+
+
+class SessionStore:
+    """
+    로그인된 포털 세션(쿠키 + localStorage/sessionStorage)을 파일 하나에 저장하고 복원함.
+    브라우저 재시작이나 봇 재시작 때 전체 로그인 대신 쿠키를 넣고 페이지 한 번만 불러오기 위해 사용.
+    파일은 소유자만 읽을 수 있게(0600) 임시 파일에 쓴 뒤 교체함. 비밀번호는 저장하지 않음.
+    """
+
+    def __init__(self, path, max_age, origin=PORTAL_BASE_URL):
+        self.path = path
+        self.max_age = max_age
+        self.origin = origin # 다른 포털 주소(예: 로컬 대역 서버)에서 저장된 세션은 쓰지 않음
+        self.saves = 0
+        self.loads = 0
+
+    def __bool__(self):
+        return bool(self.path)
+
+    def save(self, cookies, local_storage=None, session_storage=None):
+        """
+        쿠키 리스트(dict)와 웹 스토리지를 저장. 저장 실패는 로그만 남김 (다음에 전체 로그인하면 됨).
+        스토리지를 None으로 주면 (쿠키만 있는 HTTP 로그인) 기존 기록의 스토리지를 그대로 둠.
+        빈 dict는 실제로 비어 있는 것으로 보고 덮어씀.
+        """
+        if not self.path:
+            return
+        if local_storage is None or session_storage is None:
+            previous = self._read() or {}
+            if previous.get("origin") != self.origin:
+                previous = {}
+            if local_storage is None:
+                local_storage = previous.get("local_storage") or {}
+            if session_storage is None:
+                session_storage = previous.get("session_storage") or {}
+        data = {
+            "origin": self.origin,
+            "saved_at": time.time(),
+            "cookies": [_clean_cookie(cookie) for cookie in cookies],
+            "local_storage": local_storage,
+            "session_storage": session_storage,
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path) # 원자적 교체: 읽는 쪽은 이전 파일 아니면 새 파일만 봄
+            self.saves += 1
+            logging.info(f"로그인 세션 저장 완료 (쿠키 {len(data['cookies'])}개).")
+        except OSError as e:
+            logging.warning(f"로그인 세션 저장 실패: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _read(self):
+        """파일에 있는 기록 그대로 (검사 없음). 없거나 깨졌으면 None (깨진 파일은 삭제)."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"저장된 로그인 세션을 읽을 수 없어 삭제합니다: {e}")
+            self.clear()
+            return None
+
+    def load(self):
+        """저장된 세션 dict. 없거나, 깨졌거나, max_age초보다 오래됐거나, 포털 주소가 다르면 None."""
+        if not self.path:
+            return None
+        data = self._read()
+        if data is None:
+            return None
+        if data.get("origin") != self.origin or not data.get("cookies"):
+            return None
+        if time.time() - data.get("saved_at", 0) > self.max_age:
+            logging.info("저장된 로그인 세션이 오래되어 사용하지 않습니다.")
+            return None
+        self.loads += 1
+        return data
+
+    def clear(self):
+        if not self.path:
+            return
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(f"저장된 로그인 세션 삭제 실패: {e}")
+
+
+# Selenium/HTTP 백엔드가 함께 쓰는 세션 저장소 (경로가 비어 있으면 저장/복원하지 않음)
+session_store = SessionStore(SESSION_STORE_PATH, SESSION_STORE_MAX_AGE)
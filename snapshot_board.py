@@ -0,0 +1,81 @@
+# 파일명: snapshot_board.py
+
+import logging
+from collections import deque
+
+import perf_metrics
+
+EVENT_HISTORY = 64 # 발행 기록(스냅샷 버전별 변화 이벤트)을 이만큼만 보관
+
+
+class SnapshotBoard:
+    """
+    현재 버스 스냅샷을 가리키는 참조 하나 (copy-on-write 발행).
+    읽는 쪽은 락 없이 board.current로 참조만 가져감: 스냅샷(BusSchedule)은 변경 불가이고 참조 교체는 원자적이므로
+    교체 전 스냅샷이나 교체 후 스냅샷 중 하나를 통째로 봄. 발행은 새 스냅샷 객체를 만든 뒤 참조만 바꿈.
+    발행자끼리(크롤러 스레드, 재시작 때 스냅샷 복원)는 짧은 락으로 비교 후 교체(compare_and_publish)함. 읽는 쪽은 이 락을 잡지 않음.
+    발행할 때 이전 스냅샷과의 변화 이벤트를 버전과 함께 기록해 두면, 소비자(모니터링 잡)는 마지막으로 본 버전 이후의 이벤트를 가져감.
+    """
+
+    def __init__(self, initial):
+        self._current = initial
+        self._publish_lock = perf_metrics.TimedLock("snapshot_publish") # 발행자끼리만, 기다린 시간은 !perf에 표시
+        self._events = deque(maxlen=EVENT_HISTORY) # [(버전, 그 버전에서 생긴 이벤트 튜플)], 변화가 없던 발행도 기록
+        self._listeners = []
+        self.publishes = 0
+        self.conflicts = 0 # 비교 후 교체가 다른 발행자 때문에 실패한 횟수
+
+    @property
+    def current(self):
+        return self._current
+
+    @property
+    def version(self):
+        return self._current.version
+
+    def compare_and_publish(self, expected, schedule, events=()):
+        """
+        현재 스냅샷이 아직 expected이면 schedule로 교체하고 True. 그 사이 다른 발행자가 바꿨으면 교체하지 않고 False
+        (호출한 쪽이 새 현재 스냅샷을 기준으로 다시 만들어 발행).
+        """
+        with self._publish_lock:
+            if self._current is not expected:
+                self.conflicts += 1
+                return False
+            self._events.append((schedule.version, tuple(events)))
+            self._current = schedule
+            self.publishes += 1
+        for listener in self._listeners:
+            try:
+                listener(schedule)
+            except Exception as e:
+                logging.error(f"스냅샷 발행 알림 처리 중 오류: {e}", exc_info=True)
+        return True
+
+    def add_listener(self, callback):
+        """발행할 때마다 callback(새 스냅샷)을 발행한 스레드에서 호출 (짧게 끝나야 함. 다른 루프로 넘길 때는 call_soon_threadsafe)."""
+        self._listeners.append(callback)
+
+    def batches_since(self, version):
+        """
+        (현재 스냅샷, version 이후 발행 기록 [(버전, 이벤트 튜플)], 빠짐없이 모두 가져왔는지 여부).
+        보관 개수를 넘게 밀렸으면 complete=False (호출한 쪽이 스냅샷을 직접 비교하거나 새로 받아야 함).
+        """
+        current = self._current
+        history = list(self._events) # deque 복사는 원자적 (발행 중 append와 겹쳐도 안전)
+        batches = [(published, batch) for published, batch in history if version < published <= current.version]
+        complete = current.version <= version or (bool(history) and history[0][0] <= version + 1)
+        return current, batches, complete
+
+    def events_since(self, version):
+        """version 이후에 발행된 스냅샷들의 변화 이벤트와, 빠짐없이 모두 가져왔는지 여부 (events, complete)."""
+        _, batches, complete = self.batches_since(version)
+        return [event for _, batch in batches for event in batch], complete
+
+    def stats(self):
+        return {
+            "version": self._current.version,
+            "publishes": self.publishes,
+            "conflicts": self.conflicts,
+            "event_history": len(self._events),
+        }
@@ -0,0 +1,92 @@
+# 파일명: snapshot_cache.py
+
+import asyncio
+import logging
+import time
+
+
+class SnapshotCache:
+    """
+    크롤링 결과 스냅샷의 신선도 관리자.
+    - 동시에 들어온 갱신 요청은 진행 중인 크롤링 하나에 합류 (single-flight)
+    - max_age초 안의 스냅샷이면 크롤링 없이 바로 사용
+    - 오래된 스냅샷은 먼저 보여주고 백그라운드에서 다시 확인 (stale-while-revalidate)
+    """
+
+    def __init__(self, refresh_fn, max_age):
+        self.refresh_fn = refresh_fn # 인자 없는 코루틴 함수, 성공 여부(bool)를 반환
+        self.max_age = max_age
+        self._inflight = None
+        self._refreshed_at = None # 마지막으로 갱신에 성공한 시각 (monotonic)
+
+        self.hits = 0          # 크롤링 없이 기존 스냅샷으로 응답
+        self.misses = 0        # 새로 크롤링을 시작
+        self.coalesced = 0     # 진행 중인 크롤링에 합류
+        self.revalidations = 0 # 오래된 스냅샷을 보여주고 백그라운드에서 갱신
+        self.failures = 0
+
+    def age(self):
+        """마지막 갱신 후 지난 시간(초). 한 번도 갱신되지 않았으면 None."""
+        if self._refreshed_at is None:
+            return None
+        return time.monotonic() - self._refreshed_at
+
+    def is_fresh(self, max_age=None):
+        age = self.age()
+        return age is not None and age <= (self.max_age if max_age is None else max_age)
+
+    @property
+    def refreshing(self):
+        return self._inflight is not None and not self._inflight.done()
+
+    async def refresh(self):
+        """크롤링을 실행하거나, 이미 진행 중이면 그 결과를 함께 기다림."""
+        if self.refreshing:
+            self.coalesced += 1
+            return await asyncio.shield(self._inflight)
+        self.misses += 1
+        self._inflight = asyncio.get_running_loop().create_task(self._run_refresh())
+        return await asyncio.shield(self._inflight)
+
+    async def get_fresh(self, max_age=None):
+        """스냅샷이 max_age초보다 오래됐을 때만 갱신. 사용할 수 있는 스냅샷이 있으면 True."""
+        if self.is_fresh(max_age):
+            self.hits += 1
+            return True
+        return await self.refresh()
+
+    def revalidate(self, max_age=None):
+        """
+        기다리지 않는 버전: 스냅샷이 신선하면 아무것도 하지 않고 True,
+        오래됐으면 백그라운드 갱신을 시작(또는 진행 중인 갱신 유지)하고 False를 반환.
+        """
+        if self.is_fresh(max_age):
+            self.hits += 1
+            return True
+        self.revalidations += 1
+        if not self.refreshing:
+            self._inflight = asyncio.get_running_loop().create_task(self._run_refresh())
+        return False
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "revalidations": self.revalidations,
+            "failures": self.failures,
+            "age": self.age(),
+            "refreshing": self.refreshing,
+        }
+
+    async def _run_refresh(self):
+        try:
+            ok = await self.refresh_fn()
+        except Exception as e:
+            logging.error(f"스냅샷 갱신 중 오류 발생: {e}", exc_info=True)
+            ok = False
+        if ok:
+            self._refreshed_at = time.monotonic()
+        else:
+            self.failures += 1
+        return ok
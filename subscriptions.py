@@ -0,0 +1,196 @@
+# 파일명: subscriptions.py
+
+import logging
+from dataclasses import dataclass
+
+from schedule_diff import BECAME_FULL, BECAME_AVAILABLE, SEATS_CHANGED, ROUTE_REMOVED
+from portal_config import BUS_RESERVATION_URL
+
+# 알림을 받을 대상 종류
+USER = "user"       # 사용자 개인 (DM으로 전송)
+CHANNEL = "channel" # 서버 채널
+
+
+@dataclass(frozen=True, slots=True)
+class Target:
+    """알림을 받을 대상 (사용자 DM 또는 채널). outbox와 구독 인덱스의 키로 사용."""
+    kind: str
+    id: int
+
+    def label(self):
+        return f"<@{self.id}>" if self.kind == USER else f"<#{self.id}>"
+
+
+def user_target(user_id):
+    return Target(USER, int(user_id))
+
+
+def channel_target(channel_id):
+    return Target(CHANNEL, int(channel_id))
+
+
+class SubscriptionIndex:
+    """
+    노선 ID -> 구독자 역색인. 좌석 변화 이벤트 하나를 그 노선의 구독자 수만큼만 비용을 들여 전달하기 위함.
+    스레드 안전하지 않으므로 변경은 감시 상태 작성자(watch_actor)에 맡긴 작업 안에서만 해야 함.
+    """
+
+    def __init__(self):
+        self._by_bus = {}      # {bus_id: set(Target)} (역색인)
+        self._by_target = {}   # {Target: set(bus_id)} (!stop all, !monitoring_list용 정방향 색인)
+        self._unconfirmed = {} # {bus_id: set(Target)} 아직 첫 좌석 확인 알림을 받지 못한 구독자
+        self.last_seats = {}   # {bus_id: current_seats} 구독자가 있는 노선의 마지막 확인 좌석 (첫 확인 전이면 None)
+
+    def __bool__(self):
+        return bool(self._by_bus)
+
+    def __len__(self):
+        """전체 구독 수 (대상 x 노선)."""
+        return sum(len(bus_ids) for bus_ids in self._by_target.values())
+
+    def bus_ids(self):
+        """구독자가 한 명이라도 있는 노선 ID (읽기 전용 뷰)."""
+        return self._by_bus.keys()
+
+    def targets(self):
+        return self._by_target.keys()
+
+    def subscribers(self, bus_id):
+        return self._by_bus.get(bus_id, ())
+
+    def subscriptions_of(self, target):
+        return sorted(self._by_target.get(target, ()))
+
+    def subscribe(self, target, bus_id):
+        """구독 추가. 이미 구독 중이면 False. 새 구독자는 다음 모니터링 주기에 첫 확인 알림을 받음."""
+        subscribers = self._by_bus.setdefault(bus_id, set())
+        if target in subscribers:
+            return False
+        subscribers.add(target)
+        self._by_target.setdefault(target, set()).add(bus_id)
+        self._unconfirmed.setdefault(bus_id, set()).add(target)
+        self.last_seats.setdefault(bus_id, None)
+        return True
+
+    def unsubscribe(self, target, bus_id):
+        """구독 해제. 구독 중이 아니었으면 False. 마지막 구독자가 빠지면 노선 상태도 정리."""
+        subscribers = self._by_bus.get(bus_id)
+        if not subscribers or target not in subscribers:
+            return False
+        subscribers.discard(target)
+        if not subscribers:
+            del self._by_bus[bus_id]
+            self.last_seats.pop(bus_id, None)
+        bus_ids = self._by_target.get(target)
+        if bus_ids is not None:
+            bus_ids.discard(bus_id)
+            if not bus_ids:
+                del self._by_target[target]
+        pending = self._unconfirmed.get(bus_id)
+        if pending is not None:
+            pending.discard(target)
+            if not pending:
+                del self._unconfirmed[bus_id]
+        return True
+
+    def unsubscribe_all(self, target):
+        """대상 하나의 모든 구독 해제 (다른 사용자의 구독은 그대로). 해제된 노선 ID 리스트를 반환."""
+        bus_ids = sorted(self._by_target.get(target, ()))
+        for bus_id in bus_ids:
+            self.unsubscribe(target, bus_id)
+        return bus_ids
+
+    def drop_bus(self, bus_id):
+        """노선의 모든 구독 해제 (노선이 사라졌을 때). 해제된 구독자 튜플을 반환."""
+        targets = tuple(self._by_bus.get(bus_id, ()))
+        for target in targets:
+            self.unsubscribe(target, bus_id)
+        return targets
+
+    def clear(self):
+        self._by_bus.clear()
+        self._by_target.clear()
+        self._unconfirmed.clear()
+        self.last_seats.clear()
+
+    def pop_unconfirmed(self):
+        """첫 확인을 기다리는 {bus_id: (Target, ...)}를 꺼내고 비움."""
+        pending, self._unconfirmed = self._unconfirmed, {}
+        return {bus_id: tuple(targets) for bus_id, targets in pending.items()}
+
+
+def collect_alerts(index, schedule, events, forecasts=None):
+    """
+    (감시 상태 작업 안에서 호출) 구독 상태를 갱신하고 보낼 알림 목록 [(대상 튜플, 메시지, 로그)]을 반환.
+    메시지는 노선당 한 번만 만들고 그 노선의 구독자에게만 퍼뜨리므로 비용은 O(이벤트 + 해당 노선 구독자 수).
+    - 새 구독자는 현재 스냅샷으로 첫 확인 (만석이면 계속 구독, 아니면 안내 후 구독 해제)
+    - 첫 확인을 마친 구독자는 좌석 변화 이벤트만 보고 판단 (변화가 없으면 아무 일도 하지 않음)
+    """
+    alerts = []
+    forecasts = forecasts or {}
+
+    def with_forecast(message, bus_id):
+        forecast = forecasts.get(bus_id)
+        if forecast is None:
+            return message
+        from seat_forecast import describe_forecast # 예측이 있으면 이미 불러온 상태 (봇 시작 때 NumPy를 불러오지 않도록)
+        note = describe_forecast(forecast)
+        return f"{message}\n{note}" if note else message
+
+    # 1. 첫 확인 (새 구독자만)
+    just_confirmed = {} # {bus_id: set(Target)} 이번 주기에 첫 확인을 마친 구독자 (아래 이벤트 처리에서 제외)
+    for bus_id, targets in index.pop_unconfirmed().items():
+        route = schedule.get(bus_id)
+        if route is None:
+            alerts.append((targets, f"ID '{bus_id}' 노선을 찾을 수 없습니다. 모니터링을 중단합니다.",
+                           f"ID '{bus_id}' 노선을 찾을 수 없음. 구독자 {len(targets)}명 모니터링 중단."))
+            for target in targets:
+                index.unsubscribe(target, bus_id)
+        elif route.is_full:
+            alerts.append((targets, with_forecast(f"✅ ID '{bus_id}'번 노선이 현재 만석({route.current_seats}/{route.total_seats})입니다!\n"
+                                                  f"노선: {route.bus_route_detail}", bus_id),
+                           f"ID '{bus_id}' 첫 모니터링 알림 전송 (만석, 구독자 {len(targets)}명): {route.current_seats}/{route.total_seats}"))
+            index.last_seats[bus_id] = route.current_seats # 만석이면 계속 모니터링
+            just_confirmed[bus_id] = set(targets)
+        else:
+            alerts.append((targets, with_forecast(f"ID '{bus_id}'번 노선은 현재 만석이 아닙니다. "
+                                                  f"현재 좌석: {route.current_seats}/{route.total_seats}\n"
+                                                  f"만석({route.total_seats}/{route.total_seats})이 되면 알림을 보내드릴게요.", bus_id),
+                           f"ID '{bus_id}' 첫 모니터링 알림 전송 (만석 아님, 구독자 {len(targets)}명): {route.current_seats}/{route.total_seats}"))
+            for target in targets: # 만석이 아니므로 이 구독자들만 구독 해제
+                index.unsubscribe(target, bus_id)
+
+    # 2. 좌석 변화 이벤트 처리 (구독자가 있는 노선만, 첫 확인을 막 마친 구독자는 이미 최신 스냅샷 기준이므로 제외)
+    for event in events:
+        bus_id = event.bus_id
+        subscribers = index.subscribers(bus_id)
+        if not subscribers or index.last_seats.get(bus_id) is None:
+            continue
+        skip = just_confirmed.get(bus_id)
+        targets = tuple(t for t in subscribers if t not in skip) if skip else tuple(subscribers)
+        if not targets:
+            continue
+        route = event.route
+        if event.kind == ROUTE_REMOVED:
+            alerts.append((targets, f"ID '{bus_id}' 노선을 찾을 수 없습니다. 모니터링을 중단합니다.",
+                           f"ID '{bus_id}' 노선을 찾을 수 없음. 구독자 {len(targets)}명 모니터링 중단."))
+            index.drop_bus(bus_id)
+        elif event.kind == BECAME_FULL:
+            alerts.append((targets, f"✅ ID '{bus_id}'번 노선이 만석({route.current_seats}/{route.total_seats})이 되었습니다!\n"
+                                    f"노선: {route.bus_route_detail}\n"
+                                    f"예약 페이지: <{BUS_RESERVATION_URL}>",
+                           f"ID '{bus_id}' 만석 알림 전송 (구독자 {len(targets)}명): {route.current_seats}/{route.total_seats}"))
+            index.last_seats[bus_id] = route.current_seats
+        elif event.kind == BECAME_AVAILABLE:
+            alerts.append((targets, with_forecast(f"🚌 ID '{bus_id}'번 노선이 만석이 아니게 되었습니다. "
+                                                  f"현재 좌석: {route.current_seats}/{route.total_seats}\n"
+                                                  f"노선: {route.bus_route_detail}", bus_id),
+                           f"ID '{bus_id}' 만석 아님으로 변경 알림 전송 (구독자 {len(targets)}명): {route.current_seats}/{route.total_seats}"))
+            for target in targets: # 만석이 아니므로 알림을 받은 구독자들은 구독 해제
+                index.unsubscribe(target, bus_id)
+        elif event.kind == SEATS_CHANGED:
+            index.last_seats[bus_id] = route.current_seats
+
+    if alerts:
+        logging.info(f"모니터링 판단 완료: 알림 {len(alerts)}종, 대상 {sum(len(t) for t, _, _ in alerts)}건")
+    return alerts
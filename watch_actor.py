@@ -0,0 +1,65 @@
+# 파일명: watch_actor.py
+
+import asyncio
+import logging
+import time
+
+import perf_metrics
+
+
+class WatchStateActor:
+    """
+    구독/알림 규칙/모니터링 커서 같은 감시 상태를 바꾸는 유일한 작성자.
+    변경 작업(인자 없는 일반 함수)을 asyncio 큐로 받아 이벤트 루프 위의 태스크 하나에서 차례대로 실행함.
+    작업 안에서는 await 하지 않으므로 작업 하나는 다른 코루틴 사이에 끼어들지 않고 통째로 적용되고,
+    같은 루프의 코루틴은 락 없이 상태를 읽을 수 있음 (반쯤 바뀐 상태를 볼 일이 없음).
+    큐에서 기다린 시간(watch_actor_wait)과 작업 시간(watch_actor_op)을 기록해 경합을 잴 수 있음.
+    """
+
+    def __init__(self, name="watch_actor"):
+        self.name = name
+        self._queue = None
+        self._task = None
+        self.ops = 0
+        self.failures = 0
+        self.max_depth = 0 # 지금까지 가장 많이 쌓였던 작업 수
+
+    def _ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop: # 처음이거나 루프가 바뀜
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run(), name=self.name)
+
+    async def call(self, operation):
+        """(이벤트 루프에서) 변경 작업을 맡기고 결과를 기다림. 작업이 예외를 내면 그 예외를 그대로 전달."""
+        self._ensure_running()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((operation, future, time.perf_counter()))
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return await future
+
+    async def _run(self):
+        while True:
+            operation, future, queued_at = await self._queue.get()
+            started = time.perf_counter()
+            perf_metrics.observe(f"{self.name}_wait", started - queued_at)
+            try:
+                result = operation()
+            except Exception as e:
+                self.failures += 1
+                logging.error(f"감시 상태 변경 작업 중 오류 발생: {e}", exc_info=True)
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done(): # 맡긴 쪽이 취소됐으면 결과만 버림 (변경은 이미 적용됨)
+                    future.set_result(result)
+            self.ops += 1
+            perf_metrics.observe(f"{self.name}_op", time.perf_counter() - started)
+
+    def stats(self):
+        return {
+            "ops": self.ops,
+            "failures": self.failures,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_depth": self.max_depth,
+        }